@@ -0,0 +1,74 @@
+"""
+生成合成的 leetcode_list.json / classification.json，用于基准测试
+
+tag 的大小服从 Zipf 分布（skew 越大越集中在少数几个 tag 上），
+每道题有一个主 tag，另有 extra_tag_rate 的概率多挂一个 tag。
+
+用法:
+    python -m benchmarks.generate out_dir --items 100000 --tags 1000 --skew 1.1
+"""
+import argparse
+import datetime
+import itertools
+import json
+import random
+from pathlib import Path
+
+
+def generate(out_dir: str, items: int = 10000, tags: int = 100, skew: float = 1.1,
+             extra_tag_rate: float = 0.2, seed: int = 0) -> tuple[Path, Path]:
+    """生成数据文件，返回 (题目列表路径, 分类文件路径)"""
+    rng = random.Random(seed)
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    tag_names = [f"tag{i}" for i in range(tags)]
+    cum_weights = list(itertools.accumulate(1 / (rank ** skew) for rank in range(1, tags + 1)))
+    today = datetime.date.today()
+
+    records = []
+    category_to_problems: dict[str, list[int]] = {}
+    problem_to_categories: dict[str, list[str]] = {}
+    for leetcode_id in range(1, items + 1):
+        problem_tags = rng.choices(tag_names, cum_weights=cum_weights, k=2 if rng.random() < extra_tag_rate else 1)
+        problem_tags = list(dict.fromkeys(problem_tags))
+        records.append({
+            "leetcode_id": leetcode_id,
+            "leetcode_url": f"https://leetcode.cn/problems/p{leetcode_id}/",
+            "meta": {
+                "date": (today - datetime.timedelta(days=rng.randint(0, 365))).isoformat(),
+                "difficulty": str(rng.randint(1, 3)),
+                "time_cost": f"{rng.randint(0, 45)}:{rng.randint(0, 59):02d}",
+                "times": rng.randint(1, 6),
+                "tag": problem_tags[0],
+            }
+        })
+        for tag in problem_tags:
+            category_to_problems.setdefault(tag, []).append(leetcode_id)
+        problem_to_categories[str(leetcode_id)] = problem_tags
+
+    list_path = out_dir / "leetcode_list.json"
+    classification_path = out_dir / "classification.json"
+    with open(list_path, "w", encoding="utf-8") as f:
+        json.dump(records, f, ensure_ascii=False)
+    with open(classification_path, "w", encoding="utf-8") as f:
+        json.dump({"category_to_problems": category_to_problems,
+                   "problem_to_categories": problem_to_categories}, f, ensure_ascii=False)
+    return list_path, classification_path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="生成合成的刷题数据")
+    parser.add_argument("out_dir")
+    parser.add_argument("--items", type=int, default=10000)
+    parser.add_argument("--tags", type=int, default=100)
+    parser.add_argument("--skew", type=float, default=1.1, help="tag 大小的 Zipf 指数")
+    parser.add_argument("--extra-tag-rate", type=float, default=0.2)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    paths = generate(args.out_dir, args.items, args.tags, args.skew, args.extra_tag_rate, args.seed)
+    print(*paths, sep="\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+"""
+基准测试：在合成数据上计时 加载 / 保存 / 更新 / 推荐 / tag打分 / 分数表
+
+每个操作重复 --repeat 次取最快一次的耗时，再单独跑一次用 tracemalloc 记录峰值内存。
+结果以 JSON 输出；指定 --baseline 时与基线比较，超过 (1 + tolerance) 倍即以退出码 1 失败。
+
+用法（在仓库根目录）:
+    python -m benchmarks.run --items 100000 --tags 1000
+    python -m benchmarks.run --baseline benchmarks/baseline.json
+    python -m benchmarks.run --save-baseline benchmarks/baseline.json
+"""
+import argparse
+import builtins
+import contextlib
+import io
+import json
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import xiaobai  # noqa: E402
+from benchmarks.generate import generate  # noqa: E402
+from objects import scoring  # noqa: E402
+from objects.journal_store import JournalStore  # noqa: E402
+from objects.leetcode_classify import LeetCodeClassify  # noqa: E402
+
+UPDATES_PER_RUN = 20  # 每次计时里连续更新的题目数
+
+
+@contextlib.contextmanager
+def scripted_input(answers):
+    """用预先准备好的答案代替 input()，驱动交互式函数"""
+    answers = iter(answers)
+    original = builtins.input
+    builtins.input = lambda prompt="": next(answers)
+    try:
+        yield
+    finally:
+        builtins.input = original
+
+
+class Workspace:
+    """把生成好的数据复制到临时目录，每个操作都在干净的副本上运行"""
+
+    def __init__(self, list_path: Path, classification_path: Path):
+        self.list_path = list_path
+        self.classification_path = classification_path
+        self.dir = None
+
+    def fresh(self):
+        if self.dir is not None:
+            shutil.rmtree(self.dir, ignore_errors=True)
+        self.dir = Path(tempfile.mkdtemp(prefix="xiaobai-bench-"))
+        shutil.copy(self.list_path, self.dir / "leetcode_list.json")
+        shutil.copy(self.classification_path, self.dir / "classification.json")
+        return self.dir
+
+    def open(self):
+        """加载题目和分类（与 main() 相同的方式）"""
+        directory = self.fresh()
+        store = JournalStore(directory / "leetcode_list.json")
+        items = store.load()
+        classifier = LeetCodeClassify(directory / "classification.json", store=items)
+        return store, items, classifier
+
+    def cleanup(self):
+        if self.dir is not None:
+            shutil.rmtree(self.dir, ignore_errors=True)
+
+
+def build_cases(workspace: Workspace, rng: random.Random):
+    """每个用例是 (名称, setup, op)：setup 的返回值作为 op 的参数，只计时 op"""
+
+    def setup_loaded():
+        return workspace.open()
+
+    def load_json(state):
+        xiaobai.load_items_from_json(workspace.dir / "leetcode_list.json")
+
+    def store_load(state):
+        JournalStore(workspace.dir / "leetcode_list.json").load()
+
+    def save_json(state):
+        _, items, _ = state
+        xiaobai.save_items_to_json(items, workspace.dir / "leetcode_list.json")
+
+    def update(state):
+        store, items, classifier = state
+        ids = [rng.choice(items).leetcode_id for _ in range(UPDATES_PER_RUN)]
+        answers = []
+        for leetcode_id in ids:
+            item = items.get(leetcode_id)
+            answers += [str(leetcode_id), "", "", f"{rng.randint(0, 40)}:{rng.randint(0, 59):02d}", item.tag]
+        with scripted_input(answers), contextlib.redirect_stdout(io.StringIO()):
+            for _ in ids:
+                store.append(xiaobai.update_item_by_id(items, classifier))
+
+    def recommend(state):
+        _, items, classifier = state
+        with contextlib.redirect_stdout(io.StringIO()):
+            xiaobai.get_recommended_problems(items, classifier)
+
+    def tag_scores(state):
+        _, items, classifier = state
+        classifier.calculate_tag_scores(items)
+
+    def tag_scores_unbound(state):
+        _, items, classifier = state
+        classifier.calculate_tag_scores(list(items))
+
+    def tag_table(state):
+        _, items, classifier = state
+        with contextlib.redirect_stdout(io.StringIO()):
+            classifier.print_tag_scores_table(items)
+
+    return [
+        ("load_items_from_json", setup_loaded, load_json),
+        ("store_load", setup_loaded, store_load),
+        ("save_items_to_json", setup_loaded, save_json),
+        (f"update_item_by_id_x{UPDATES_PER_RUN}", setup_loaded, update),
+        ("get_recommended_problems", setup_loaded, recommend),
+        ("calculate_tag_scores", setup_loaded, tag_scores),
+        ("calculate_tag_scores_unbound", setup_loaded, tag_scores_unbound),
+        ("print_tag_scores_table", setup_loaded, tag_table),
+    ]
+
+
+def measure(setup, op, repeat: int) -> dict:
+    best = float("inf")
+    for _ in range(repeat):
+        state = setup()
+        start = time.perf_counter()
+        op(state)
+        best = min(best, time.perf_counter() - start)
+
+    state = setup()
+    tracemalloc.start()
+    op(state)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"seconds": round(best, 6), "peak_bytes": peak}
+
+
+def scale_key(args) -> str:
+    return f"items={args.items},tags={args.tags},skew={args.skew}"
+
+
+def compare(results: dict, baseline: dict, tolerance: float, min_delta: float = 0.0) -> list[str]:
+    """
+    返回超出基线的操作说明，空列表表示全部通过
+    只有同时超过 (1 + tolerance) 倍且绝对差值超过 min_delta 秒才算回退，避免毫秒级用例的抖动误报
+    """
+    failures = []
+    for name, result in results.items():
+        expected = baseline.get(name)
+        if expected is None:
+            continue
+        limit = expected["seconds"] * (1 + tolerance)
+        if result["seconds"] > limit and result["seconds"] - expected["seconds"] > min_delta:
+            failures.append(f"{name}: {result['seconds']:.4f}s > 基线 {expected['seconds']:.4f}s × {1 + tolerance}")
+    return failures
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="xiaobai 基准测试")
+    parser.add_argument("--items", type=int, default=10000)
+    parser.add_argument("--tags", type=int, default=100)
+    parser.add_argument("--skew", type=float, default=1.1)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--only", nargs="*", help="只运行名称包含这些关键字的用例")
+    parser.add_argument("--output", help="结果JSON写入文件（默认输出到标准输出）")
+    parser.add_argument("--baseline", help="与基线文件比较，超出则失败")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="允许超出基线的比例")
+    parser.add_argument("--min-delta", type=float, default=0.005, help="允许的绝对误差（秒）")
+    parser.add_argument("--save-baseline", help="把本次结果写入基线文件（按数据规模分组）")
+    args = parser.parse_args(argv)
+
+    data_dir = Path(tempfile.mkdtemp(prefix="xiaobai-bench-data-"))
+    try:
+        list_path, classification_path = generate(data_dir, args.items, args.tags, args.skew, seed=args.seed)
+        workspace = Workspace(list_path, classification_path)
+        rng = random.Random(args.seed)
+        results = {}
+        for name, setup, op in build_cases(workspace, rng):
+            if args.only and not any(keyword in name for keyword in args.only):
+                continue
+            results[name] = measure(setup, op, args.repeat)
+        workspace.cleanup()
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+    report = {
+        "scale": {"items": args.items, "tags": args.tags, "skew": args.skew},
+        "python": platform.python_version(),
+        "numpy": scoring.HAVE_NUMPY,
+        "results": results,
+    }
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        Path(args.output).write_text(text, encoding="utf-8")
+    else:
+        print(text)
+
+    if args.save_baseline:
+        path = Path(args.save_baseline)
+        baselines = json.loads(path.read_text(encoding="utf-8")) if path.exists() else {}
+        baselines[scale_key(args)] = results
+        path.write_text(json.dumps(baselines, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+
+    if args.baseline:
+        baselines = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        baseline = baselines.get(scale_key(args))
+        if baseline is None:
+            print(f"基线文件中没有 {scale_key(args)} 的记录，跳过比较", file=sys.stderr)
+            return 0
+        failures = compare(results, baseline, args.tolerance, args.min_delta)
+        if failures:
+            print("性能回退:", *failures, sep="\n  ", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
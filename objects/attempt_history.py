@@ -0,0 +1,234 @@
+"""
+刷题历史
+
+题目记录里只保存最近一次刷题的日期和耗时；每次刷题另外记一条历史，存在 data/history.bin，不进题目JSON。
+
+文件格式：文件头 b"XBH1"，之后每次刷题一条记录，由三个无符号变长整数（varint，每字节存7位）组成:
+    题号、与该题上一次刷题相差的天数（zigzag 编码，可以为负；第一次记日期序数本身）、耗时秒数（0 表示未知）
+一般一条记录 5~7 个字节。文件只追加，写到一半崩溃留下的残缺记录在下次加载时截掉。
+
+内存里每道题一个 AttemptLog，日期差和耗时存在 array 里，另外增量维护滚动统计（每次刷题 O(1)）:
+    ewma   耗时的指数加权平均，越近的刷题权重越大
+    best   最好成绩
+    trend  每次耗时比之前的平均慢多少（指数加权平均），负数表示越刷越快
+耗时未知的刷题只记日期，不参与耗时统计。
+
+启动时按题目当前的数据补上漏记的刷题：题目的最近一次刷题和历史的最后一条对不上（旧数据、上次退出前没保存）就补记一条。
+旧数据的历史从当前这一次开始，打分结果和不用历史时相同。
+"""
+import datetime
+import os
+from array import array
+from pathlib import Path
+from typing import Iterator
+from objects.item import Item
+from objects.item_store import ItemStore
+
+MAGIC = b"XBH1"
+ALPHA = 0.3  # 指数加权平均里最近一次的权重
+
+
+class AttemptLog:
+    """一道题的全部刷题记录和滚动统计"""
+
+    __slots__ = ("last_ord", "day_deltas", "seconds", "ewma", "best", "trend", "times")
+
+    def __init__(self, date_ord: int):
+        self.last_ord = date_ord  # 最近一次刷题的日期序数
+        self.day_deltas = array("i")  # 与上一次刷题相差的天数（第一次为0）
+        self.seconds = array("I")  # 每次的耗时秒数，0 表示未知
+        self.ewma = 0.0
+        self.best = 0
+        self.trend = 0.0
+        self.times = 0  # 已对应到题目上的刷题次数（不保存，启动时按题目补齐）
+
+    def __len__(self) -> int:
+        return len(self.seconds)
+
+    @property
+    def first_ord(self) -> int:
+        return self.last_ord - sum(self.day_deltas)
+
+    def add(self, date_ord: int, seconds: int) -> None:
+        """记一次刷题 O(1)"""
+        self.extend((date_ord - self.last_ord,), (seconds,))
+
+    def extend(self, day_deltas, seconds) -> None:
+        """按顺序记入多次刷题（日期差相对上一次），结果与逐条 add 相同"""
+        self.day_deltas.extend(day_deltas)
+        self.seconds.extend(seconds)
+        self.last_ord += sum(day_deltas)
+        ewma, best, trend = self.ewma, self.best, self.trend
+        for value in seconds:
+            if value <= 0:
+                continue
+            if not best:
+                ewma, best = float(value), value
+                continue
+            change = value - ewma
+            trend = ALPHA * change + (1 - ALPHA) * trend
+            ewma += ALPHA * change
+            if value < best:
+                best = value
+        self.ewma, self.best, self.trend = ewma, best, trend
+
+    def attempts(self) -> Iterator[tuple[datetime.date, int]]:
+        """按时间顺序产出每次刷题的 (日期, 耗时秒数)"""
+        date_ord = self.first_ord
+        for delta, seconds in zip(self.day_deltas, self.seconds):
+            date_ord += delta
+            yield datetime.date.fromordinal(date_ord), seconds
+
+    def to_dict(self) -> dict:
+        return {
+            "attempts": len(self),
+            "ewma_seconds": round(self.ewma),
+            "best_seconds": self.best,
+            "trend_seconds": round(self.trend, 1),
+        }
+
+    def __repr__(self):
+        if not self.best:
+            return f"刷了{len(self)}次，耗时未知"
+        return (f"刷了{len(self)}次，平均耗时 {_format_seconds(self.ewma)}，最好 {_format_seconds(self.best)}，"
+                f"趋势 {self.trend:+.0f}秒/次")
+
+
+class AttemptHistory:
+    def __init__(self, data_path: str, store: ItemStore, read_only: bool = False):
+        """
+        参数:
+            data_path (str): 历史文件
+            store (ItemStore): 题目集合，订阅它的修改，刷题次数增加时记一条历史
+            read_only (bool): 只读打开，不截断残缺记录，save() 不写文件
+        """
+        self.data_path = Path(data_path)
+        self.read_only = read_only
+        self._store = store
+        self._logs: dict[int, AttemptLog] = {}
+        self._pending = bytearray()  # 还没写入文件的记录
+        self._load()
+        store.add_listener(self._on_item_changed)
+
+    def __len__(self) -> int:
+        return len(self._logs)
+
+    def get(self, leetcode_id: int) -> AttemptLog | None:
+        return self._logs.get(leetcode_id)
+
+    def effective_seconds(self, item: Item) -> int:
+        """打分用的耗时：有历史时用耗时的加权平均，否则用最近一次的耗时"""
+        log = self._logs.get(item.leetcode_id)
+        if log is None or not log.best:
+            return item.time_cost_in_seconds()
+        return round(log.ewma)
+
+    def record(self, item: Item) -> AttemptLog:
+        """把题目最近一次刷题记入历史"""
+        log = self._logs.get(item.leetcode_id)
+        previous_ord = 0 if log is None else log.last_ord
+        if log is None:
+            log = self._logs[item.leetcode_id] = AttemptLog(item.date_ordinal)
+        seconds = max(item.time_cost_in_seconds(), 0)
+        log.add(item.date_ordinal, seconds)
+        log.times = item.times
+        _write_varint(self._pending, item.leetcode_id)
+        _write_varint(self._pending, _zigzag(item.date_ordinal - previous_ord))
+        _write_varint(self._pending, seconds)
+        return log
+
+    def save(self) -> None:
+        """把新记录追加到文件末尾"""
+        if not self._pending or self.read_only:
+            return
+        pending, self._pending = self._pending, bytearray()
+        new_file = not self.data_path.exists() or self.data_path.stat().st_size == 0
+        with open(self.data_path, "ab") as f:
+            if new_file:
+                f.write(MAGIC)
+            f.write(pending)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _load(self) -> None:
+        if self.data_path.exists():
+            data = self.data_path.read_bytes()
+            if data and not data.startswith(MAGIC):
+                raise ValueError(f"不是刷题历史文件: {self.data_path}")
+            end = self._decode(data, len(MAGIC))
+            if end < len(data) and not self.read_only:
+                with open(self.data_path, "r+b") as f:
+                    f.truncate(end)  # 截掉写到一半的记录
+        # 新题或上次退出前没保存的刷题，按题目当前的数据补上
+        for item in self._store:
+            if self._store.get(item.leetcode_id) is not item:
+                continue  # 重复题号只认第一条
+            log = self._logs.get(item.leetcode_id)
+            if (log is None or log.last_ord != item.date_ordinal
+                    or log.seconds[-1] != max(item.time_cost_in_seconds(), 0)):
+                log = self.record(item)
+            log.times = item.times
+
+    def _decode(self, data: bytes, pos: int) -> int:
+        """
+        解析 pos 之后的全部记录，返回最后一条完整记录的结束位置。
+        先一遍扫出所有 varint，再按题号分组，每道题一次性 extend，避免逐条记录的函数调用
+        """
+        values = []
+        append = values.append
+        value = shift = 0
+        for byte in data[pos:]:
+            if byte & 0x80:
+                value |= (byte & 0x7F) << shift
+                shift += 7
+            else:
+                append(value | (byte << shift))
+                value = shift = 0
+        end = len(data)
+        while end > pos and data[end - 1] & 0x80:
+            end -= 1  # 末尾没写完的 varint
+        complete = len(values) - len(values) % 3
+        end -= sum(_varint_size(value) for value in values[complete:])
+
+        grouped: dict[int, tuple[list[int], list[int]]] = {}
+        for leetcode_id, delta, seconds in zip(values[0:complete:3], values[1:complete:3], values[2:complete:3]):
+            group = grouped.get(leetcode_id)
+            if group is None:
+                group = grouped[leetcode_id] = ([], [])
+            group[0].append((delta >> 1) ^ -(delta & 1))  # zigzag 解码
+            group[1].append(seconds)
+        for leetcode_id, (day_deltas, seconds) in grouped.items():
+            log = self._logs[leetcode_id] = AttemptLog(day_deltas[0])  # 第一条记的是日期序数本身
+            day_deltas[0] = 0
+            log.extend(day_deltas, seconds)
+        return end
+
+    def _on_item_changed(self, leetcode_id: int, before: tuple | None, after: tuple | None) -> None:
+        """新题或刷题次数增加时记一条；只改了tag等信息不算新的刷题"""
+        if after is None:
+            return
+        item = self._store.get(leetcode_id)
+        if item is None:
+            return
+        log = self._logs.get(leetcode_id)
+        if log is None or item.times > log.times:
+            self.record(item)
+
+
+def _zigzag(value: int) -> int:
+    return value * 2 if value >= 0 else -value * 2 - 1
+
+
+def _varint_size(value: int) -> int:
+    return max(1, (value.bit_length() + 6) // 7)
+
+
+def _write_varint(out: bytearray, value: int) -> None:
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _format_seconds(seconds: float) -> str:
+    return f"{int(seconds // 60)}:{int(seconds % 60):02d}"
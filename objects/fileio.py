@@ -0,0 +1,65 @@
+"""原子写文件等小工具"""
+import json
+import os
+from contextlib import contextmanager
+from pathlib import Path
+
+
+def atomic_write_json(path, data, indent=None) -> None:
+    """原子写入JSON：先写临时文件并fsync，再rename覆盖，进程被杀也不会留下半截文件"""
+    atomic_write_text(path, json.dumps(data, ensure_ascii=False, indent=indent))
+
+
+@contextmanager
+def atomic_open(path, newline: str | None = None):
+    """
+    流式原子写文本文件：边写边落到临时文件，正常退出时 fsync 再 rename 覆盖；
+    块内出错则删掉临时文件，原文件不变。适合内容很大、不想先拼成一个字符串的导出
+
+    用法:
+        with atomic_open("out.csv", newline="") as f:
+            f.write(...)
+    """
+    path = Path(path)
+    tmp_path = path.with_name(path.name + ".tmp")
+    f = open(tmp_path, "w", encoding="utf-8", newline=newline)
+    try:
+        yield f
+        f.flush()
+        os.fsync(f.fileno())
+    except BaseException:
+        f.close()
+        tmp_path.unlink(missing_ok=True)
+        raise
+    f.close()
+    os.replace(tmp_path, path)
+    _fsync_dir(path.parent)
+
+
+def atomic_write_text(path, text: str) -> None:
+    atomic_write_bytes(path, text.encode("utf-8"))
+
+
+def atomic_write_bytes(path, data: bytes) -> None:
+    path = Path(path)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    _fsync_dir(path.parent)
+
+
+def _fsync_dir(directory: Path) -> None:
+    """rename之后同步目录项（Windows等不支持的平台直接跳过）"""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
@@ -0,0 +1,252 @@
+"""
+批量导入历史刷题记录（不走 input() 交互）
+
+流水线: 解析 -> 校验/转换（兼容旧版无 meta 的数据结构）-> 按 leetcode_id 合并 -> 一次性提交
+大文件的解析和校验按块分发到进程池并行执行；题目列表快照和分类文件各只写一次。
+
+文件里的每条记录是一次刷题。同一题号的多条记录按日期合并：
+    新题  按最近一次的记录加入题库，刷题次数取 max(记录里的次数, 记录条数)
+    已有的题  比题库里的日期新的记录按日期依次作为一次"更新"应用（刷题次数至少加一），
+            复习计划、刷题历史都能看到这些刷题；不比题库新的记录是已经记过的，算重复跳过
+
+支持的文件格式:
+    .jsonl  每行一条记录，可以是新版 {"leetcode_id", "leetcode_url", "meta": {...}}，
+            也可以是旧版 {"leetcode_id", "date", "difficulty", "time_cost", "times"}
+    .csv    表头为 leetcode_id,leetcode_url,date,difficulty,time_cost,times,tag
+"""
+import csv
+import json
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from pathlib import Path
+from typing import Iterable, Iterator
+from objects.item import Item, parse_date_ordinal
+from objects.item_store import ItemStore
+from objects.journal_store import JournalStore
+from objects.leetcode_classify import LeetCodeClassify
+
+DIFFICULTIES = ("1", "2", "3", "Unknown")  # 1-easy 2-medium 3-hard，旧数据没有难易度时记 Unknown
+CHUNK_SIZE = 5000  # 每个进程任务处理的记录数
+PARALLEL_MIN_BYTES = 4 * 1024 * 1024  # 小文件直接在当前进程处理，省掉进程池启动开销
+
+
+class ImportReport:
+    """导入结果统计"""
+
+    def __init__(self):
+        self.imported = 0  # 新加入题库的题
+        self.merged = 0  # 合并进题目的刷题记录（同一新题的后续记录、已有题目的新记录）
+        self.duplicates = 0  # 不比题库里新的记录（已经记过）
+        self.errors: list[tuple[int, str]] = []  # (行号, 错误原因)
+
+    def __repr__(self):
+        lines = [f"导入 {self.imported} 道新题，合并 {self.merged} 条刷题记录，跳过重复 {self.duplicates} 条，"
+                 f"错误 {len(self.errors)} 条"]
+        for line_no, reason in self.errors[:10]:
+            lines.append(f"  第{line_no}行: {reason}")
+        if len(self.errors) > 10:
+            lines.append(f"  ……其余 {len(self.errors) - 10} 条错误省略")
+        return "\n".join(lines)
+
+
+def convert_legacy_record(legacy_data: dict) -> dict:
+    """将旧版数据结构（字段平铺，没有 meta）转换为新版字典"""
+    return {
+        "leetcode_id": legacy_data["leetcode_id"],
+        "leetcode_url": legacy_data.get("leetcode_url", ""),
+        "meta": {
+            "date": legacy_data["date"],
+            "difficulty": legacy_data.get("difficulty", "Unknown"),
+            "time_cost": legacy_data.get("time_cost", "0:00"),
+            "times": legacy_data.get("times", 1),
+            "tag": legacy_data.get("tag") or None,
+        }
+    }
+
+
+def validate_record(record: dict) -> Item:
+    """校验一条记录并转换为 Item，不合法时抛出 ValueError"""
+    if "meta" not in record:
+        record = convert_legacy_record(record)
+    meta = record["meta"]
+    try:
+        leetcode_id = int(record["leetcode_id"])
+        times = int(meta["times"]) if meta.get("times") not in (None, "") else 1
+        parse_date_ordinal(str(meta["date"]))
+    except KeyError as e:
+        raise ValueError(f"缺少字段 {e}")
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"字段格式错误: {e}")
+    time_cost = validate_time_cost(meta.get("time_cost"))
+    difficulty = validate_difficulty(meta.get("difficulty"))
+
+    return Item.from_dict({
+        "leetcode_id": leetcode_id,
+        "leetcode_url": record.get("leetcode_url") or "",
+        "meta": {
+            "date": str(meta["date"]),
+            "difficulty": difficulty,
+            "time_cost": time_cost,
+            "times": times,
+            "tag": meta.get("tag") or None,
+        }
+    })
+
+
+def validate_time_cost(time_cost) -> str:
+    """耗时必须是 "分:秒" 或 "分"（空表示未知，记为 0:00），不合法时抛出 ValueError"""
+    time_cost = str(time_cost or "0:00").strip()
+    if not all(part.isdigit() for part in time_cost.split(":")) or time_cost.count(":") > 1:
+        raise ValueError(f"耗时格式错误: {time_cost!r}")
+    return time_cost
+
+
+def validate_difficulty(difficulty) -> str:
+    """难易度必须是 1/2/3（空表示未知，记为 Unknown），不合法时抛出 ValueError"""
+    difficulty = str(difficulty or "Unknown").strip()
+    if difficulty not in DIFFICULTIES:
+        raise ValueError(f"难易度必须是 1/2/3: {difficulty!r}")
+    return difficulty
+
+
+def _validate_chunk(chunk: list[tuple[int, object]]) -> list[tuple[int, Item | None, str | None]]:
+    """进程池任务：解析（jsonl 的原始行）并校验一块记录"""
+    results = []
+    for line_no, raw in chunk:
+        try:
+            record = json.loads(raw) if isinstance(raw, str) else raw
+            if not isinstance(record, dict):
+                raise ValueError("记录不是对象")
+            results.append((line_no, validate_record(record), None))
+        except ValueError as e:
+            results.append((line_no, None, str(e)))
+    return results
+
+
+def read_raw_records(path: Path) -> Iterator[tuple[int, object]]:
+    """
+    流式读取文件，产出 (行号, 原始记录)
+    jsonl 产出未解析的行字符串（留给工作进程解析），csv 产出字典
+    """
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        if path.suffix.lower() == ".csv":
+            reader = csv.DictReader(f)
+            for row in reader:
+                yield reader.line_num, row
+        else:
+            for line_no, line in enumerate(f, start=1):
+                if line.strip():
+                    yield line_no, line
+
+
+def _chunks(records: Iterable, size: int) -> Iterator[list]:
+    records = iter(records)
+    while chunk := list(islice(records, size)):
+        yield chunk
+
+
+def validated_items(path: Path, report: ImportReport, workers: int | None = None) -> Iterator[Item]:
+    """解析 + 校验阶段：大文件用进程池并行处理，结果按原顺序产出"""
+    chunks = _chunks(read_raw_records(path), CHUNK_SIZE)
+    if workers == 1 or path.stat().st_size < PARALLEL_MIN_BYTES:
+        results = map(_validate_chunk, chunks)
+    else:
+        results = _parallel_map(_validate_chunk, chunks, workers)
+    for chunk_result in results:
+        for line_no, item, error in chunk_result:
+            if error is not None:
+                report.errors.append((line_no, error))
+            else:
+                yield item
+
+
+def _parallel_map(func, chunks: Iterator[list], workers: int | None) -> Iterator:
+    """按顺序产出结果的进程池 map，同时在途的任务数有上限，避免整个文件读进内存"""
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        window = 2 * workers
+        pending = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(func, chunk))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def group_attempts(items: Iterable[Item]) -> dict[int, list[Item]]:
+    """按题号分组，每组按日期排序（同一天保持文件里的顺序）"""
+    grouped: dict[int, list[Item]] = {}
+    for item in items:
+        grouped.setdefault(item.leetcode_id, []).append(item)
+    for attempts in grouped.values():
+        attempts.sort(key=lambda item: item.date_ordinal)
+    return grouped
+
+
+def merge_new(attempts: list[Item], report: ImportReport) -> Item:
+    """新题的多条记录合并成一条：取最近一次，刷题次数不少于记录条数"""
+    latest = attempts[-1]
+    latest.meta["times"] = max(latest.times, len(attempts))
+    report.merged += len(attempts) - 1
+    return latest
+
+
+def merge_existing(existing: Item, attempts: list[Item], items: ItemStore, classifier: LeetCodeClassify,
+                   report: ImportReport) -> bool:
+    """
+    把比题库新的记录依次作为更新应用到已有的题上（经过 ItemStore.update，监听者都能看到），
+    与菜单的"更新已刷的题"相同：换了tag时覆盖原来的分类。返回是否有更新
+    """
+    updated = False
+    for attempt in attempts:
+        if attempt.date_ordinal <= existing.date_ordinal:
+            report.duplicates += 1
+            continue
+        changes = {
+            "date": attempt.date,
+            "difficulty": attempt.difficulty,
+            "time_cost": attempt.time_cost,
+            "times": max(attempt.times, existing.times + 1),
+        }
+        if attempt.tag and attempt.tag != existing.tag:
+            changes["tag"] = attempt.tag
+            classifier.update_problem_categories(existing.leetcode_id, [attempt.tag])
+        items.update(existing, changes)
+        report.merged += 1
+        updated = True
+    return updated
+
+
+def import_file(path: str, store: JournalStore, classifier: LeetCodeClassify,
+                workers: int | None = None) -> ImportReport:
+    """
+    把文件中的记录导入题库，题目快照和分类文件各只写一次
+
+    参数:
+        path (str): .jsonl 或 .csv 文件
+        store (JournalStore): 已 load() 过的题目存储
+        classifier (LeetCodeClassify): 分类器
+        workers (int): 进程数，默认CPU核数，1表示不启用进程池
+    """
+    path = Path(path)
+    report = ImportReport()
+    new_items, updated_items = [], []
+    with classifier.batch():
+        for leetcode_id, attempts in group_attempts(validated_items(path, report, workers)).items():
+            existing = store.items.get(leetcode_id)
+            if existing is not None:
+                if merge_existing(existing, attempts, store.items, classifier, report):
+                    updated_items.append(existing)
+                continue
+            item = merge_new(attempts, report)
+            new_items.append(item)
+            if item.tag:
+                classifier.add_problem_to_category(item.leetcode_id, item.tag)
+        store.append_many(updated_items)
+        store.add_many(new_items)
+    report.imported = len(new_items)
+    return report
+
@@ -1,29 +1,119 @@
 import datetime
+from collections.abc import MutableMapping
+
+META_KEYS = ("date", "difficulty", "time_cost", "times", "tag")
+_META_KEY_SET = frozenset(META_KEYS)
+
+
+def parse_time_cost(time_cost: str) -> int:
+    """将 "分:秒" / "分" 格式的耗时转换为秒数，无法解析时返回0"""
+    try:
+        parts = time_cost.split(":")
+        if len(parts) == 1:  # 仅分钟格式（如"5"表示5分钟）
+            return int(parts[0]) * 60
+        elif len(parts) == 2:  # 分:秒格式
+            return int(parts[0]) * 60 + int(parts[1])
+        else:
+            raise ValueError("Invalid time format")
+    except (ValueError, AttributeError):
+        return 0
+
+
+def parse_times(times) -> int:
+    """刷题次数转成整数：旧数据里可能是字符串（"1"）、null 或小数，无法解析的记为0"""
+    if isinstance(times, int):
+        return times
+    try:
+        return int(float(times))
+    except (TypeError, ValueError, OverflowError):
+        return 0
+
+
+def parse_date_ordinal(date_str: str) -> int:
+    """将 YYYY-MM-DD（月日可不补零）转换为日期序数，比 strptime 快很多"""
+    year, month, day = date_str.split("-")
+    return datetime.date(int(year), int(month), int(day)).toordinal()
+
+
+def parse_difficulty(difficulty) -> tuple[int, str | None]:
+    """
+    难易度存成整数；无法无损还原成原字符串的（如"Unknown"）额外保留原值
+
+    返回: (整数难易度, 原字符串或None)
+    """
+    try:
+        level = int(difficulty)
+    except (TypeError, ValueError):
+        return 0, difficulty
+    return level, (None if str(level) == difficulty else difficulty)
+
+
+class ItemMeta(MutableMapping):
+    """Item.meta 的兼容视图：读写都直接落到 Item 的字段上"""
+
+    __slots__ = ("_item",)
+
+    def __init__(self, item: "Item"):
+        self._item = item
+
+    def __getitem__(self, key):
+        if key in META_KEYS:
+            return getattr(self._item, key)
+        extra = self._item._extra
+        if extra is None or key not in extra:
+            raise KeyError(key)
+        return extra[key]
+
+    def __setitem__(self, key, value):
+        self._item._set_field(key, value)
+
+    def __delitem__(self, key):
+        if key in META_KEYS or self._item._extra is None:
+            raise KeyError(key)
+        del self._item._extra[key]
+
+    def __iter__(self):
+        yield from META_KEYS
+        if self._item._extra:
+            yield from self._item._extra
+
+    def __len__(self):
+        return len(META_KEYS) + len(self._item._extra or ())
+
+    def __repr__(self):
+        return repr(dict(self))
+
 
 class Item:
+    """
+    单道题目。字段在加载时解析一次并存成紧凑的整数：
+    耗时秒数、难易度、日期序数，使用 __slots__ 省掉每个实例的 __dict__。
+    """
+
+    __slots__ = (
+        "leetcode_id", "leetcode_url", "_date_ord", "_difficulty", "_difficulty_raw",
+        "_time_cost", "_seconds", "_times", "_tag", "_extra",
+    )
+
     def __init__(self, leetcode_id: int, meta: dict, leetcode_url: str):
         self.leetcode_id = leetcode_id  # 题目ID作为独立属性
-        self.meta = meta  # 其他属性统一存入meta字典
         self.leetcode_url = leetcode_url
-        
+        self._extra = None
         # 确保meta包含必要字段的默认值（可选）
-        self.meta.setdefault("date", datetime.date.today())
-        self.meta.setdefault("difficulty", "Unknown")
-        self.meta.setdefault("time_cost", "0:00")
-        self.meta.setdefault("times", 0)
+        self.meta = meta
 
     def __repr__(self):
         return (
             f"题目: \n"
             f"  leetcode_id={self.leetcode_id}\n"
             f"  leetcode_url={self.leetcode_url}\n"
-            f"  date={self.meta['date']}\n"
-            f"  difficulty={self.meta['difficulty']}\n"
-            f"  time_cost={self.meta['time_cost']}\n"
-            f"  times={self.meta['times']}\n"
-            f"  tag={self.meta['tag']}"
+            f"  date={self.date}\n"
+            f"  difficulty={self.difficulty}\n"
+            f"  time_cost={self.time_cost}\n"
+            f"  times={self.times}\n"
+            f"  tag={self.tag}"
         )
-    
+
     def to_dict(self) -> dict:
         """序列化为字典（包含日期格式化）"""
         return {
@@ -31,58 +121,105 @@ class Item:
             "leetcode_url": self.leetcode_url,
             "meta": {
                 # 日期序列化为ISO字符串
-                "date": self.meta["date"].isoformat(),
-                "difficulty": self.meta["difficulty"],
-                "time_cost": self.meta["time_cost"],
-                "times": self.meta["times"],
-                "tag": self.meta["tag"]
+                "date": self.date.isoformat(),
+                "difficulty": self.difficulty,
+                "time_cost": self._time_cost,
+                "times": self._times,
+                "tag": self._tag
             }
         }
 
     @classmethod
     def from_dict(cls, data: dict) -> "Item":
-        """从字典反序列化"""
-        meta = data["meta"].copy()
-        # 日期反序列化为date对象
-        meta["date"] = datetime.datetime.strptime(
-            meta["date"], "%Y-%m-%d"
-        ).date()
-        return cls(
-            leetcode_id=data["leetcode_id"],
-            leetcode_url=data["leetcode_url"],
-            meta=meta
-        )
+        """从字典反序列化（直接解析成紧凑字段，不经过 strptime）"""
+        meta = data["meta"]
+        item = cls.__new__(cls)
+        item.leetcode_id = data["leetcode_id"]
+        item.leetcode_url = data["leetcode_url"]
+        item._date_ord = parse_date_ordinal(meta["date"])
+        item._difficulty, item._difficulty_raw = parse_difficulty(meta.get("difficulty", "Unknown"))
+        item._time_cost = meta.get("time_cost", "0:00")
+        item._seconds = parse_time_cost(item._time_cost)
+        item._times = parse_times(meta.get("times", 0))
+        item._tag = meta.get("tag")
+        if meta.keys() <= _META_KEY_SET:
+            item._extra = None
+        else:
+            item._extra = {key: value for key, value in meta.items() if key not in _META_KEY_SET}
+        return item
 
     def time_cost_in_seconds(self) -> int:
-        """将 time_cost 转换为秒数"""
-        try:
-            parts = self.meta["time_cost"].split(":")
-            if len(parts) == 1:  # 仅分钟格式（如"5"表示5分钟）
-                return int(parts[0]) * 60
-            elif len(parts) == 2:  # 分:秒格式
-                return int(parts[0]) * 60 + int(parts[1])
-            else:
-                raise ValueError("Invalid time format")
-        except (ValueError, AttributeError):
-            return 0
+        """将 time_cost 转换为秒数（加载时已解析好）"""
+        return self._seconds
+
+    @property
+    def meta(self) -> ItemMeta:
+        """旧代码用的 meta 字典接口，读写都作用在本对象上"""
+        return ItemMeta(self)
+
+    @meta.setter
+    def meta(self, meta: dict) -> None:
+        meta = dict(meta)
+        self.date = meta.pop("date", None) or datetime.date.today()
+        self.difficulty = meta.pop("difficulty", "Unknown")
+        self.time_cost = meta.pop("time_cost", "0:00")
+        self._times = parse_times(meta.pop("times", 0))
+        self._tag = meta.pop("tag", None)
+        self._extra = meta or None
+
+    def _set_field(self, key, value) -> None:
+        if key in ("date", "difficulty", "time_cost"):
+            setattr(self, key, value)
+        elif key == "times":
+            self._times = parse_times(value)
+        elif key == "tag":
+            self._tag = value
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
 
     # 可选：通过属性快速访问常用字段（保持旧代码兼容性）
     @property
     def date(self) -> datetime.date:
-        return self.meta["date"]
+        return datetime.date.fromordinal(self._date_ord)
+
+    @date.setter
+    def date(self, value: datetime.date) -> None:
+        self._date_ord = value.toordinal()
+
+    @property
+    def date_ordinal(self) -> int:
+        return self._date_ord
 
     @property
     def difficulty(self) -> str:
-        return self.meta["difficulty"]
+        if self._difficulty_raw is not None:
+            return self._difficulty_raw
+        return str(self._difficulty)
+
+    @difficulty.setter
+    def difficulty(self, value: str) -> None:
+        self._difficulty, self._difficulty_raw = parse_difficulty(value)
+
+    @property
+    def difficulty_level(self) -> int:
+        """整数难易度（1-3，未知为0）"""
+        return self._difficulty
 
     @property
     def time_cost(self) -> str:
-        return self.meta["time_cost"]
+        return self._time_cost
+
+    @time_cost.setter
+    def time_cost(self, value: str) -> None:
+        self._time_cost = value
+        self._seconds = parse_time_cost(value)
 
     @property
     def times(self) -> int:
-        return self.meta["times"]
-    
+        return self._times
+
     @property
     def tag(self) -> str:
-        return self.meta["tag"]
\ No newline at end of file
+        return self._tag
@@ -0,0 +1,101 @@
+from array import array
+from typing import Iterable
+from objects.item import Item, parse_date_ordinal, parse_difficulty, parse_time_cost, parse_times
+
+
+class ItemColumns:
+    """
+    按列存储的题目集合：数值字段放在 array 里（每个值4~8字节），
+    字符串字段只保留必须原样还原的部分，tag 编码成整数。
+    适合一次性加载大量历史记录、批量打分；需要单个对象时再用 item(i) 还原成 Item。
+    """
+
+    def __init__(self):
+        self.leetcode_ids = array("q")
+        self.seconds = array("l")
+        self.date_ords = array("l")
+        self.difficulties = array("l")
+        self.times = array("l")
+        self.tag_codes = array("l")
+        self.tag_names: list = []  # tag编码 -> tag名
+        self._tag_index: dict = {}  # tag名 -> tag编码
+        self.urls: list[str] = []
+        self.time_costs: list[str] = []  # 原始耗时字符串，保证 to_dict 原样输出
+        self.difficulty_raw: dict[int, str] = {}  # 行号 -> 无法用整数还原的难易度字符串
+
+    def __len__(self) -> int:
+        return len(self.leetcode_ids)
+
+    def tag_code(self, tag) -> int:
+        """tag名对应的整数编码（不存在则新建）"""
+        code = self._tag_index.get(tag)
+        if code is None:
+            code = self._tag_index[tag] = len(self.tag_names)
+            self.tag_names.append(tag)
+        return code
+
+    def append(self, item: Item) -> None:
+        row = len(self.leetcode_ids)
+        self.leetcode_ids.append(item.leetcode_id)
+        self.seconds.append(item.time_cost_in_seconds())
+        self.date_ords.append(item.date_ordinal)
+        self.difficulties.append(item.difficulty_level)
+        if item.difficulty != str(item.difficulty_level):
+            self.difficulty_raw[row] = item.difficulty
+        self.times.append(item.times)
+        self.tag_codes.append(self.tag_code(item.tag))
+        self.urls.append(item.leetcode_url)
+        self.time_costs.append(item.time_cost)
+
+    def append_dict(self, data: dict) -> None:
+        """直接从JSON字典追加一行，不创建中间 Item 对象"""
+        meta = data["meta"]
+        row = len(self.leetcode_ids)
+        time_cost = meta.get("time_cost", "0:00")
+        level, raw = parse_difficulty(meta.get("difficulty", "Unknown"))
+        self.leetcode_ids.append(data["leetcode_id"])
+        self.seconds.append(parse_time_cost(time_cost))
+        self.date_ords.append(parse_date_ordinal(meta["date"]))
+        self.difficulties.append(level)
+        if raw is not None:
+            self.difficulty_raw[row] = raw
+        self.times.append(parse_times(meta.get("times", 0)))
+        self.tag_codes.append(self.tag_code(meta.get("tag")))
+        self.urls.append(data["leetcode_url"])
+        self.time_costs.append(time_cost)
+
+    def item(self, row: int) -> Item:
+        """把第 row 行还原成 Item"""
+        item = Item.__new__(Item)
+        item.leetcode_id = self.leetcode_ids[row]
+        item.leetcode_url = self.urls[row]
+        item._date_ord = self.date_ords[row]
+        item._difficulty = self.difficulties[row]
+        item._difficulty_raw = self.difficulty_raw.get(row)
+        item._time_cost = self.time_costs[row]
+        item._seconds = self.seconds[row]
+        item._times = self.times[row]
+        item._tag = self.tag_names[self.tag_codes[row]]
+        item._extra = None
+        return item
+
+    def to_items(self) -> list[Item]:
+        return [self.item(row) for row in range(len(self))]
+
+    def to_dicts(self) -> list[dict]:
+        """与 Item.to_dict 相同的JSON格式"""
+        return [self.item(row).to_dict() for row in range(len(self))]
+
+    @classmethod
+    def from_items(cls, items: Iterable[Item]) -> "ItemColumns":
+        columns = cls()
+        for item in items:
+            columns.append(item)
+        return columns
+
+    @classmethod
+    def from_dicts(cls, data: Iterable[dict]) -> "ItemColumns":
+        columns = cls()
+        for row in data:
+            columns.append_dict(row)
+        return columns
@@ -0,0 +1,160 @@
+import bisect
+import datetime
+from typing import Callable, Iterable, Iterator
+from objects.item import Item
+
+# 监听器参数: (leetcode_id, 修改前的(秒数, 日期序数) 或 None, 修改后的(秒数, 日期序数) 或 None)
+ItemListener = Callable[[int, tuple | None, tuple | None], None]
+
+
+class ItemStore:
+    """
+    带索引的题目集合，替代对 items 列表的线性扫描
+
+    索引:
+        leetcode_id -> 题目（哈希，O(1)）
+        tag -> 题目（哈希，O(1)）
+        date -> 题目（有序列表 + 二分，区间查询 O(log N)）
+    所有修改都要经过 add/put/update，索引才能保持一致；
+    需要增量维护统计量的模块可以通过 add_listener 订阅这些修改。
+    """
+
+    def __init__(self, items: Iterable[Item] = ()):
+        self._items: list[Item] = []
+        self._seq: dict[int, int] = {}  # id(item) -> 插入序号，用于保持原列表顺序
+        self._by_id: dict[int, list[Item]] = {}
+        self._by_tag: dict[str, dict[int, Item]] = {}
+        self._date_keys: list[tuple[int, int]] = []  # (日期序数, 插入序号)，保持有序
+        self._by_seq: dict[int, Item] = {}
+        self._indexed: dict[int, tuple] = {}  # id(item) -> 建索引时的 (tag, 日期序数)
+        self._listeners: list[ItemListener] = []
+        for item in items:
+            self.add(item, keep_sorted=False)
+        self._date_keys.sort()  # 批量加载时最后统一排序一次
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self) -> Iterator[Item]:
+        return iter(self._items)
+
+    def __getitem__(self, index):
+        return self._items[index]
+
+    def add(self, item: Item, keep_sorted: bool = True) -> None:
+        """追加一道题并建立索引"""
+        seq = len(self._items)
+        self._items.append(item)
+        self._seq[id(item)] = seq
+        self._by_seq[seq] = item
+        self._by_id.setdefault(item.leetcode_id, []).append(item)
+        self._index(item, seq, keep_sorted)
+        if self._listeners:
+            self._notify(item.leetcode_id, None, _stat_key(item))
+
+    def put(self, item: Item) -> None:
+        """按 leetcode_id 覆盖写入：已存在则替换第一条，否则追加"""
+        old = self.get(item.leetcode_id)
+        if old is None:
+            self.add(item)
+            return
+        seq = self._seq.pop(id(old))
+        self._unindex(old, seq)
+        self._items[seq] = item
+        self._seq[id(item)] = seq
+        self._by_seq[seq] = item
+        same_id = self._by_id[item.leetcode_id]
+        same_id[same_id.index(old)] = item
+        self._index(item, seq)
+        self._notify(item.leetcode_id, _stat_key(old), _stat_key(item))
+
+    def update(self, item: Item, changes: dict) -> None:
+        """修改题目的 meta 字段并刷新索引"""
+        seq = self._seq[id(item)]
+        before = _stat_key(item)
+        self._unindex(item, seq)
+        item.meta.update(changes)
+        self._index(item, seq)
+        self._notify(item.leetcode_id, before, _stat_key(item))
+
+    def add_listener(self, listener: ItemListener) -> None:
+        """订阅题目的增改（用于增量维护统计量）"""
+        self._listeners.append(listener)
+
+    def get(self, leetcode_id: int) -> Item | None:
+        """按题号查找（重复题号返回最早的一条）"""
+        same_id = self._by_id.get(leetcode_id)
+        return same_id[0] if same_id else None
+
+    def items_for_ids(self, leetcode_ids: Iterable[int]) -> list[Item]:
+        """取出一组题号对应的所有题目，按原列表顺序返回"""
+        found = []
+        for leetcode_id in set(leetcode_ids):
+            found.extend(self._by_id.get(leetcode_id, ()))
+        found.sort(key=lambda item: self._seq[id(item)])
+        return found
+
+    def by_tag(self, tag: str) -> list[Item]:
+        """某个 tag 下的所有题目，按原列表顺序"""
+        tag_items = self._by_tag.get(tag, {})
+        return [tag_items[seq] for seq in sorted(tag_items)]
+
+    def tags(self) -> list[str]:
+        return list(self._by_tag)
+
+    def between(self, start: datetime.date, end: datetime.date) -> list[Item]:
+        """日期在 [start, end] 区间内的题目，按日期排序"""
+        lo = bisect.bisect_left(self._date_keys, (start.toordinal(), -1))
+        hi = bisect.bisect_right(self._date_keys, (end.toordinal(), len(self._items)))
+        return [self._by_seq[seq] for _, seq in self._date_keys[lo:hi]]
+
+    def iter_between(self, start: datetime.date | None = None, end: datetime.date | None = None,
+                     reverse: bool = False) -> Iterator[Item]:
+        """
+        按日期顺序逐个产出 [start, end] 内的题目（不限则为全部），不复制索引；迭代期间不要修改集合。
+        reverse 时日期从新到旧，同一天的题仍按原列表顺序
+        """
+        date_keys, by_seq = self._date_keys, self._by_seq
+        lo = 0 if start is None else bisect.bisect_left(date_keys, (start.toordinal(), -1))
+        hi = len(date_keys) if end is None else bisect.bisect_right(date_keys, (end.toordinal(), len(self._items)))
+        if not reverse:
+            for index in range(lo, hi):
+                yield by_seq[date_keys[index][1]]
+            return
+        while hi > lo:
+            day_start = bisect.bisect_left(date_keys, (date_keys[hi - 1][0], -1), lo, hi)
+            for index in range(day_start, hi):
+                yield by_seq[date_keys[index][1]]
+            hi = day_start
+
+    def on_date(self, day: datetime.date) -> list[Item]:
+        """某一天刷过的题目"""
+        return self.between(day, day)
+
+    def _notify(self, leetcode_id: int, before: tuple | None, after: tuple | None) -> None:
+        for listener in self._listeners:
+            listener(leetcode_id, before, after)
+
+    def _index(self, item: Item, seq: int, keep_sorted: bool = True) -> None:
+        tag = item.tag
+        date_ord = item.date_ordinal
+        self._by_tag.setdefault(tag, {})[seq] = item
+        if keep_sorted:
+            bisect.insort(self._date_keys, (date_ord, seq))
+        else:
+            self._date_keys.append((date_ord, seq))
+        self._indexed[id(item)] = (tag, date_ord)
+
+    def _unindex(self, item: Item, seq: int) -> None:
+        tag, date_ord = self._indexed.pop(id(item))
+        tag_items = self._by_tag[tag]
+        del tag_items[seq]
+        if not tag_items:
+            del self._by_tag[tag]
+        key = (date_ord, seq)
+        del self._date_keys[bisect.bisect_left(self._date_keys, key)]
+
+
+def _stat_key(item: Item) -> tuple[int, int]:
+    """统计量关心的字段: (耗时秒数, 日期序数)"""
+    return item.time_cost_in_seconds(), item.date_ordinal
@@ -0,0 +1,178 @@
+import datetime
+import json
+import os
+import threading
+from pathlib import Path
+from objects import snapshot_cache
+from objects.fileio import atomic_write_json
+from objects.item import Item
+from objects.item_columns import ItemColumns
+from objects.item_store import ItemStore
+
+
+class JournalStore:
+    """
+    追加写日志存储：每次添加/更新只往日志末尾追加一行记录，
+    加载时 快照 + 日志重放，日志过长时在后台线程压缩成新快照，退出时再压缩一次。
+
+    日志记录是以 leetcode_id 为键的覆盖写入（put），重复重放结果不变，
+    所以压缩过程中任意时刻崩溃都能恢复到一致的状态。
+    """
+
+    def __init__(self, snapshot_path: str, compact_threshold: int = 500, read_only: bool = False):
+        self.snapshot_path = Path(snapshot_path)
+        self.journal_path = self.snapshot_path.with_name(self.snapshot_path.name + ".journal")
+        # 正在压缩的旧日志，压缩完成后删除
+        self.pending_path = self.snapshot_path.with_name(self.snapshot_path.name + ".journal.1")
+        self.compact_threshold = compact_threshold
+        self.read_only = read_only  # 只读打开：加载时不合并遗留日志、不写缓存，close() 不压缩（可与其他进程同时读）
+        self.items = ItemStore()
+        self._journal = None
+        self._journal_records = 0
+        self._compactor: threading.Thread | None = None
+        self._dirty = False  # 内存数据是否比快照新
+
+    def load(self) -> ItemStore:
+        """读取快照并重放日志，返回带索引的题目集合"""
+        self.items = ItemStore(self._load_snapshot().to_items())
+
+        self._journal_records = 0
+        for path in (self.pending_path, self.journal_path):
+            records, end = self._read_journal(path)
+            for record in records:
+                self._apply(record)
+                self._journal_records += 1
+            if path == self.journal_path and end is not None and not self.read_only:
+                with open(path, "r+b") as f:
+                    f.truncate(end)  # 截掉写到一半的记录，否则下一条会接在半行后面，重放时被一起丢掉
+        self._dirty = self._journal_records > 0
+
+        # 上次压缩被中断，先把遗留的旧日志合并掉
+        if self.pending_path.exists() and not self.read_only:
+            self.compact()
+        return self.items
+
+    def append(self, item: Item) -> None:
+        """把一次添加/更新追加到日志（写入并fsync后才返回）"""
+        self.append_many([item])
+
+    def append_many(self, items: list[Item]) -> None:
+        """把多次添加/更新一起追加到日志，只fsync一次"""
+        if not items:
+            return
+        if self._journal is None:
+            self._journal = open(self.journal_path, "a", encoding="utf-8")
+        self._journal.write("".join(json.dumps({"op": "put", "item": item.to_dict()}, ensure_ascii=False) + "\n"
+                                    for item in items))
+        self._journal.flush()
+        os.fsync(self._journal.fileno())
+        self._journal_records += len(items)
+        self._dirty = True
+
+        if self._journal_records >= self.compact_threshold:
+            self.compact(background=True)
+
+    def today_items(self, day: datetime.date | None = None) -> list[Item]:
+        """某一天（默认今天）刷过的题"""
+        return self.items.on_date(day or datetime.date.today())
+
+    def add_many(self, items: list[Item]) -> None:
+        """批量添加（导入用）：不逐条写日志，直接写一次新快照"""
+        if not items:
+            return
+        for item in items:
+            self.items.add(item)
+        self._dirty = True
+        self.compact()
+
+    def compact(self, background: bool = False) -> None:
+        """把当前内存数据写成新快照，并清空日志"""
+        if self._compactor is not None:
+            if background and self._compactor.is_alive():
+                return  # 上一次压缩还没结束，日志先继续增长
+            self._compactor.join()
+            self._compactor = None
+
+        # 在主线程里序列化，避免后台线程读到正在修改的Item
+        data = [item.to_dict() for item in self.items]
+
+        self._close_journal()
+        if self.journal_path.exists():
+            if self.pending_path.exists():
+                # 旧日志还没删掉（上次压缩中断），把新日志并入旧日志
+                with open(self.journal_path, "r", encoding="utf-8") as src, \
+                        open(self.pending_path, "a", encoding="utf-8") as dst:
+                    dst.write(src.read())
+                    dst.flush()
+                    os.fsync(dst.fileno())
+                os.remove(self.journal_path)
+            else:
+                os.replace(self.journal_path, self.pending_path)
+        self._journal_records = 0
+        self._dirty = False
+
+        if background:
+            self._compactor = threading.Thread(target=self._write_snapshot, args=(data,), daemon=True)
+            self._compactor.start()
+        else:
+            self._write_snapshot(data)
+
+    def close(self) -> None:
+        """退出前压缩一次，下次启动只需读快照"""
+        if self._dirty and not self.read_only:
+            self.compact()
+        elif self._compactor is not None:
+            self._compactor.join()
+        self._close_journal()
+
+    def _load_snapshot(self) -> ItemColumns:
+        """优先读二进制缓存；缓存缺失或过期时解析JSON并重建缓存"""
+        columns = snapshot_cache.read_cache(self.snapshot_path)
+        if isinstance(columns, ItemColumns):
+            return columns
+        if not self.snapshot_path.exists():
+            return ItemColumns()
+        with open(self.snapshot_path, "r", encoding="utf-8") as f:
+            columns = ItemColumns.from_dicts(json.load(f))
+        if not self.read_only:
+            snapshot_cache.write_cache(self.snapshot_path, columns)
+        return columns
+
+    def _write_snapshot(self, data: list[dict]) -> None:
+        atomic_write_json(self.snapshot_path, data, indent=4)
+        snapshot_cache.write_cache(self.snapshot_path, ItemColumns.from_dicts(data))
+        if self.pending_path.exists():
+            os.remove(self.pending_path)
+
+    def _close_journal(self) -> None:
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+
+    def _apply(self, record: dict) -> None:
+        """重放一条日志记录"""
+        if record.get("op") != "put":
+            return
+        self.items.put(Item.from_dict(record["item"]))
+
+    @staticmethod
+    def _read_journal(path: Path) -> tuple[list[dict], int | None]:
+        """
+        读取日志的全部记录，末尾被截断的半行（写入时崩溃）忽略。
+        返回 (记录, 残缺部分的起始位置)，没有残缺时位置为 None
+        """
+        if not path.exists():
+            return [], None
+        records = []
+        offset = 0
+        with open(path, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    return records, offset  # 换行符还没写完，这次追加没有成功返回过
+                try:
+                    if line.strip():
+                        records.append(json.loads(line))
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    return records, offset
+                offset += len(line)
+        return records, None
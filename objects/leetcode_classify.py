@@ -1,29 +1,212 @@
+import heapq
 import json
+from array import array
+from collections import Counter
+from contextlib import contextmanager
 from pathlib import Path
+from objects import scoring, snapshot_cache
+from objects.attempt_history import AttemptHistory
 from objects.item import Item
+from objects.item_columns import ItemColumns
+from objects.item_store import ItemStore
+from objects.fileio import atomic_write_json
+from objects.relation_graph import RelationGraph
+from objects.result_cache import ResultCache
+from objects.sqlite_store import SqliteStore
 import datetime
 
+
+class _TagAggregate:
+    """
+    单个tag的增量统计：题目数、耗时总和、最旧日期（最小堆 + 延迟删除）
+    已删除的日期到了堆顶才真正弹出；堆里残留的已删除条目多于有效条目时整体重建一次，
+    所以长时间运行（serve）时堆的大小不随修改次数增长
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.total_seconds = 0
+        self._dates: list[int] = []  # 日期序数的最小堆
+        self._removed: Counter = Counter()  # 已删除但还留在堆里的日期
+        self._stale = 0  # 堆里已删除条目的数量
+
+    def add(self, seconds: int, date_ord: int) -> None:
+        self.count += 1
+        self.total_seconds += seconds
+        heapq.heappush(self._dates, date_ord)
+
+    def remove(self, seconds: int, date_ord: int) -> None:
+        self.count -= 1
+        self.total_seconds -= seconds
+        self._removed[date_ord] += 1
+        self._stale += 1
+        if self._stale > self.count:
+            self._compact()
+
+    def oldest_date(self) -> int:
+        """最旧日期序数"""
+        while self._dates[0] in self._removed:
+            self._discard(heapq.heappop(self._dates))
+        return self._dates[0]
+
+    def _discard(self, date_ord: int) -> None:
+        self._stale -= 1
+        if self._removed[date_ord] == 1:
+            del self._removed[date_ord]
+        else:
+            self._removed[date_ord] -= 1
+
+    def _compact(self) -> None:
+        """去掉堆里全部已删除的条目 O(n)"""
+        live = Counter(self._dates)
+        live.subtract(self._removed)
+        self._dates = list(live.elements())
+        heapq.heapify(self._dates)
+        self._removed.clear()
+        self._stale = 0
+
+
 class LeetCodeClassify:
-    def __init__(self, data_path: str = "data/classification.json"):
+    def __init__(self, data_path: str = "data/classification.json", store: ItemStore | None = None,
+                 db: SqliteStore | None = None, read_only: bool = False):
+        """
+        参数:
+            data_path (str): 分类JSON文件（使用 SQLite 后端时不读写）
+            store (ItemStore): 题目集合，绑定后增量维护每个tag的统计
+            db (SqliteStore): SQLite 后端，分类映射存到关联表，tag统计下推到SQL
+            read_only (bool): 只读打开，不写分类文件和缓存（修改只留在内存里）
+        """
         self.data_path = Path(data_path)
+        self.read_only = read_only
+        self._db = db
+        self._batch_depth = 0
+        self._dirty = False
         self._load_data()
+        self.relations = RelationGraph(self.data)  # 题目关联图，邻域按需计算并缓存
+        self.cache = ResultCache()  # 分数和关联题列表的缓存，每次修改按tag失效
+        self._store: ItemStore | None = None
+        self._aggregates: dict[str, _TagAggregate] = {}
+        if store is not None:
+            self.attach_store(store)
+
+    def attach_store(self, store: ItemStore) -> None:
+        """绑定题目集合，之后按tag增量维护统计量，打分不再遍历题目"""
+        self._store = store
+        self.relations.attach_store(store)
+        self.cache.clear()
+        self._rebuild_aggregates()
+        store.add_listener(self._on_item_changed)
+
+    def cached(self, items: ItemStore | list[Item] | None, key, compute, tags=None):
+        """
+        经过结果缓存计算：只有 items 是绑定的题目集合（或 None）时才缓存，其他题目列表直接计算
+
+        参数:
+            key: 结果的缓存键
+            compute: 无参函数，算出结果
+            tags: 结果只依赖这些tag里的题时传入，其他tag的修改不会让它失效
+        """
+        if self._store is None or (items is not None and items is not self._store):
+            return compute()
+        if self._db is not None:
+            key = (key, self._db.revision)  # 统计在数据库里，题目写入数据库后重新读
+        return self.cache.get(key, compute, tags)
+
+    def _rebuild_aggregates(self) -> None:
+        self._aggregates = {}
+        if self._store is None or self._db is not None:
+            return
+        for category, problem_ids in self.data["category_to_problems"].items():
+            for item in self._store.items_for_ids(problem_ids):
+                self._aggregate(category).add(item.time_cost_in_seconds(), item.date_ordinal)
 
     def _load_data(self) -> None:
-        """从 JSON 文件加载数据到内存"""
-        if not self.data_path.exists():
+        """从 JSON 文件加载数据到内存（内存中用 set 存储，成员判断 O(1)）"""
+        if self._db is not None:
+            self.data = self._db.load_classification()
+        elif not self.data_path.exists():
             self.data = {
                 "category_to_problems": {},
                 "problem_to_categories": {}
             }
-            self._save_data()
+            if not self.read_only:
+                self._save_data()
         else:
+            cached = snapshot_cache.read_cache(self.data_path)
+            if isinstance(cached, dict):
+                self.data = cached
+                return
             with open(self.data_path, "r", encoding="utf-8") as f:
-                self.data = json.load(f)
+                raw = json.load(f)
+            self.data = {
+                key: {name: set(values) for name, values in raw.get(key, {}).items()}
+                for key in ("category_to_problems", "problem_to_categories")
+            }
+            if not self.read_only:
+                snapshot_cache.write_cache(self.data_path, self.data)
 
     def _save_data(self) -> None:
-        """保存内存中的数据到 JSON 文件"""
-        with open(self.data_path, "w", encoding="utf-8") as f:
-            json.dump(self.data, f, ensure_ascii=False, indent=2)
+        """保存内存中的数据到 JSON 文件；batch() 内只标记，退出时统一写一次"""
+        if self._batch_depth:
+            self._dirty = True
+            return
+        if self.read_only:
+            return
+        if self._db is not None:
+            self._db.commit()
+            self._dirty = False
+            return
+        serialized = {
+            key: {name: sorted(values) for name, values in mapping.items()}
+            for key, mapping in self.data.items()
+        }
+        atomic_write_json(self.data_path, serialized, indent=2)
+        snapshot_cache.write_cache(self.data_path, self.data)
+        self._dirty = False
+
+    @contextmanager
+    def batch(self, flush: bool = True):
+        """
+        批量修改分类：块内的所有修改只在内存中进行，正常退出时原子地写一次文件；
+        块内抛出异常则回滚到进入前的状态，文件不变。可以嵌套，只有最外层负责写入。
+        flush=False 时退出后不写文件，由调用方稍后调用 flush()（例如放到工作线程里写）。
+
+        用法:
+            with classifier.batch():
+                for problem_id, tag in pairs:
+                    classifier.add_problem_to_category(problem_id, tag)
+        """
+        if self._batch_depth:
+            self._batch_depth += 1
+            try:
+                yield self
+            finally:
+                self._batch_depth -= 1
+            return
+
+        backup = {key: {name: set(values) for name, values in mapping.items()}
+                  for key, mapping in self.data.items()}
+        self._batch_depth = 1
+        try:
+            yield self
+        except BaseException:
+            if self._db is not None:
+                self._db.rollback()
+            self.data = backup
+            self._dirty = False
+            self._rebuild_aggregates()
+            self.relations.reset(self.data)
+            self.cache.clear()
+            raise
+        finally:
+            self._batch_depth = 0
+        if flush:
+            self.flush()
+
+    def flush(self) -> None:
+        """把 batch(flush=False) 留下的修改写入文件"""
+        if self._dirty:
+            self._save_data()
 
     def add_problem_to_category(self, problem_id: int, category: str) -> None:
         """将题号添加到分类（双向索引）"""
@@ -31,32 +214,40 @@ class LeetCodeClassify:
         
         # 更新 category_to_problems
         if category not in self.data["category_to_problems"]:
-            self.data["category_to_problems"][category] = []
+            self.data["category_to_problems"][category] = set()
         if problem_id not in self.data["category_to_problems"][category]:
-            self.data["category_to_problems"][category].append(problem_id)
+            self.data["category_to_problems"][category].add(problem_id)
+            self._on_linked(problem_id, category)
         
         # 更新 problem_to_categories
         if problem_id_str not in self.data["problem_to_categories"]:
-            self.data["problem_to_categories"][problem_id_str] = []
+            self.data["problem_to_categories"][problem_id_str] = set()
         if category not in self.data["problem_to_categories"][problem_id_str]:
-            self.data["problem_to_categories"][problem_id_str].append(category)
+            self.data["problem_to_categories"][problem_id_str].add(category)
         
         self._save_data()
 
-    def get_related_problems(self, problem_id: int, category: str, exclude_self: bool = True) -> list[int]:
-        """获取与题目关联的所有题目（跨分类）"""
-        problem_id_list = self.data["category_to_problems"].get(category, [])
-        
-        related = set(problem_id_list)
-        
-        # if exclude_self and problem_id in related:
-        #     related.remove(problem_id)
-        
-        return sorted(related)
+    def get_related_problems(self, problem_id: int, category: str | None = None, exclude_self: bool = True,
+                             limit: int | None = None) -> list[int]:
+        """
+        获取与题目关联的题目，按关联权重从高到低排列（共同分类越多越靠前，其次难度越接近越靠前）
+
+        参数:
+            category (str): 只返回该分类里的题，None 表示跨所有分类
+            exclude_self (bool): 是否排除题目自己
+            limit (int): 最多返回几道
+        """
+        tags = self.get_categories_of_problem(problem_id)
+        if category is not None:
+            tags.append(category)
+        related = self.cache.get(
+            ("related", problem_id, category, exclude_self, limit),
+            lambda: self.relations.related(problem_id, category, limit=limit, exclude_self=exclude_self), tags)
+        return list(related)
 
     def get_categories_of_problem(self, problem_id: int) -> list[str]:
         """获取题目所属的所有分类"""
-        return self.data["problem_to_categories"].get(str(problem_id), [])
+        return list(self.data["problem_to_categories"].get(str(problem_id), ()))
 
     def delete_problem_from_category(self, problem_id: int, category: str) -> None:
         """从分类中移除题目（双向清理）"""
@@ -64,6 +255,7 @@ class LeetCodeClassify:
         if category in self.data["category_to_problems"]:
             if problem_id in self.data["category_to_problems"][category]:
                 self.data["category_to_problems"][category].remove(problem_id)
+                self._on_unlinked(problem_id, category)
             # 如果分类为空则删除
             if not self.data["category_to_problems"][category]:
                 del self.data["category_to_problems"][category]
@@ -88,10 +280,10 @@ class LeetCodeClassify:
             new_categories (list[str]): 新分类列表（去重后覆盖）
         """
         problem_id_str = str(problem_id)
-        new_categories = list(set(new_categories))  # 去重
+        new_categories = set(new_categories)  # 去重
 
         # 1. 获取当前分类（拷贝避免遍历时修改问题）
-        current_categories = self.data["problem_to_categories"].get(problem_id_str, []).copy()
+        current_categories = set(self.data["problem_to_categories"].get(problem_id_str, ()))
 
         # 2. 从旧分类中移除题目
         for category in current_categories:
@@ -99,6 +291,7 @@ class LeetCodeClassify:
                 # 确保题目存在于该分类的列表中
                 if problem_id in self.data["category_to_problems"][category]:
                     self.data["category_to_problems"][category].remove(problem_id)
+                    self._on_unlinked(problem_id, category)
                     # 如果分类为空，删除该分类条目
                     if not self.data["category_to_problems"][category]:
                         del self.data["category_to_problems"][category]
@@ -110,9 +303,10 @@ class LeetCodeClassify:
             # 更新正向索引（分类→题目）
             for category in new_categories:
                 if category not in self.data["category_to_problems"]:
-                    self.data["category_to_problems"][category] = []
+                    self.data["category_to_problems"][category] = set()
                 if problem_id not in self.data["category_to_problems"][category]:
-                    self.data["category_to_problems"][category].append(problem_id)
+                    self.data["category_to_problems"][category].add(problem_id)
+                    self._on_linked(problem_id, category)
         else:
             # 如果没有新分类，删除反向索引条目
             if problem_id_str in self.data["problem_to_categories"]:
@@ -121,33 +315,57 @@ class LeetCodeClassify:
         # 4. 保存数据
         self._save_data()
     
-    def calculate_tag_scores(self, items: list[Item]) -> dict[str, float]:
-        """计算每个tag的得分（0-10）基于平均耗时和最近更新时间"""
-        tag_scores = {}
-        for tag, problem_ids in self.data["category_to_problems"].items():
-            # 获取该tag下所有题目对象
-            tag_items = [item for item in items if item.leetcode_id in problem_ids]
-            if not tag_items:
-                continue
-            
-            # 计算平均耗时（秒）
-            avg_time = sum(item.time_cost_in_seconds() for item in tag_items) / len(tag_items)
-            # 计算最旧更新时间（距离今天的天数）
-            oldest_date = min(item.date for item in tag_items)
-            days_old = (datetime.date.today() - oldest_date).days
-            
-            # 标准化到0-10分（耗时占比50%，时间占比50%）
-            time_score = min(avg_time / 1800 * 10, 10)  # 假设30分钟为满分
-            date_score = min(days_old / 30 * 10, 10)    # 假设30天未刷为满分
-            total_score = (time_score + date_score) / 2
-            tag_scores[tag] = round(total_score, 2)
-        
-        return tag_scores
+    def tag_stats(self, items: ItemStore | list[Item] | None = None,
+                  history: AttemptHistory | None = None) -> dict[str, tuple[int, int, int]]:
+        """
+        每个tag的 (题目数, 耗时总和秒数, 最旧日期序数)，绑定了题目集合时直接读增量统计；
+        给出 history 时每道题的耗时用历史的加权平均
+        """
+        if history is not None:
+            return dict(self.cached(items, ("tag_stats", "history"), lambda: self._history_tag_stats(items, history)))
+        return dict(self.cached(items, "tag_stats", lambda: self._tag_stats(items)))
+
+    def _history_tag_stats(self, items: ItemStore | list[Item] | None,
+                           history: AttemptHistory) -> dict[str, tuple[int, int, int]]:
+        if self._store is None or (items is not None and items is not self._store):
+            items = items if items is not None else []
+            columns = ItemColumns.from_items(items)
+            columns.seconds = array("l", map(history.effective_seconds, items))
+            return scoring.tag_stats(columns, self.data["category_to_problems"])
+        # 题目数和最旧日期与不用历史时相同；耗时总和按tag缓存，修改一道题只重算它所属的tag
+        category_to_problems = self.data["category_to_problems"]
+
+        def total_seconds(tag):
+            return self.cache.get(("history_seconds", tag), lambda: sum(
+                map(history.effective_seconds, self._store.items_for_ids(category_to_problems[tag]))), tags=(tag,))
+        return {tag: (count, total_seconds(tag), oldest) for tag, (count, _, oldest) in self.tag_stats(items).items()}
+
+    def _tag_stats(self, items: ItemStore | list[Item] | None) -> dict[str, tuple[int, int, int]]:
+        if self._db is not None and (items is None or items is self._store):
+            db_stats = self._db.tag_stats()
+            return {tag: db_stats[tag] for tag in self.data["category_to_problems"] if tag in db_stats}
+        if self._store is not None and (items is None or items is self._store):
+            return {
+                tag: (agg.count, agg.total_seconds, agg.oldest_date())
+                for tag in self.data["category_to_problems"]
+                if (agg := self._aggregates.get(tag)) is not None and agg.count
+            }
+        # 未绑定的题目列表：转成列存后分组统计
+        columns = ItemColumns.from_items(items if items is not None else [])
+        return scoring.tag_stats(columns, self.data["category_to_problems"])
+
+    def calculate_tag_scores(self, items: ItemStore | list[Item] | None = None,
+                             history: AttemptHistory | None = None) -> dict[str, float]:
+        """计算每个tag的得分（0-10）基于平均耗时和最近更新时间（给出 history 时耗时用历史的加权平均）"""
+        key = "tag_scores" if history is None else ("tag_scores", "history")
+        return dict(self.cached(items, key, lambda: _scores_from_stats(self.tag_stats(items, history))))
     
     # 添加在LeetCodeClassify类中的方法
-    def print_tag_scores_table(self, items: list[Item]) -> None:
+    def print_tag_scores_table(self, items: ItemStore | list[Item] | None = None,
+                               history: AttemptHistory | None = None) -> None:
         """以表格形式打印所有分类的分数"""
-        tag_scores = self.calculate_tag_scores(items)
+        stats = self.tag_stats(items, history)
+        tag_scores = self.calculate_tag_scores(items, history)
         if not tag_scores:
             print("暂无分类分数信息")
             return
@@ -165,13 +383,12 @@ class LeetCodeClassify:
         
         # 打印数据行
         for tag, score in sorted(tag_scores.items(), key=lambda x: x[1], reverse=True):
-            # 获取该分类的详细数据
-            problem_ids = self.data["category_to_problems"][tag]
-            tag_items = [item for item in items if item.leetcode_id in problem_ids]
+            # 该分类的统计数据
+            count, total_seconds, oldest = stats[tag]
             
-            avg_time = sum(i.time_cost_in_seconds() for i in tag_items)/len(tag_items)
-            oldest_date = min(i.date for i in tag_items).strftime("%Y-%m-%d")
-            nums = f"{len(tag_items)}"
+            avg_time = total_seconds/count
+            oldest_date = datetime.date.fromordinal(oldest).strftime("%Y-%m-%d")
+            nums = f"{count}"
 
             # 格式转换
             avg_time_str = f"{int(avg_time//60)}:{int(avg_time%60):02d}"
@@ -186,4 +403,58 @@ class LeetCodeClassify:
             ]
             print("|".join(row))
         
-        print("-" * (sum(col_widths) + 3*len(headers)))
\ No newline at end of file
+        print("-" * (sum(col_widths) + 3*len(headers)))
+
+    def _aggregate(self, category: str) -> _TagAggregate:
+        if category not in self._aggregates:
+            self._aggregates[category] = _TagAggregate()
+        return self._aggregates[category]
+
+    def _on_linked(self, problem_id: int, category: str) -> None:
+        """题目加入分类：把它的耗时/日期计入该分类的统计"""
+        self.relations.invalidate(problem_id, category)
+        self._invalidate_cache(problem_id, category)
+        if self._db is not None:
+            self._db.link(problem_id, category)
+            return
+        if self._store is None:
+            return
+        for item in self._store.items_for_ids([problem_id]):
+            self._aggregate(category).add(item.time_cost_in_seconds(), item.date_ordinal)
+
+    def _on_unlinked(self, problem_id: int, category: str) -> None:
+        """题目移出分类：从该分类的统计中扣除"""
+        self.relations.invalidate(problem_id, category)
+        self._invalidate_cache(problem_id, category)
+        if self._db is not None:
+            self._db.unlink(problem_id, category)
+            return
+        if self._store is None:
+            return
+        for item in self._store.items_for_ids([problem_id]):
+            self._aggregate(category).remove(item.time_cost_in_seconds(), item.date_ordinal)
+        if category in self._aggregates and not self._aggregates[category].count:
+            del self._aggregates[category]
+
+    def _on_item_changed(self, problem_id: int, before: tuple | None, after: tuple | None) -> None:
+        """题目的耗时/日期变化时，更新它所属分类的统计"""
+        categories = self.get_categories_of_problem(problem_id)
+        self.cache.invalidate(categories)
+        if self._db is not None:
+            return  # tag统计由数据库聚合
+        for category in categories:
+            aggregate = self._aggregate(category)
+            if before is not None:
+                aggregate.remove(*before)
+            if after is not None:
+                aggregate.add(*after)
+
+    def _invalidate_cache(self, problem_id: int, category: str) -> None:
+        """题目的分类变化：该分类和题目原有分类的缓存都失效（关联题的共同分类数变了）"""
+        self.cache.invalidate([category, *self.data["problem_to_categories"].get(str(problem_id), ())])
+
+
+def _scores_from_stats(stats: dict[str, tuple[int, int, int]]) -> dict[str, float]:
+    """由分组统计一次算出所有tag的得分"""
+    counts, totals, oldest = zip(*stats.values()) if stats else ((), (), ())
+    return dict(zip(stats, scoring.tag_scores(counts, totals, oldest)))
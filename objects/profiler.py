@@ -0,0 +1,332 @@
+"""
+性能剖析：给菜单操作和关键内部函数计时、计数、统计写入字节数
+
+默认关闭，关闭时不包装任何函数，没有额外开销。
+用 --profile（只计时和计数）、--profile-options 或环境变量 XIAOBAI_PROFILE 打开，选项用逗号分隔:
+    1 / on    只计时和计数
+    cprofile  每个菜单操作额外用 cProfile 采样，退出时每个操作写一个 .prof 文件
+    memory    每个菜单操作额外用 tracemalloc 记录峰值内存和分配最多的代码行
+例如: python xiaobai.py --profile-options cprofile,memory import f.jsonl
+     XIAOBAI_PROFILE=cprofile,memory python xiaobai.py
+
+退出时打印汇总表，并把指标写到 data/profile/metrics.json。
+菜单操作的耗时不含等待用户输入（input）的时间，等待时间单独记在 "input" 一行。
+"""
+import cProfile
+import builtins
+import contextlib
+import functools
+import json
+import os
+import sys
+import time
+import tracemalloc
+import types
+from pathlib import Path
+
+ENV_VAR = "XIAOBAI_PROFILE"
+OPTIONS = ("cprofile", "memory")
+
+_active: "Profiler | None" = None
+_NULL_CONTEXT = contextlib.nullcontext()
+
+
+class OpStats:
+    """单个操作的累计统计"""
+
+    __slots__ = ("calls", "seconds", "max_seconds", "bytes", "peak_bytes", "top_allocations")
+
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+        self.bytes = 0
+        self.peak_bytes = 0
+        self.top_allocations: list[str] = []
+
+    def record(self, elapsed: float, size: int = 0) -> None:
+        self.calls += 1
+        self.seconds += elapsed
+        if elapsed > self.max_seconds:
+            self.max_seconds = elapsed
+        self.bytes += size
+
+    def to_dict(self) -> dict:
+        data = {
+            "calls": self.calls,
+            "seconds": round(self.seconds, 6),
+            "max_seconds": round(self.max_seconds, 6),
+            "bytes": self.bytes,
+        }
+        if self.peak_bytes:
+            data["peak_bytes"] = self.peak_bytes
+            data["top_allocations"] = self.top_allocations
+        return data
+
+
+class Profiler:
+    def __init__(self, output_dir: str = "data/profile", cprofile: bool = False, memory: bool = False):
+        """
+        参数:
+            output_dir (str): 指标文件和 .prof 文件的输出目录
+            cprofile (bool): 菜单操作是否用 cProfile 采样
+            memory (bool): 菜单操作是否用 tracemalloc 记录内存
+        """
+        self.output_dir = Path(output_dir)
+        self.cprofile = cprofile
+        self.memory = memory
+        self.stats: dict[str, OpStats] = {}
+        self.counters: dict[str, dict] = {}  # 其他组件的计数（如结果缓存的命中率），原样输出
+        self._profiles: dict[str, cProfile.Profile] = {}
+        self._patches: list[tuple[object, str, object]] = []  # (所属对象, 属性名, 原始值)
+        self._operation_depth = 0
+        self._input_seconds = 0.0  # 累计等待用户输入的时间，操作耗时要扣掉
+        self._started = time.perf_counter()
+
+    def _stats(self, name: str) -> OpStats:
+        stats = self.stats.get(name)
+        if stats is None:
+            stats = self.stats[name] = OpStats()
+        return stats
+
+    def wrap(self, func, name: str, size_of=None):
+        """返回计时包装；size_of(args) 返回本次调用写入的字节数"""
+        stats = self._stats(name)
+        perf_counter = time.perf_counter
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            # 字节数在调用前算：AttemptHistory.save 之类调用完就清空了待写数据
+            size = size_of(args) if size_of else 0
+            start = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                stats.record(perf_counter() - start, size)
+
+        wrapper.__profiled__ = func
+        return wrapper
+
+    def wrap_context(self, func, name: str, size_of=None):
+        """返回上下文管理器函数（如 atomic_open）的包装：计时整个 with 块；size_of(args) 在块正常结束后调用"""
+        stats = self._stats(name)
+        perf_counter = time.perf_counter
+
+        @functools.wraps(func)
+        @contextlib.contextmanager
+        def wrapper(*args, **kwargs):
+            start = perf_counter()
+            size = 0
+            try:
+                with func(*args, **kwargs) as value:
+                    yield value
+                size = size_of(args) if size_of else 0
+            finally:
+                stats.record(perf_counter() - start, size)
+
+        wrapper.__profiled__ = func
+        return wrapper
+
+    def wrap_input(self, func):
+        """包装 input：等待时间记到 "input" 并累计，operation 据此从操作耗时里扣掉"""
+        stats = self._stats("input")
+        perf_counter = time.perf_counter
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = perf_counter() - start
+                self._input_seconds += elapsed
+                stats.record(elapsed)
+
+        wrapper.__profiled__ = func
+        return wrapper
+
+    def instrument(self, owner, attr: str, name: str | None = None, size_of=None, context: bool = False) -> None:
+        """
+        把 owner.attr 替换成计时包装，owner 可以是类或模块；context=True 表示它是上下文管理器函数。
+        模块函数还会在其他 objects.* 模块和 __main__ 里一起替换（它们可能 from ... import 了这个名字）。
+        """
+        original = owner.__dict__.get(attr)
+        if not isinstance(original, types.FunctionType) or hasattr(original, "__profiled__"):
+            return  # 不存在、已包装过或不是普通函数（staticmethod 等）都跳过
+        name = name or f"{getattr(owner, '__name__', owner)}.{attr}"
+        wrapped = (self.wrap_context if context else self.wrap)(original, name, size_of)
+        targets = [owner]
+        if isinstance(owner, types.ModuleType):
+            targets += [module for module_name, module in list(sys.modules.items())
+                        if module is not owner and module is not None
+                        and (module_name.startswith("objects.") or module_name in ("__main__", "xiaobai"))
+                        and module.__dict__.get(attr) is original]
+        for target in targets:
+            self._patches.append((target, attr, original))
+            setattr(target, attr, wrapped)
+
+    def restore(self) -> None:
+        """撤销所有替换"""
+        for target, attr, original in reversed(self._patches):
+            setattr(target, attr, original)
+        self._patches.clear()
+
+    @contextlib.contextmanager
+    def operation(self, name: str):
+        """计时一个顶层操作（菜单项/启动/退出），按需叠加 cProfile 和 tracemalloc"""
+        outermost = self._operation_depth == 0
+        self._operation_depth += 1
+        stats = self._stats(name)
+        profile = None
+        if outermost and self.cprofile:
+            profile = self._profiles.get(name)
+            if profile is None:
+                profile = self._profiles[name] = cProfile.Profile()
+            profile.enable()
+        if outermost and self.memory:
+            tracemalloc.start()
+        input_before = self._input_seconds
+        start = time.perf_counter()
+        try:
+            yield stats
+        finally:
+            stats.record(time.perf_counter() - start - (self._input_seconds - input_before))
+            if profile is not None:
+                profile.disable()
+            if outermost and self.memory:
+                snapshot = tracemalloc.take_snapshot()
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                if peak > stats.peak_bytes:
+                    stats.peak_bytes = peak
+                    stats.top_allocations = [str(stat) for stat in snapshot.statistics("lineno")[:5]]
+            self._operation_depth -= 1
+
+    def summary(self) -> str:
+        """按累计耗时从高到低的汇总表"""
+        rows = sorted(((name, stats) for name, stats in self.stats.items() if stats.calls),
+                      key=lambda pair: pair[1].seconds, reverse=True)
+        width = max((len(name) for name, _ in rows), default=10)
+        lines = [f"\n{'性能统计':^{width + 50}}",
+                 f"{'操作'.ljust(width - 2)}{'次数'.rjust(8)}{'总耗时(ms)'.rjust(13)}"
+                 f"{'最长(ms)'.rjust(11)}{'写入字节'.rjust(10)}",
+                 "-" * (width + 50)]
+        for name, stats in rows:
+            lines.append(f"{name:<{width}}{stats.calls:>10}{stats.seconds * 1000:>15.2f}"
+                         f"{stats.max_seconds * 1000:>13.2f}{stats.bytes:>12}")
+        lines.append("-" * (width + 50))
+        for name, counters in self.counters.items():
+            lines.append(f"{name}: " + "，".join(f"{key}={value}" for key, value in counters.items()))
+        lines.append(f"运行总时间 {time.perf_counter() - self._started:.2f}s")
+        return "\n".join(lines)
+
+    def write_metrics(self) -> Path:
+        """写出 metrics.json（以及每个操作的 .prof 文件），返回指标文件路径"""
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        metrics = {
+            "wall_seconds": round(time.perf_counter() - self._started, 6),
+            "operations": {name: stats.to_dict() for name, stats in self.stats.items() if stats.calls},
+            "counters": self.counters,
+        }
+        for name, profile in self._profiles.items():
+            prof_path = self.output_dir / f"{name}.prof"
+            profile.dump_stats(prof_path)
+            metrics["operations"][name]["cprofile"] = str(prof_path)
+        path = self.output_dir / "metrics.json"
+        path.write_text(json.dumps(metrics, ensure_ascii=False, indent=2), encoding="utf-8")
+        return path
+
+
+def parse_options(value: str | None) -> set[str] | None:
+    """解析 --profile-options / 环境变量的值，未开启时返回 None"""
+    if value is None or value.strip().lower() in ("", "0", "off", "false", "no"):
+        return None
+    options = {option.strip().lower() for option in value.split(",") if option.strip()}
+    unknown = options - set(OPTIONS) - {"1", "on", "true", "yes"}
+    if unknown:
+        raise ValueError(f"未知的 profile 选项: {', '.join(sorted(unknown))}（可选: {', '.join(OPTIONS)}）")
+    return options & set(OPTIONS)
+
+
+def enable(output_dir: str = "data/profile", options: set[str] = frozenset()) -> Profiler:
+    """打开剖析并给热点路径装上计时包装"""
+    global _active
+    if _active is None:
+        _active = Profiler(output_dir, cprofile="cprofile" in options, memory="memory" in options)
+        instrument_hot_paths(_active)
+    return _active
+
+
+def disable() -> None:
+    global _active
+    if _active is not None:
+        _active.restore()
+        _active = None
+
+
+def active() -> Profiler | None:
+    return _active
+
+
+def operation(name: str):
+    """未开启时返回空的上下文管理器"""
+    if _active is None:
+        return _NULL_CONTEXT
+    return _active.operation(name)
+
+
+def instrument_hot_paths(profiler: Profiler) -> None:
+    """需要计时的关键函数都列在这里"""
+    from objects import fileio, importer, recommender, scoring, snapshot_cache
+    from objects.attempt_history import AttemptHistory
+    from objects.item import Item
+    from objects.journal_store import JournalStore
+    from objects.leetcode_classify import LeetCodeClassify
+    from objects.relation_graph import RelationGraph
+    from objects.scheduler import Scheduler
+    from objects.sqlite_store import SqliteStore
+
+    profiler.instrument(Item, "time_cost_in_seconds", "Item.time_cost_in_seconds")
+    profiler.instrument(RelationGraph, "_build", "RelationGraph._build")
+    for attr in ("_load_data", "_save_data", "tag_stats", "calculate_tag_scores", "get_related_problems"):
+        profiler.instrument(LeetCodeClassify, attr, f"LeetCodeClassify.{attr}")
+    for attr in ("load", "compact", "_load_snapshot", "_write_snapshot"):
+        profiler.instrument(JournalStore, attr, f"JournalStore.{attr}")
+    # 日志写入的字节数按记录重新序列化一次估算（只在开启剖析时计算）
+    profiler.instrument(JournalStore, "append_many", "JournalStore.append_many", size_of=lambda args: sum(
+        len((json.dumps({"op": "put", "item": item.to_dict()}, ensure_ascii=False) + "\n").encode("utf-8"))
+        for item in args[1]))
+    for attr in ("load", "append_many", "add_many", "tag_stats", "today_items"):
+        profiler.instrument(SqliteStore, attr, f"SqliteStore.{attr}")
+    profiler.instrument(fileio, "atomic_write_bytes", "fileio.atomic_write_bytes", size_of=lambda args: len(args[1]))
+    # 流式导出：块结束时文件已经 rename 到位，按最终大小计
+    profiler.instrument(fileio, "atomic_open", "fileio.atomic_open", size_of=lambda args: os.path.getsize(args[0]),
+                        context=True)
+    profiler.instrument(snapshot_cache, "read_cache", "snapshot_cache.read_cache")
+    profiler.instrument(snapshot_cache, "write_cache", "snapshot_cache.write_cache")
+    for attr in ("tag_stats", "problem_scores", "tag_scores"):
+        profiler.instrument(scoring, attr, f"scoring.{attr}")
+    for attr in ("recommend", "top_k", "score_items", "plan_days"):
+        profiler.instrument(recommender, attr, f"recommender.{attr}")
+    profiler.instrument(importer, "import_file", "importer.import_file")
+    for attr in ("record", "due", "save"):
+        profiler.instrument(Scheduler, attr, f"Scheduler.{attr}")
+    profiler.instrument(AttemptHistory, "_load", "AttemptHistory._load")
+    profiler.instrument(AttemptHistory, "save", "AttemptHistory.save", size_of=lambda args: (
+        0 if args[0].read_only else len(args[0]._pending)))
+
+    # 交互输入的等待时间不算进菜单操作
+    if not hasattr(builtins.input, "__profiled__"):
+        profiler._patches.append((builtins, "input", builtins.input))
+        builtins.input = profiler.wrap_input(builtins.input)
+
+    # 主程序里的 JSON 读写函数（作为脚本运行时模块名是 __main__）
+    for module_name in ("__main__", "xiaobai"):
+        module = sys.modules.get(module_name)
+        if module is not None:
+            profiler.instrument(module, "load_items_from_json", "load_items_from_json")
+            profiler.instrument(module, "save_items_to_json", "save_items_to_json")
+
+
+def options_from_env() -> set[str] | None:
+    return parse_options(os.environ.get(ENV_VAR))
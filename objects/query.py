@@ -0,0 +1,253 @@
+"""
+题目查询：筛选、排序、分页，结果流式输出
+
+条件写成 key=value，命令行和菜单用同一套写法:
+    tag=贪心                 题目的tag
+    difficulty=2 / 2,3      难易度
+    since=2025-01-01        日期下限（含）
+    until=2025-06-30        日期上限（含）
+    min_times=2 max_times=5 刷题次数范围
+    min_time=5:00 max_time=30:00   耗时范围（耗时未知的题不算在内）
+    sort=-date,time         排序键 id/date/time/times/difficulty，前面加 - 表示从大到小
+    limit=20 offset=40      分页
+
+查询是一条惰性的生成器流水线：先挑合适的索引作为数据源（只按日期排序时直接沿日期索引走，不用再排序；
+否则限定了tag走tag索引，限定了日期走日期索引），逐条过滤，不需要排序时取够 offset+limit 条就停；
+需要排序且有 limit 时用堆只保留前 offset+limit 条。
+结果顺序：排序键相同（或没给 sort）的题按原列表顺序；走日期索引时（限定了日期、没限定tag）则按日期、同一天按原列表顺序。
+输出也是逐条写：表格攒够一批行才写一次终端，CSV/JSONL 边读边写，内存占用与结果条数无关。
+"""
+import csv
+import datetime
+import heapq
+import json
+import sys
+import unicodedata
+from itertools import islice
+from typing import Callable, Iterable, Iterator, TextIO
+from objects.fileio import atomic_open
+from objects.item import Item, parse_date_ordinal, parse_time_cost
+from objects.item_store import ItemStore
+
+SORT_KEYS: dict[str, Callable[[Item], int]] = {
+    "id": lambda item: item.leetcode_id,
+    "date": lambda item: item.date_ordinal,
+    "time": Item.time_cost_in_seconds,
+    "times": lambda item: item.times,
+    "difficulty": lambda item: item.difficulty_level,
+}
+FORMATS = ("table", "csv", "jsonl")
+FIELDS = ("leetcode_id", "date", "difficulty", "time_cost", "times", "tag", "leetcode_url")
+_INT_KEYS = ("min_times", "max_times", "limit", "offset")
+
+
+class Query:
+    def __init__(self, tag: str | None = None, difficulties: Iterable[int] | None = None,
+                 since: datetime.date | None = None, until: datetime.date | None = None,
+                 min_times: int | None = None, max_times: int | None = None,
+                 min_seconds: int | None = None, max_seconds: int | None = None,
+                 sort: Iterable[tuple[str, bool]] = (), limit: int | None = None, offset: int = 0):
+        """
+        参数:
+            difficulties: 允许的难易度（整数），None 表示不限
+            sort: [(排序键, 是否从大到小)]，按顺序比较
+            limit (int): 最多返回几条，None 表示全部
+            offset (int): 跳过前几条
+        """
+        self.tag = tag
+        self.difficulties = frozenset(difficulties) if difficulties is not None else None
+        self.since = since
+        self.until = until
+        self.min_times = min_times
+        self.max_times = max_times
+        self.min_seconds = min_seconds
+        self.max_seconds = max_seconds
+        self.sort = list(sort)
+        self.limit = limit
+        self.offset = offset
+        for key, _ in self.sort:
+            if key not in SORT_KEYS:
+                raise ValueError(f"未知的排序键: {key}（可选: {', '.join(SORT_KEYS)}）")
+
+    def run(self, store: ItemStore, offset: int | None = None, limit: int | None = None) -> Iterator[Item]:
+        """
+        惰性地产出结果；offset/limit 不给时用查询自己的（菜单翻页时传入当前页）。
+        迭代期间不要修改题目集合
+        """
+        offset = self.offset if offset is None else offset
+        limit = self.limit if limit is None else limit
+        items, ordered = self._source(store)
+        items = self._filter(items)
+        if self.sort and not ordered:
+            if limit is not None:
+                items = iter(heapq.nsmallest(offset + limit, items, key=self._sort_key))
+            else:
+                items = iter(sorted(items, key=self._sort_key))
+        return islice(items, offset, None if limit is None else offset + limit)
+
+    def _source(self, store: ItemStore) -> tuple[Iterable[Item], bool]:
+        """选数据源，返回 (题目, 是否已经是要求的顺序)"""
+        if len(self.sort) == 1 and self.sort[0][0] == "date":
+            return store.iter_between(self.since, self.until, reverse=self.sort[0][1]), True
+        if self.tag is not None:
+            return store.by_tag(self.tag), False
+        if self.since is not None or self.until is not None:
+            return store.iter_between(self.since, self.until), False
+        return iter(store), False
+
+    def _filter(self, items: Iterable[Item]) -> Iterator[Item]:
+        """每个条件包一层生成器，没给的条件不参与"""
+        if self.tag is not None:
+            items = (item for item in items if item.tag == self.tag)
+        if self.difficulties is not None:
+            items = (item for item in items if item.difficulty_level in self.difficulties)
+        if self.since is not None:
+            since_ord = self.since.toordinal()
+            items = (item for item in items if item.date_ordinal >= since_ord)
+        if self.until is not None:
+            until_ord = self.until.toordinal()
+            items = (item for item in items if item.date_ordinal <= until_ord)
+        if self.min_times is not None:
+            items = (item for item in items if item.times >= self.min_times)
+        if self.max_times is not None:
+            items = (item for item in items if item.times <= self.max_times)
+        if self.min_seconds is not None or self.max_seconds is not None:
+            low = max(self.min_seconds or 0, 1)  # 耗时未知（0秒）的题不算
+            high = self.max_seconds
+            items = (item for item in items
+                     if item.time_cost_in_seconds() >= low and (high is None or item.time_cost_in_seconds() <= high))
+        return iter(items)
+
+    def _sort_key(self, item: Item) -> tuple:
+        return tuple(-SORT_KEYS[key](item) if descending else SORT_KEYS[key](item) for key, descending in self.sort)
+
+
+def parse_query(tokens: Iterable[str]) -> Query:
+    """把 key=value 形式的条件解析成 Query，格式不对时抛出 ValueError"""
+    kwargs = {}
+    for token in tokens:
+        key, sep, value = token.partition("=")
+        key, value = key.strip().lower(), value.strip()
+        if not sep or not value:
+            raise ValueError(f"条件要写成 key=value: {token!r}")
+        try:
+            if key == "tag":
+                kwargs["tag"] = value
+            elif key == "difficulty":
+                kwargs["difficulties"] = [int(part) for part in value.split(",")]
+            elif key in ("since", "until"):
+                kwargs[key] = datetime.date.fromordinal(parse_date_ordinal(value))
+            elif key in _INT_KEYS:
+                kwargs[key] = int(value)
+            elif key in ("min_time", "max_time"):
+                seconds = parse_time_cost(value)
+                if seconds <= 0:
+                    raise ValueError
+                kwargs[key.replace("time", "seconds")] = seconds
+            elif key == "sort":
+                kwargs["sort"] = [(part.lstrip("-"), part.startswith("-")) for part in value.split(",")]
+            else:
+                raise KeyError(key)
+        except KeyError:
+            raise ValueError(f"未知的条件: {key}") from None
+        except ValueError:
+            raise ValueError(f"条件的值不对: {token!r}") from None
+    if kwargs.get("limit", 0) < 0 or kwargs.get("offset", 0) < 0:
+        raise ValueError("limit/offset 不能为负数")
+    return Query(**kwargs)
+
+
+class TableWriter:
+    """
+    题目表格：表头只打印一次，行先攒在缓冲区里，满 buffer_rows 行才写一次输出流
+
+    用法:
+        with TableWriter(sys.stdout) as table:
+            for item in items:
+                table.write(item)
+    """
+
+    COLUMNS = (("题号", 8), ("日期", 12), ("难度", 6), ("耗时", 8), ("次数", 6), ("类型", 14), ("链接", 0))
+
+    def __init__(self, stream: TextIO | None = None, buffer_rows: int = 200):
+        self.stream = stream or sys.stdout
+        self.buffer_rows = buffer_rows
+        self.count = 0
+        self._buffer: list[str] = [self._line(name for name, _ in self.COLUMNS)]
+
+    def write(self, item: Item) -> None:
+        # 旧数据里难易度/耗时可能是JSON数字，原样保存在 Item 上，显示前统一转成字符串
+        self._buffer.append(self._line((str(item.leetcode_id), item.date.isoformat(), str(item.difficulty),
+                                        str(item.time_cost), str(item.times), str(item.tag), str(item.leetcode_url))))
+        self.count += 1
+        if len(self._buffer) >= self.buffer_rows:
+            self.flush()
+
+    def write_all(self, items: Iterable[Item]) -> int:
+        for item in items:
+            self.write(item)
+        return self.count
+
+    def flush(self) -> None:
+        if self._buffer:
+            self.stream.write("".join(self._buffer))
+            self._buffer.clear()
+
+    def __enter__(self) -> "TableWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.flush()
+
+    def _line(self, cells: Iterable[str]) -> str:
+        return " ".join(_pad(cell, width) for cell, (_, width) in zip(cells, self.COLUMNS)).rstrip() + "\n"
+
+
+def write_items(items: Iterable[Item], fmt: str = "table", output: str | None = None) -> int:
+    """
+    把结果写到 output 文件（原子替换）或标准输出，返回写出的条数
+
+    参数:
+        fmt (str): table / csv / jsonl
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"未知的输出格式: {fmt}（可选: {', '.join(FORMATS)}）")
+    if output is None:
+        return _write_stream(items, fmt, sys.stdout)
+    with atomic_open(output, newline="" if fmt == "csv" else None) as f:
+        return _write_stream(items, fmt, f)
+
+
+def _write_stream(items: Iterable[Item], fmt: str, stream: TextIO) -> int:
+    if fmt == "table":
+        with TableWriter(stream) as table:
+            return table.write_all(items)
+    count = 0
+    if fmt == "csv":
+        writer = csv.writer(stream)
+        writer.writerow(FIELDS)
+        for item in items:
+            writer.writerow((item.leetcode_id, item.date.isoformat(), item.difficulty, item.time_cost,
+                             item.times, item.tag, item.leetcode_url))
+            count += 1
+        return count
+    for item in items:
+        stream.write(json.dumps(item.to_dict(), ensure_ascii=False) + "\n")
+        count += 1
+    return count
+
+
+def _display_width(text: str) -> int:
+    """终端显示宽度：中文等全角字符占两格"""
+    return sum(2 if unicodedata.east_asian_width(char) in "WF" else 1 for char in text)
+
+
+def _pad(text: str, width: int) -> str:
+    """按显示宽度补齐到 width（0 表示不补齐），太长时截断"""
+    if not width:
+        return text
+    if _display_width(text) > width:
+        while _display_width(text) > width - 1:
+            text = text[:-1]
+        text += "…"
+    return text + " " * (width - _display_width(text))
@@ -0,0 +1,142 @@
+"""
+推荐引擎
+
+只需要前几名时用堆做 top-k 选择（O(N log k)），不再整表排序；
+多天计划一次性生成：每个tag维护一个按得分排列的堆，按tag得分轮转，每天从堆里弹出当天的题；
+名额有剩余时，按关联图里的权重顺带安排关联题（共同分类多的优先）。
+每个tag里题目的得分经过分类器的结果缓存，只有该tag的题变了（或换了一天）才重算。
+给出刷题历史（history）时，题目和tag的耗时都用历史耗时的加权平均，而不只是最近一次。
+"""
+import datetime
+import heapq
+import random
+from collections import deque
+from typing import Iterable
+from objects import scoring
+from objects.attempt_history import AttemptHistory
+from objects.item import Item
+from objects.item_store import ItemStore
+from objects.leetcode_classify import LeetCodeClassify
+
+
+def top_k(items: list[Item], scores: list[float], k: int) -> list[tuple[float, Item]]:
+    """得分最高的k道题，同分时保持原顺序（与 sorted(..., reverse=True)[:k] 结果一致）"""
+    return heapq.nlargest(k, zip(scores, items), key=lambda pair: pair[0])
+
+
+def recommend(items: ItemStore, classifier: LeetCodeClassify, k: int = 3, rng: random.Random | None = None,
+              history: AttemptHistory | None = None) -> tuple[str | None, float | None, list[tuple[float, Item]]]:
+    """
+    选出得分最高的tag（并列时随机选一个）和其中得分最高的k道题
+
+    返回: (tag, tag得分, [(题目得分, 题目)])；没有分类信息时 tag 为 None，题目为随机抽取的k道（得分为None）
+    """
+    rng = rng or random
+    tag_scores = classifier.calculate_tag_scores(items, history)
+    if not tag_scores:
+        return None, None, [(None, item) for item in rng.sample(list(items), min(k, len(items)))]
+    max_score = max(tag_scores.values())
+    selected_tag = rng.choice([tag for tag, score in tag_scores.items() if score == max_score])
+    tag_items, scores = tag_problem_scores(items, classifier, selected_tag, history)
+    return selected_tag, tag_scores[selected_tag], top_k(tag_items, scores, k)
+
+
+def score_items(items: Iterable[Item], today: datetime.date | None = None,
+                history: AttemptHistory | None = None) -> list[float]:
+    items = list(items)
+    if history is not None:
+        seconds = [history.effective_seconds(item) for item in items]
+    else:
+        seconds = [item.time_cost_in_seconds() for item in items]
+    return scoring.problem_scores(seconds, [item.date_ordinal for item in items], today)
+
+
+def tag_problem_scores(items: ItemStore, classifier: LeetCodeClassify, tag: str,
+                       history: AttemptHistory | None = None) -> tuple[list[Item], list[float]]:
+    """某个tag里的题目和它们的得分（按tag缓存，返回的列表不要修改）"""
+    def compute():
+        tag_items = items.items_for_ids(classifier.data["category_to_problems"].get(tag, ()))
+        return tag_items, score_items(tag_items, history=history)
+    return classifier.cached(items, ("tag_problem_scores", tag, history is not None), compute, tags=(tag,))
+
+
+class DayPlan:
+    """某一天的计划：主推tag + 题号列表（含顺带安排的关联题）"""
+
+    def __init__(self, date: datetime.date, tag: str):
+        self.date = date
+        self.tag = tag
+        self.problems: list[tuple[int, float]] = []  # (题号, 得分)
+        self.related: list[int] = []  # 因关联性顺带安排的题号
+
+    def __len__(self) -> int:
+        return len(self.problems) + len(self.related)
+
+    def __repr__(self):
+        main = "、".join(f"{pid}({score})" for pid, score in self.problems)
+        extra = f"  关联题: {'、'.join(map(str, self.related))}" if self.related else ""
+        return f"{self.date}  [{self.tag}]  {main}{extra}"
+
+
+def plan_days(items: ItemStore, classifier: LeetCodeClassify, days: int, daily_quota: int = 3,
+              start: datetime.date | None = None, history: AttemptHistory | None = None) -> list[DayPlan]:
+    """
+    生成未来 days 天的刷题计划
+
+    参数:
+        days (int): 计划天数
+        daily_quota (int): 每天最多安排的题数（含关联题）
+        start (date): 计划开始日期，默认今天
+        history (AttemptHistory): 刷题历史，给出时耗时用历史的加权平均
+    """
+    start = start or datetime.date.today()
+    tag_scores = classifier.calculate_tag_scores(items, history)
+
+    # 每个tag一个最大堆: (-得分, 原顺序, 题号)
+    heaps: dict[str, list] = {}
+    for tag in tag_scores:
+        tag_items, scores = tag_problem_scores(items, classifier, tag, history)
+        heap = [(-score, order, item.leetcode_id) for order, (score, item) in enumerate(zip(scores, tag_items))]
+        heapq.heapify(heap)
+        heaps[tag] = heap
+
+    # tag按得分从高到低轮转
+    rotation = deque(sorted(tag_scores, key=lambda tag: tag_scores[tag], reverse=True))
+    scheduled: set[int] = set()
+    plans = []
+    for offset in range(days):
+        plan = None
+        while rotation and plan is None:
+            tag = rotation.popleft()
+            plan = DayPlan(start + datetime.timedelta(days=offset), tag)
+            heap = heaps[tag]
+            while heap and len(plan.problems) < daily_quota:
+                neg_score, _, leetcode_id = heapq.heappop(heap)
+                if leetcode_id not in scheduled:
+                    scheduled.add(leetcode_id)
+                    plan.problems.append((leetcode_id, -neg_score))
+            if heap:
+                rotation.append(tag)  # 还有题，排到队尾等下一轮
+            if not plan.problems:
+                plan = None
+        if plan is None:
+            break  # 所有tag都排完了
+        _fill_related(plan, items, classifier, scheduled, daily_quota)
+        plans.append(plan)
+    return plans
+
+
+def _fill_related(plan: DayPlan, items: ItemStore, classifier: LeetCodeClassify,
+                  scheduled: set[int], daily_quota: int) -> None:
+    """当天名额没用完时，把已选题目的关联题一起安排上（只和主推tag相关的题留给主推tag自己排）"""
+    main_tag_problems = classifier.data["category_to_problems"].get(plan.tag, ())
+    for leetcode_id, _ in list(plan.problems):
+        neighborhood = classifier.relations.neighbors(leetcode_id)
+        for related_id, shared in zip(neighborhood.ids, neighborhood.shared):
+            if len(plan) >= daily_quota:
+                return
+            if shared == 1 and related_id in main_tag_problems:
+                continue
+            if related_id not in scheduled and items.get(related_id) is not None:
+                scheduled.add(related_id)
+                plan.related.append(related_id)
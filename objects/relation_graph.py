@@ -0,0 +1,174 @@
+"""
+题目关联图
+
+两道题的关联权重 = 共同分类数 + difficulty_weight × 难度接近程度(0~1)。
+difficulty_weight 小于1时，难度只在共同分类数相同的题之间调整先后，多个分类重合的题总排在前面。
+
+不预先展开整张图（大分类内部的边数是平方级的），而是按需计算单道题的邻域：
+邻居题号、共同分类数、权重存成紧凑的 array，按权重从高到低排好后放进LRU缓存，
+之后取前k个关联题只需要顺序读 O(k)。
+分类变化时只淘汰受影响的邻域：该题自己 + 同一分类里已缓存的题；题目难度变化时同理。
+"""
+from array import array
+from collections import Counter, OrderedDict
+from typing import Iterator
+from objects.item_store import ItemStore
+
+
+class Neighborhood:
+    """一道题的邻域，按权重从高到低（同权重按题号）排列"""
+
+    __slots__ = ("ids", "shared", "weights")
+
+    def __init__(self, ids: array, shared: array, weights: array):
+        self.ids = ids  # 邻居题号
+        self.shared = shared  # 共同分类数
+        self.weights = weights  # 关联权重
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.ids)
+
+
+class RelationGraph:
+    def __init__(self, data: dict, store: ItemStore | None = None,
+                 difficulty_weight: float = 0.5, cache_size: int = 1024):
+        """
+        参数:
+            data (dict): 分类的双向映射（LeetCodeClassify.data）
+            store (ItemStore): 题目集合，用来读取难度；不提供时不考虑难度
+            difficulty_weight (float): 难度接近程度的权重，0 表示不考虑难度
+            cache_size (int): 最多缓存多少道题的邻域
+        """
+        self.data = data
+        self.difficulty_weight = difficulty_weight
+        self.cache_size = cache_size
+        self.hits = 0
+        self.misses = 0
+        self._cache: OrderedDict[int, Neighborhood] = OrderedDict()
+        self._levels: dict[int, int] = {}  # 计算邻域时读到的难度，用来判断难度是否变了
+        self._store: ItemStore | None = None
+        if store is not None:
+            self.attach_store(store)
+
+    def attach_store(self, store: ItemStore) -> None:
+        self._store = store
+        self._cache.clear()
+        self._levels.clear()
+        if self.difficulty_weight:
+            store.add_listener(self._on_item_changed)
+
+    def reset(self, data: dict) -> None:
+        """分类数据整体替换（如 batch 回滚）后调用"""
+        self.data = data
+        self._cache.clear()
+        self._levels.clear()
+
+    def neighbors(self, problem_id: int) -> Neighborhood:
+        """题目的邻域（不含自己），命中缓存时 O(1)"""
+        neighborhood = self._cache.get(problem_id)
+        if neighborhood is not None:
+            self._cache.move_to_end(problem_id)
+            self.hits += 1
+            return neighborhood
+        self.misses += 1
+        neighborhood = self._build(problem_id)
+        self._cache[problem_id] = neighborhood
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return neighborhood
+
+    def related(self, problem_id: int, category: str | None = None, limit: int | None = None,
+                exclude_self: bool = True) -> list[int]:
+        """
+        按关联权重从高到低返回关联题
+
+        参数:
+            category (str): 只返回该分类里的题，None 表示所有分类
+            limit (int): 最多返回几道，None 表示全部
+            exclude_self (bool): 是否排除题目自己
+        """
+        members = None
+        if category is not None:
+            members = self.data["category_to_problems"].get(category, ())
+            if problem_id not in members:
+                # 题目不在该分类里，和分类里的题没有共同分类可比，按题号返回
+                related = sorted(members)
+                return related[:limit] if limit is not None else related
+
+        result = [] if exclude_self else [problem_id]
+        if limit is not None and len(result) >= limit:
+            return result[:limit]
+        for related_id in self.neighbors(problem_id).ids:
+            if members is not None and related_id not in members:
+                continue
+            result.append(related_id)
+            if limit is not None and len(result) >= limit:
+                break
+        return result
+
+    def invalidate(self, problem_id: int, category: str) -> None:
+        """题目加入/移出某个分类后调用：淘汰它自己和同分类题目的邻域"""
+        self._cache.pop(problem_id, None)
+        self._evict_members(self.data["category_to_problems"].get(category, ()))
+
+    def invalidate_problem(self, problem_id: int) -> None:
+        """题目本身的属性（难度）变化后调用：淘汰它自己和所有同分类题目的邻域"""
+        self._cache.pop(problem_id, None)
+        category_to_problems = self.data["category_to_problems"]
+        for category in self.data["problem_to_categories"].get(str(problem_id), ()):
+            self._evict_members(category_to_problems.get(category, ()))
+
+    def _evict_members(self, members) -> None:
+        """从缓存和分类成员里较小的一方遍历"""
+        if not self._cache:
+            return
+        if len(self._cache) < len(members):
+            for cached_id in [cached_id for cached_id in self._cache if cached_id in members]:
+                del self._cache[cached_id]
+        else:
+            for member in members:
+                self._cache.pop(member, None)
+
+    def _build(self, problem_id: int) -> Neighborhood:
+        category_to_problems = self.data["category_to_problems"]
+        shared = Counter()
+        for category in self.data["problem_to_categories"].get(str(problem_id), ()):
+            shared.update(category_to_problems.get(category, ()))
+        shared.pop(problem_id, None)
+
+        if self.difficulty_weight and self._store is not None:
+            level = self._level(problem_id)
+            ranked = sorted(((count + self._affinity(level, self._level(related_id)), count, related_id)
+                             for related_id, count in shared.items()),
+                            key=lambda entry: (-entry[0], entry[2]))
+        else:
+            ranked = sorted(((float(count), count, related_id) for related_id, count in shared.items()),
+                            key=lambda entry: (-entry[0], entry[2]))
+        return Neighborhood(array("q", [entry[2] for entry in ranked]),
+                            array("l", [entry[1] for entry in ranked]),
+                            array("d", [entry[0] for entry in ranked]))
+
+    def _level(self, problem_id: int) -> int:
+        item = self._store.get(problem_id)
+        level = item.difficulty_level if item is not None else 0
+        self._levels[problem_id] = level
+        return level
+
+    def _affinity(self, level: int, other: int) -> float:
+        """难度接近程度：相同为1，差两级为0，未知难度为0"""
+        if not level or not other:
+            return 0.0
+        return self.difficulty_weight * max(0.0, 1 - abs(level - other) / 2)
+
+    def _on_item_changed(self, problem_id: int, before: tuple | None, after: tuple | None) -> None:
+        """难度被用到过且变了，才需要淘汰"""
+        if problem_id not in self._levels:
+            return
+        item = self._store.get(problem_id)
+        level = item.difficulty_level if item is not None else 0
+        if level != self._levels[problem_id]:
+            del self._levels[problem_id]
+            self.invalidate_problem(problem_id)
@@ -0,0 +1,88 @@
+"""
+分数/推荐结果的缓存
+
+分类分数、每道题的得分、关联题列表只依赖题目数据、分类数据和今天的日期，连续查看推荐和分数表时不用重算。
+
+版本号:
+    version       数据集版本号，任何修改（题目增改、题目加入/移出分类）都加一
+    tag 版本号     每个tag一个，只有该tag里的题或该tag的成员变化时才加一
+缓存条目记下计算时依赖的版本：依赖全部数据的条目比较 version；只依赖某几个tag的条目只比较这几个tag的版本，
+所以只改了一个tag的题时，其他tag的缓存仍然有效。
+得分随日期变化，日期一变（过了零点）就清空全部缓存。
+最多保留 maxsize 条，按最近使用淘汰（LRU）。
+"""
+import datetime
+from collections import OrderedDict
+from typing import Callable, Hashable, Iterable
+
+
+class ResultCache:
+    def __init__(self, maxsize: int = 1024):
+        """
+        参数:
+            maxsize (int): 最多缓存多少条结果
+        """
+        self.maxsize = maxsize
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+        self._tag_versions: dict[str, int] = {}
+        self._entries: OrderedDict[Hashable, tuple[tuple, object]] = OrderedDict()  # key -> (依赖的版本, 结果)
+        self._today_ord: int | None = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, compute: Callable[[], object], tags: Iterable[str] | None = None):
+        """
+        取 key 的结果；没有缓存或依赖的版本已经变了时调用 compute() 重新计算并缓存。
+        返回的对象是共享的，调用方不要修改。
+
+        参数:
+            tags: 结果只依赖这些tag里的题时传入（按tag失效），None 表示依赖全部数据
+        """
+        today_ord = datetime.date.today().toordinal()
+        if today_ord != self._today_ord:
+            self._entries.clear()
+            self._today_ord = today_ord
+        stamp = self._stamp(tags)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == stamp:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        value = compute()
+        self._entries[key] = (stamp, value)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return value
+
+    def invalidate(self, tags: Iterable[str] = ()) -> None:
+        """数据修改后调用：数据集版本号加一，这些tag的版本号也加一"""
+        self.version += 1
+        for tag in tags:
+            self._tag_versions[tag] = self._tag_versions.get(tag, 0) + 1
+
+    def clear(self) -> None:
+        """数据整体替换（如 batch 回滚、重新绑定题目集合）后调用"""
+        self.version += 1
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        """命中统计"""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "version": self.version,
+        }
+
+    def _stamp(self, tags: Iterable[str] | None) -> tuple:
+        if tags is None:
+            return (self.version,)
+        return tuple((tag, self._tag_versions.get(tag, 0)) for tag in sorted(set(tags)))
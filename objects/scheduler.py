@@ -0,0 +1,187 @@
+"""
+间隔重复复习计划（类似 SM-2）
+
+README 的目标是每道题 3 分钟内想出思路、10 分钟内写完。每次刷题按耗时给出一个 0-5 的掌握程度:
+    3分钟内 5，10分钟内 4，15分钟内 3，20分钟内 2，30分钟内 1，更久 0（耗时未知按 3 算）
+然后按 SM-2 规则更新 难度系数 和 复习间隔：掌握程度低于3时连续记忆次数清零、间隔回到1天，
+否则间隔依次为 1 天、6 天、上次间隔 × 难度系数（最长 MAX_INTERVAL 天）。下次复习日期 = 这次刷题日期 + 间隔。
+
+到期队列是以 (到期日期序数, 题号) 为键的最小堆，重新安排一道题只压入一个新条目 O(log n)，
+旧条目留在堆里，查询时跳过（延迟删除），过期条目太多时重建堆。
+查询"某天之前到期的题"时沿堆往下找、遇到比该日期晚的节点就剪枝，只访问命中的条目，不用扫描全部题目。
+复习状态保存在 data/schedule.json，启动时按题目的刷题次数补上漏记的复习。
+"""
+import datetime
+import heapq
+import json
+from pathlib import Path
+from objects.fileio import atomic_write_json
+from objects.item import Item
+from objects.item_store import ItemStore
+
+THINK_SECONDS = 3 * 60  # 3分钟内想出思路
+CODE_SECONDS = 10 * 60  # 10分钟内写完
+INITIAL_EASE = 2.5
+MIN_EASE = 1.3
+MAX_INTERVAL = 180  # 再熟的题半年内也要复习一次
+_QUALITY_LIMITS = ((THINK_SECONDS, 5), (CODE_SECONDS, 4), (15 * 60, 3), (20 * 60, 2), (30 * 60, 1))
+
+
+def review_quality(seconds: int) -> int:
+    """按耗时给出掌握程度（0-5）"""
+    if seconds <= 0:
+        return 3  # 耗时未知
+    for limit, quality in _QUALITY_LIMITS:
+        if seconds <= limit:
+            return quality
+    return 0
+
+
+class ReviewState:
+    """一道题的复习状态"""
+
+    __slots__ = ("due_ord", "interval", "ease", "streak", "times")
+
+    def __init__(self, due_ord: int, interval: int, ease: float = INITIAL_EASE, streak: int = 0, times: int = 0):
+        self.due_ord = due_ord  # 下次复习日期序数
+        self.interval = interval  # 复习间隔（天）
+        self.ease = ease  # 难度系数
+        self.streak = streak  # 连续记住的次数
+        self.times = times  # 已计入的刷题次数
+
+    @property
+    def due(self) -> datetime.date:
+        return datetime.date.fromordinal(self.due_ord)
+
+    def review(self, quality: int, date_ord: int) -> None:
+        """按一次刷题结果更新（SM-2）"""
+        self.ease = max(MIN_EASE, self.ease + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+        if quality < 3:
+            self.streak = 0
+            self.interval = 1
+        else:
+            self.streak += 1
+            if self.streak == 1:
+                self.interval = 1
+            elif self.streak == 2:
+                self.interval = 6
+            else:
+                self.interval = min(MAX_INTERVAL, max(1, round(self.interval * self.ease)))
+        self.times += 1
+        self.due_ord = date_ord + self.interval
+
+    def to_list(self) -> list:
+        return [self.due_ord, self.interval, round(self.ease, 4), self.streak, self.times]
+
+    @classmethod
+    def from_list(cls, data: list) -> "ReviewState":
+        return cls(*data)
+
+    def __repr__(self):
+        return f"下次复习 {self.due}（间隔{self.interval}天，系数{self.ease:.2f}）"
+
+
+class Scheduler:
+    def __init__(self, data_path: str, store: ItemStore):
+        """
+        参数:
+            data_path (str): 复习状态文件
+            store (ItemStore): 题目集合，订阅它的修改，每次更新题目视为一次复习
+        """
+        self.data_path = Path(data_path)
+        self._store = store
+        self._states: dict[int, ReviewState] = {}
+        self._heap: list[tuple[int, int]] = []  # (到期日期序数, 题号)，含已失效的旧条目
+        self._dirty = False
+        self._load()
+        store.add_listener(self._on_item_changed)
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def state(self, leetcode_id: int) -> ReviewState | None:
+        return self._states.get(leetcode_id)
+
+    def record(self, item: Item) -> ReviewState:
+        """
+        把题目最近一次刷题计入复习状态并重新入队 O(log n)。
+        第一次见到的题按它已刷的次数补算；题目的刷题次数没有增加时（只改了tag等）不算新的复习
+        """
+        state = self._states.get(item.leetcode_id)
+        if state is None:
+            state = self._states[item.leetcode_id] = ReviewState(item.date_ordinal, 0)
+        times = max(item.times, 1)
+        if state.times >= times:
+            return state
+        quality = review_quality(item.time_cost_in_seconds())
+        for _ in range(times - state.times):
+            state.review(quality, item.date_ordinal)
+        heapq.heappush(self._heap, (state.due_ord, item.leetcode_id))
+        self._dirty = True
+        if len(self._heap) > 2 * len(self._states) + 64:
+            self._rebuild_heap()
+        return state
+
+    def due(self, until: datetime.date | None = None, limit: int | None = None) -> list[tuple[datetime.date, int]]:
+        """
+        到 until（默认今天，含当天）为止到期的题，按 (到期日期, 题号) 排序，最多 limit 道
+
+        把堆数组看成一棵树做最佳优先遍历：候选集合里只放已访问节点的子节点，
+        每次取出最小的一个，所以结果天然有序，取前k道只访问 O(k) 个节点；比 until 晚的子树直接剪掉。
+        """
+        until_ord = (until or datetime.date.today()).toordinal()
+        heap = self._heap
+        found = []
+        seen = set()
+        frontier = [(heap[0], 0)] if heap and heap[0][0] <= until_ord else []
+        while frontier and (limit is None or len(found) < limit):
+            (due_ord, leetcode_id), index = heapq.heappop(frontier)
+            state = self._states.get(leetcode_id)
+            if state is not None and state.due_ord == due_ord and leetcode_id not in seen:
+                seen.add(leetcode_id)
+                found.append((datetime.date.fromordinal(due_ord), leetcode_id))
+            for child in (2 * index + 1, 2 * index + 2):
+                if child < len(heap) and heap[child][0] <= until_ord:
+                    heapq.heappush(frontier, (heap[child], child))
+        return found
+
+    def due_today(self, today: datetime.date | None = None) -> list[tuple[datetime.date, int]]:
+        return self.due(today)
+
+    def due_this_week(self, today: datetime.date | None = None) -> list[tuple[datetime.date, int]]:
+        """今天起7天内到期的题（含已经过期的）"""
+        return self.due((today or datetime.date.today()) + datetime.timedelta(days=6))
+
+    def save(self) -> None:
+        """有变化时原子写入状态文件"""
+        if not self._dirty:
+            return
+        atomic_write_json(self.data_path, {
+            "version": 1,
+            "states": {str(leetcode_id): state.to_list() for leetcode_id, state in self._states.items()},
+        })
+        self._dirty = False
+
+    def _load(self) -> None:
+        if self.data_path.exists():
+            with open(self.data_path, "r", encoding="utf-8") as f:
+                raw = json.load(f)
+            self._states = {int(leetcode_id): ReviewState.from_list(state)
+                            for leetcode_id, state in raw.get("states", {}).items()}
+        self._rebuild_heap()
+        # 新题或上次退出前没保存的复习，按题目当前的数据补上
+        for item in self._store:
+            state = self._states.get(item.leetcode_id)
+            if state is None or state.times < item.times:
+                self.record(item)
+
+    def _rebuild_heap(self) -> None:
+        self._heap = [(state.due_ord, leetcode_id) for leetcode_id, state in self._states.items()]
+        heapq.heapify(self._heap)
+
+    def _on_item_changed(self, leetcode_id: int, before: tuple | None, after: tuple | None) -> None:
+        if after is None:
+            return
+        item = self._store.get(leetcode_id)
+        if item is not None:
+            self.record(item)
@@ -0,0 +1,134 @@
+"""
+题目/分类打分
+
+打分公式只在这里实现一份；有 NumPy 时对整列数据一次性向量化计算，
+没有 NumPy 时退化成纯 Python 循环，两种实现的结果完全一致
+（最后统一用 Python 的 round 取两位小数，避免 np.round 的舍入差异）。
+"""
+import datetime
+from typing import Sequence
+from objects.item_columns import ItemColumns
+
+try:
+    import numpy as np
+except ImportError:  # NumPy 是可选依赖
+    np = None
+
+HAVE_NUMPY = np is not None
+
+
+def _today_ordinal(today: datetime.date | None) -> int:
+    return (today or datetime.date.today()).toordinal()
+
+
+def problem_score(seconds: int, date_ord: int, today_ord: int) -> float:
+    """单个题目的推荐得分（0-10）"""
+    time_score = min(seconds / 1800 * 5, 5)  # 耗时占5分
+    days_old = today_ord - date_ord
+    date_score = min(days_old / 30 * 5, 5)  # 旧时间占5分
+    return round(time_score + date_score, 2)
+
+
+def tag_score(count: int, total_seconds: int, oldest_ord: int, today_ord: int) -> float:
+    """单个tag的得分（0-10）：平均耗时和最旧日期各占一半"""
+    avg_time = total_seconds / count
+    days_old = today_ord - oldest_ord
+    time_score = min(avg_time / 1800 * 10, 10)  # 假设30分钟为满分
+    date_score = min(days_old / 30 * 10, 10)    # 假设30天未刷为满分
+    return round((time_score + date_score) / 2, 2)
+
+
+def problem_scores(seconds: Sequence[int], date_ords: Sequence[int],
+                   today: datetime.date | None = None) -> list[float]:
+    """一次算出一列题目的得分"""
+    today_ord = _today_ordinal(today)
+    if not HAVE_NUMPY:
+        return [problem_score(s, d, today_ord) for s, d in zip(seconds, date_ords)]
+
+    seconds = np.asarray(seconds, dtype=np.int64)
+    days_old = today_ord - np.asarray(date_ords, dtype=np.int64)
+    time_part = seconds / 1800 * 5
+    date_part = days_old / 30 * 5
+    scores = (np.minimum(time_part, 5) + np.minimum(date_part, 5)).tolist()
+    # 两部分都超过上限时纯 Python 版得到的是整数 5 + 5，这里也返回整数 10（打印出来是 10 而不是 10.0）
+    capped = ((time_part > 5) & (date_part > 5)).tolist()
+    return [10 if at_cap else round(score, 2) for score, at_cap in zip(scores, capped)]
+
+
+def tag_scores(counts: Sequence[int], totals: Sequence[int], oldest_ords: Sequence[int],
+               today: datetime.date | None = None) -> list[float]:
+    """由每个tag的 (题目数, 耗时总和, 最旧日期序数) 一次算出所有tag的得分"""
+    today_ord = _today_ordinal(today)
+    if not HAVE_NUMPY:
+        return [tag_score(c, t, o, today_ord) for c, t, o in zip(counts, totals, oldest_ords)]
+
+    avg_time = np.asarray(totals, dtype=np.float64) / np.asarray(counts, dtype=np.float64)
+    days_old = today_ord - np.asarray(oldest_ords, dtype=np.int64)
+    time_score = np.minimum(avg_time / 1800 * 10, 10)
+    date_score = np.minimum(days_old / 30 * 10, 10)
+    return [round(score, 2) for score in ((time_score + date_score) / 2).tolist()]
+
+
+def tag_stats(columns: ItemColumns, category_to_problems: dict) -> dict[str, tuple[int, int, int]]:
+    """
+    按分类分组统计: tag -> (题目数, 耗时总和秒数, 最旧日期序数)
+    没有题目的分类不出现在结果里，顺序与 category_to_problems 一致。
+    """
+    if not HAVE_NUMPY:
+        return _tag_stats_python(columns, category_to_problems)
+
+    ids = np.frombuffer(columns.leetcode_ids, dtype=np.int64) if len(columns) else np.zeros(0, np.int64)
+    order = np.argsort(ids, kind="stable")
+    sorted_ids = ids[order]
+
+    # 展开成 (分类编码, 题号) 的成员关系对
+    tags = list(category_to_problems)
+    member_ids, member_tags = [], []
+    for code, tag in enumerate(tags):
+        unique_ids = set(category_to_problems[tag])
+        member_ids.extend(unique_ids)
+        member_tags.extend([code] * len(unique_ids))
+    member_ids = np.asarray(member_ids, dtype=np.int64)
+    member_tags = np.asarray(member_tags, dtype=np.int64)
+
+    # 每个题号在题目列里可能对应多行（重复题号），按区间展开
+    lo = np.searchsorted(sorted_ids, member_ids, side="left")
+    hi = np.searchsorted(sorted_ids, member_ids, side="right")
+    hits = hi - lo
+    pair_tags = np.repeat(member_tags, hits)
+    offsets = np.arange(hits.sum()) - np.repeat(np.cumsum(hits) - hits, hits)
+    pair_rows = order[np.repeat(lo, hits) + offsets]
+
+    seconds = np.asarray(columns.seconds, dtype=np.int64)[pair_rows]
+    dates = np.asarray(columns.date_ords, dtype=np.int64)[pair_rows]
+    counts = np.bincount(pair_tags, minlength=len(tags))
+    totals = np.bincount(pair_tags, weights=seconds, minlength=len(tags))
+
+    # pair_tags 已经按分类编码有序，用 reduceat 求每组最小日期
+    present = np.flatnonzero(counts)
+    starts = np.searchsorted(pair_tags, present)
+    oldest = np.minimum.reduceat(dates, starts) if len(present) else dates[:0]
+
+    return {
+        tags[code]: (count, int(total), date_ord)
+        for code, count, total, date_ord in zip(
+            present.tolist(), counts[present].tolist(), totals[present].tolist(), oldest.tolist())
+    }
+
+
+def _tag_stats_python(columns: ItemColumns, category_to_problems: dict) -> dict[str, tuple[int, int, int]]:
+    rows_by_id: dict[int, list[int]] = {}
+    for row, leetcode_id in enumerate(columns.leetcode_ids):
+        rows_by_id.setdefault(leetcode_id, []).append(row)
+
+    stats = {}
+    for tag, problem_ids in category_to_problems.items():
+        rows = [row for leetcode_id in set(problem_ids) for row in rows_by_id.get(leetcode_id, ())]
+        if not rows:
+            continue
+        stats[tag] = (
+            len(rows),
+            sum(columns.seconds[row] for row in rows),
+            min(columns.date_ords[row] for row in rows),
+        )
+    return stats
@@ -0,0 +1,410 @@
+"""
+无界面服务模式：asyncio 实现的本地 HTTP/JSON 接口（只用标准库）
+
+    GET  /items?offset=0&limit=50   题目列表
+    GET  /items/<题号>               单道题（含刷题历史的统计）
+    GET  /today                     今天刷过的题
+    GET  /recommend?k=3             推荐的tag和题目
+    GET  /due?days=1&limit=100      今天起 days 天内到期需要复习的题
+    GET  /stats                     结果缓存的命中统计
+    POST /items                     添加题目 {"leetcode_id", "leetcode_url", "date", "difficulty", "time_cost", "tag"}
+    POST /items/<题号>               更新题目（记一次新的刷题），字段同上，都可以省略
+
+读请求直接在事件循环里读内存数据，多个客户端互不阻塞；
+所有修改都进入同一个队列，由唯一的写入任务按顺序应用到内存，再把这一批积攒的修改一起追加到日志
+（只fsync一次），日志写完才返回，所以返回成功的修改不会丢。
+日志写入失败时这一批请求返回 500，但修改已经应用到内存、不会撤销（监听它的统计量、复习计划、刷题历史都已更新）；
+这些修改留在待写列表里，之后每一批写日志时连同新修改一起重试，退出时也再试一次。
+分类文件和复习计划是整文件重写，刷题历史是追加写，都最多每 flush_interval 秒写一次（以及退出时）；
+崩溃时最多丢掉这段时间内的分类变化，复习计划和刷题历史启动时会按题目的数据自动补上。
+定时重写失败时只打印错误，写入任务继续处理请求，下一个周期再重试。
+持久化都放在工作线程里执行，期间读请求照常处理。
+"""
+import asyncio
+import contextlib
+import datetime
+import json
+import signal
+import sys
+import threading
+import time
+from urllib.parse import parse_qs, urlsplit
+from objects.attempt_history import AttemptHistory
+from objects.importer import validate_difficulty, validate_record, validate_time_cost
+from objects.item import Item, parse_date_ordinal
+from objects.item_store import ItemStore
+from objects.journal_store import JournalStore
+from objects.leetcode_classify import LeetCodeClassify
+from objects.recommender import recommend
+from objects.scheduler import Scheduler
+from objects.sqlite_store import SqliteStore
+
+MAX_BODY_BYTES = 1024 * 1024
+MAX_BATCH = 256  # 写入任务一次最多合并的修改数
+MAX_PAGE = 1000
+FLUSH_INTERVAL = 1.0  # 分类文件/复习计划最多多久写一次（秒）
+
+_REASONS = {200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            409: "Conflict", 413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+class HttpError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class XiaobaiService:
+    def __init__(self, items: ItemStore, classifier: LeetCodeClassify, store: JournalStore | SqliteStore,
+                 scheduler: Scheduler | None = None, history: AttemptHistory | None = None,
+                 flush_interval: float = FLUSH_INTERVAL):
+        """
+        参数:
+            items (ItemStore): 已加载的题目集合
+            classifier (LeetCodeClassify): 绑定了 items 的分类器
+            store: 题目的存储后端（JournalStore 或 SqliteStore）
+            scheduler (Scheduler): 复习计划，没有时 /due 不可用
+            history (AttemptHistory): 刷题历史，给出时推荐按历史耗时打分
+            flush_interval (float): 分类文件/复习计划最多多久写一次（秒）
+        """
+        self.items = items
+        self.classifier = classifier
+        self.store = store
+        self.scheduler = scheduler
+        self.history = history
+        self.flush_interval = flush_interval
+        self.batches = 0  # 写日志的批次数
+        self.mutations = 0  # 应用的修改数
+        self.flushes = 0  # 重写分类文件/复习计划的次数
+        self.flush_errors = 0  # 定时重写失败的次数
+        self._queue: asyncio.Queue | None = None
+        self._writer: asyncio.Task | None = None
+        self._unflushed = False
+        self._unpersisted: dict[int, Item] = {}  # 已应用到内存但写日志失败、等待重试的修改
+        self._last_flush = 0.0
+        self._flush_lock = threading.Lock()
+
+    async def start(self) -> None:
+        self._queue = asyncio.Queue()
+        self._writer = asyncio.create_task(self._run_writer())
+
+    async def stop(self) -> None:
+        """等队列里已提交的修改都写完，再停止写入任务"""
+        if self._writer is None:
+            return
+        if not self._writer.done():
+            await self._queue.join()
+        self._writer.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._writer
+        self._writer = None
+        loop = asyncio.get_running_loop()
+        try:
+            if self._unpersisted:
+                await loop.run_in_executor(None, self._persist, {})
+        finally:
+            await loop.run_in_executor(None, self._flush)
+
+    # ---- 读 ----
+
+    def list_items(self, offset: int = 0, limit: int = 50) -> dict:
+        return {
+            "total": len(self.items),
+            "offset": offset,
+            "items": [item.to_dict() for item in self.items[offset:offset + limit]],
+        }
+
+    def get_item(self, leetcode_id: int) -> dict:
+        item = self.items.get(leetcode_id)
+        if item is None:
+            raise HttpError(404, f"题号 {leetcode_id} 不存在")
+        data = item.to_dict()
+        log = self.history.get(leetcode_id) if self.history is not None else None
+        if log is not None:
+            data["history"] = log.to_dict()
+        return data
+
+    def today(self) -> dict:
+        items = self.store.today_items(datetime.date.today())
+        return {"count": len(items), "items": [item.to_dict() for item in items]}
+
+    def recommend(self, k: int = 3) -> dict:
+        tag, tag_score, ranked = recommend(self.items, self.classifier, k, history=self.history)
+        return {
+            "tag": tag,
+            "tag_score": tag_score,
+            "problems": [{"leetcode_id": item.leetcode_id, "score": score} for score, item in ranked],
+        }
+
+    def due(self, days: int = 1, limit: int = 100) -> dict:
+        if self.scheduler is None:
+            raise HttpError(404, "没有启用复习计划")
+        until = datetime.date.today() + datetime.timedelta(days=max(days, 1) - 1)
+        due = self.scheduler.due(until, limit + 1)  # 多取一道，判断后面还有没有
+        return {"until": until.isoformat(), "has_more": len(due) > limit,
+                "due": [{"leetcode_id": leetcode_id, "due": day.isoformat()} for day, leetcode_id in due[:limit]]}
+
+    def stats(self) -> dict:
+        return {"items": len(self.items), "result_cache": self.classifier.cache.stats()}
+
+    # ---- 写（都经过写入队列） ----
+
+    async def add(self, body: dict) -> dict:
+        return await self._submit(self._apply_add, body)
+
+    async def update(self, leetcode_id: int, body: dict) -> dict:
+        return await self._submit(self._apply_update, leetcode_id, body)
+
+    async def _submit(self, func, *args) -> dict:
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((func, args, future))
+        return await future
+
+    async def _run_writer(self) -> None:
+        """唯一的写入者：把排队的修改依次应用到内存，整批一起写日志，到时间再重写分类文件/复习计划"""
+        loop = asyncio.get_running_loop()
+        while True:
+            if self._unflushed:
+                try:
+                    first = await asyncio.wait_for(self._queue.get(), self.flush_interval)
+                except asyncio.TimeoutError:
+                    await self._try_flush()
+                    continue
+            else:
+                first = await self._queue.get()
+            pending = [first]
+            while len(pending) < MAX_BATCH and not self._queue.empty():
+                pending.append(self._queue.get_nowait())
+
+            results = []
+            changed: dict[int, Item] = {}
+            with self.classifier.batch(flush=False):
+                for func, args, future in pending:
+                    try:
+                        item = func(*args)
+                    except HttpError as e:
+                        results.append((future, e, None))
+                        continue
+                    except Exception as e:  # 单个请求出错不影响同一批的其他修改
+                        results.append((future, HttpError(500, f"{type(e).__name__}: {e}"), None))
+                        continue
+                    changed[id(item)] = item
+                    results.append((future, None, item.to_dict()))
+
+            persist_error = None
+            try:
+                await loop.run_in_executor(None, self._persist, changed)
+            except Exception as e:
+                persist_error = HttpError(500, f"保存失败（修改已在内存中生效，之后会重试写入）: {e}")
+            self.batches += 1
+            self.mutations += len(changed)
+            self._unflushed = True
+
+            for future, error, value in results:
+                if future.done():
+                    continue  # 客户端已断开
+                error = error or (persist_error if value is not None else None)
+                if error is not None:
+                    future.set_exception(error)
+                else:
+                    future.set_result(value)
+            for _ in pending:
+                self._queue.task_done()
+
+            if time.monotonic() - self._last_flush >= self.flush_interval:
+                await self._try_flush()
+
+    async def _try_flush(self) -> None:
+        """写入任务里的定时重写：失败时只打印，_unflushed 保持为真，等一个周期后重试，不能让写入任务退出"""
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, self._flush)
+        except Exception as e:
+            self.flush_errors += 1
+            self._last_flush = time.monotonic()
+            print(f"重写分类文件/复习计划失败，{self.flush_interval:g} 秒后重试: {type(e).__name__}: {e}", file=sys.stderr)
+
+    def _persist(self, changed: dict[int, Item]) -> None:
+        """把这一批修改连同之前写失败的一起追加到日志；失败时全部留着下次重试"""
+        self._unpersisted.update(changed)
+        if self._unpersisted:
+            self.store.append_many(list(self._unpersisted.values()))
+            self._unpersisted.clear()
+
+    def _flush(self) -> None:
+        """
+        重写分类文件和复习计划。在工作线程里执行；
+        写入任务等它结束才处理下一批修改，所以期间内存数据只会被读
+        """
+        with self._flush_lock:
+            self.classifier.flush()
+            if self.scheduler is not None:
+                self.scheduler.save()
+            if self.history is not None:
+                self.history.save()
+            self._unflushed = False
+            self._last_flush = time.monotonic()
+            self.flushes += 1
+
+    def _apply_add(self, body: dict) -> Item:
+        try:
+            item = validate_record({
+                "leetcode_id": body.get("leetcode_id"),
+                "leetcode_url": body.get("leetcode_url") or "",
+                "date": body.get("date") or datetime.date.today().isoformat(),
+                "difficulty": body.get("difficulty"),
+                "time_cost": body.get("time_cost"),
+                "times": 1,
+                "tag": body.get("tag"),
+            })
+        except ValueError as e:
+            raise HttpError(400, str(e))
+        if self.items.get(item.leetcode_id) is not None:
+            raise HttpError(409, f"题号 {item.leetcode_id} 已存在，请用更新接口")
+        self.items.add(item)
+        if item.tag:
+            self.classifier.add_problem_to_category(item.leetcode_id, item.tag)
+        return item
+
+    def _apply_update(self, leetcode_id: int, body: dict) -> Item:
+        """与交互菜单的"更新已刷的题"相同：日期默认今天，刷题次数加一"""
+        item = self.items.get(leetcode_id)
+        if item is None:
+            raise HttpError(404, f"题号 {leetcode_id} 不存在")
+        changes = {"times": item.times + 1}
+        try:
+            changes["date"] = (datetime.date.fromordinal(parse_date_ordinal(str(body["date"])))
+                               if body.get("date") else datetime.date.today())
+        except ValueError:
+            raise HttpError(400, f"日期格式错误: {body['date']!r}")
+        try:
+            if body.get("difficulty"):
+                changes["difficulty"] = validate_difficulty(body["difficulty"])
+            if body.get("time_cost"):
+                changes["time_cost"] = validate_time_cost(body["time_cost"])
+        except ValueError as e:
+            raise HttpError(400, str(e))
+        if body.get("tag"):
+            changes["tag"] = str(body["tag"])
+            self.classifier.update_problem_categories(leetcode_id, [changes["tag"]])
+        self.items.update(item, changes)
+        return item
+
+    # ---- HTTP ----
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """一个连接上可以连续发多个请求（HTTP/1.1 keep-alive）"""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                    length = int(headers.get("content-length") or 0)
+                    if length > MAX_BODY_BYTES:
+                        raise HttpError(413, "请求体太大")
+                    body = await reader.readexactly(length) if length else b""
+                    status, payload = await self.dispatch(method, target, body)
+                except HttpError as e:
+                    status, payload, version = e.status, {"error": str(e)}, "HTTP/1.0"
+                except ValueError:
+                    status, payload, version = 400, {"error": "请求格式错误"}, "HTTP/1.0"
+
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                writer.write(
+                    f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+                    f"Content-Type: application/json; charset=utf-8\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + data)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+
+    async def dispatch(self, method: str, target: str, body: bytes) -> tuple[int, object]:
+        """路由一个请求，返回 (状态码, JSON对象)"""
+        url = urlsplit(target)
+        parts = [part for part in url.path.split("/") if part]
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        try:
+            if parts == ["items"]:
+                if method == "GET":
+                    limit = min(_int_param(query, "limit", 50), MAX_PAGE)
+                    return 200, self.list_items(_int_param(query, "offset", 0), limit)
+                if method == "POST":
+                    return 201, await self.add(_json_body(body))
+            elif len(parts) == 2 and parts[0] == "items":
+                leetcode_id = _int_value(parts[1], "题号")
+                if method == "GET":
+                    return 200, self.get_item(leetcode_id)
+                if method in ("POST", "PUT", "PATCH"):
+                    return 200, await self.update(leetcode_id, _json_body(body))
+            elif parts in (["today"], ["recommend"], ["due"], ["stats"]):
+                if method == "GET":
+                    if parts == ["today"]:
+                        return 200, self.today()
+                    if parts == ["stats"]:
+                        return 200, self.stats()
+                    if parts == ["recommend"]:
+                        return 200, self.recommend(_int_param(query, "k", 3))
+                    limit = min(_int_param(query, "limit", 100), MAX_PAGE)
+                    return 200, self.due(_int_param(query, "days", 1), limit)
+            else:
+                raise HttpError(404, f"没有这个接口: {url.path}")
+            raise HttpError(405, f"{url.path} 不支持 {method}")
+        except HttpError as e:
+            return e.status, {"error": str(e)}
+
+
+def _int_value(value: str, name: str) -> int:
+    try:
+        return int(value)
+    except ValueError:
+        raise HttpError(400, f"{name} 必须是整数: {value!r}")
+
+
+def _int_param(query: dict, name: str, default: int) -> int:
+    if name not in query:
+        return default
+    value = _int_value(query[name], name)
+    if value < 0:
+        raise HttpError(400, f"{name} 不能是负数")
+    return value
+
+
+def _json_body(body: bytes) -> dict:
+    try:
+        data = json.loads(body or b"{}")
+    except ValueError:
+        raise HttpError(400, "请求体不是合法的JSON")
+    if not isinstance(data, dict):
+        raise HttpError(400, "请求体必须是JSON对象")
+    return data
+
+
+async def serve(service: XiaobaiService, host: str = "127.0.0.1", port: int = 8765) -> None:
+    """启动服务直到被取消（Ctrl-C 或 SIGTERM），退出前把已提交的修改写完"""
+    await service.start()
+    server = await asyncio.start_server(service.handle_connection, host, port)
+    with contextlib.suppress(NotImplementedError, AttributeError):  # Windows 没有 add_signal_handler/SIGTERM
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+    print(f"服务已启动: http://{host}:{port}（Ctrl-C 退出）")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.stop()
@@ -0,0 +1,61 @@
+"""
+JSON 文件的二进制缓存，加快启动
+
+缓存文件放在源文件旁边（xxx.json.cache），内容是 文件头 + pickle：
+    文件头记录格式版本、源JSON的 mtime 和大小，任意一项对不上就视为失效，
+    调用方回退到解析JSON并顺手重建缓存，所以缓存文件随时可以删掉。
+读取时整个文件一次读进来反序列化（10万道题约 20~30 毫秒，比解析JSON快得多）；
+反序列化不是惰性的，启动剩下的时间主要花在还原 Item 和建立索引上。
+缓存只由本程序自己写入，不要加载来历不明的缓存文件（pickle 不安全）。
+"""
+import os
+import pickle
+import struct
+from pathlib import Path
+from objects.fileio import atomic_write_bytes
+
+MAGIC = b"XBSC"
+CACHE_VERSION = 1
+_HEADER = struct.Struct("<4sHqq")  # 魔数, 版本, 源文件mtime(ns), 源文件大小
+
+
+def cache_path(source_path) -> Path:
+    source_path = Path(source_path)
+    return source_path.with_name(source_path.name + ".cache")
+
+
+def _source_signature(source_path: Path) -> tuple[int, int] | None:
+    try:
+        stat = os.stat(source_path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def read_cache(source_path):
+    """源文件没变时返回缓存的对象，否则（或缓存损坏）返回 None"""
+    signature = _source_signature(Path(source_path))
+    path = cache_path(source_path)
+    if signature is None or not path.exists():
+        return None
+    try:
+        data = path.read_bytes()
+        magic, version, mtime_ns, size = _HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != CACHE_VERSION or (mtime_ns, size) != signature:
+            return None
+        return pickle.loads(memoryview(data)[_HEADER.size:])
+    except (OSError, ValueError, struct.error, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        return None
+
+
+def write_cache(source_path, payload) -> None:
+    """为源文件的当前版本写入缓存（源文件写完之后调用）"""
+    signature = _source_signature(Path(source_path))
+    if signature is None:
+        return
+    header = _HEADER.pack(MAGIC, CACHE_VERSION, *signature)
+    try:
+        atomic_write_bytes(cache_path(source_path),
+                           header + pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL))
+    except OSError:
+        pass  # 缓存写失败不影响正常使用，下次启动回退到JSON
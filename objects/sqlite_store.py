@@ -0,0 +1,211 @@
+"""
+SQLite 存储后端
+
+与 JournalStore 接口相同（load / append / add_many / close / today_items），另外:
+    - 题目↔分类的双向映射存在 problem_category 关联表里，供 LeetCodeClassify 使用
+    - 今日记录、按tag的分组统计直接在 SQL 里完成（COUNT/SUM/MIN ... GROUP BY），不用把题目读进 Python
+首次打开空数据库时，会自动把旁边的 leetcode_list.json / classification.json 迁移进来。
+只读打开时不建表、不迁移，数据库文件还不存在时在内存里建库并从 JSON 迁移，不写磁盘。
+
+serve 模式下读请求在事件循环线程里查询，写日志/提交在工作线程里执行，共用同一个连接；
+所有对连接的访问都经过 _lock 串行化（sqlite3 的连接对象本身不能被多个线程同时使用）。
+"""
+import datetime
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from objects.item import Item
+from objects.item_store import ItemStore
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    leetcode_id  INTEGER PRIMARY KEY,
+    leetcode_url TEXT NOT NULL DEFAULT '',
+    date_ord     INTEGER NOT NULL,
+    difficulty   TEXT NOT NULL,
+    time_cost    TEXT NOT NULL,
+    seconds      INTEGER NOT NULL,
+    times        INTEGER NOT NULL,
+    tag          TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_items_date ON items(date_ord);
+CREATE INDEX IF NOT EXISTS idx_items_tag ON items(tag);
+CREATE INDEX IF NOT EXISTS idx_items_times ON items(times);
+
+CREATE TABLE IF NOT EXISTS problem_category (
+    category   TEXT NOT NULL,
+    problem_id INTEGER NOT NULL,
+    PRIMARY KEY (category, problem_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_problem_category_problem ON problem_category(problem_id);
+"""
+
+_ITEM_COLUMNS = "leetcode_id, leetcode_url, date_ord, difficulty, time_cost, seconds, times, tag"
+
+
+def _item_row(item: Item) -> tuple:
+    return (item.leetcode_id, item.leetcode_url, item.date_ordinal, item.difficulty,
+            item.time_cost, item.time_cost_in_seconds(), item.times, item.tag)
+
+
+def _row_item(row: tuple) -> Item:
+    leetcode_id, leetcode_url, date_ord, difficulty, time_cost, _, times, tag = row
+    return Item(leetcode_id, {
+        "date": datetime.date.fromordinal(date_ord),
+        "difficulty": difficulty,
+        "time_cost": time_cost,
+        "times": times,
+        "tag": tag,
+    }, leetcode_url=leetcode_url)
+
+
+class SqliteStore:
+    def __init__(self, db_path: str, json_path: str | None = None, classification_path: str | None = None,
+                 read_only: bool = False):
+        """
+        参数:
+            db_path (str): 数据库文件
+            json_path (str): 旧的题目列表JSON，数据库为空时从这里迁移
+            classification_path (str): 旧的分类JSON，关联表为空时从这里迁移
+            read_only (bool): 只读打开（可与其他进程同时读），不修改数据库文件
+        """
+        self.db_path = Path(db_path)
+        self.json_path = Path(json_path) if json_path else None
+        self.classification_path = Path(classification_path) if classification_path else None
+        self.read_only = read_only
+        self._lock = threading.RLock()
+        self._migrate = True  # 数据库为空时是否从 JSON 迁移
+        # serve 模式下持久化在工作线程里执行（同一时刻只有一个写入者），读写都要先拿 _lock
+        if not read_only:
+            self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.executescript(_SCHEMA)
+        elif self.db_path.exists():
+            self.conn = sqlite3.connect(f"{self.db_path.resolve().as_uri()}?mode=ro", uri=True,
+                                        check_same_thread=False)
+            self._migrate = False
+        else:
+            self.conn = sqlite3.connect(":memory:", check_same_thread=False)
+            self.conn.executescript(_SCHEMA)
+        self.items = ItemStore()
+        self.revision = 0  # 题目写入次数，数据库里的统计变了就加一（结果缓存据此失效）
+
+    def load(self) -> ItemStore:
+        """读出所有题目（交互菜单的更新/推荐仍然基于内存中的 ItemStore）"""
+        with self._lock:
+            self._migrate_items()
+            rows = self.conn.execute(f"SELECT {_ITEM_COLUMNS} FROM items ORDER BY rowid").fetchall()
+        self.items = ItemStore(_row_item(row) for row in rows)
+        return self.items
+
+    def append(self, item: Item) -> None:
+        """写入一次添加/更新（按题号覆盖）"""
+        self.append_many([item])
+
+    def append_many(self, items: list[Item]) -> None:
+        """多次添加/更新在一个事务里提交"""
+        with self._lock, self.conn:
+            self._upsert(items)
+
+    def add_many(self, items: list[Item]) -> None:
+        """批量添加，一个事务提交"""
+        for item in items:
+            self.items.add(item)
+        with self._lock, self.conn:
+            self._upsert(items)
+
+    def close(self) -> None:
+        with self._lock:
+            self.conn.commit()
+            self.conn.close()
+
+    # ---- 查询下推 ----
+
+    def get(self, leetcode_id: int) -> Item | None:
+        with self._lock:
+            row = self.conn.execute(f"SELECT {_ITEM_COLUMNS} FROM items WHERE leetcode_id = ?",
+                                    (leetcode_id,)).fetchone()
+        return _row_item(row) if row else None
+
+    def today_items(self, day: datetime.date | None = None) -> list[Item]:
+        """某一天（默认今天）刷过的题，走 date 索引"""
+        day = day or datetime.date.today()
+        with self._lock:
+            rows = self.conn.execute(f"SELECT {_ITEM_COLUMNS} FROM items WHERE date_ord = ? ORDER BY rowid",
+                                     (day.toordinal(),)).fetchall()
+        return [_row_item(row) for row in rows]
+
+    def tag_stats(self) -> dict[str, tuple[int, int, int]]:
+        """每个分类的 (题目数, 耗时总和秒数, 最旧日期序数)，在数据库里分组聚合"""
+        with self._lock:
+            rows = self.conn.execute("""
+                SELECT pc.category, COUNT(*), SUM(i.seconds), MIN(i.date_ord)
+                FROM problem_category pc JOIN items i ON i.leetcode_id = pc.problem_id
+                GROUP BY pc.category
+            """).fetchall()
+        return {category: (count, total, oldest) for category, count, total, oldest in rows}
+
+    # ---- 分类关联表（供 LeetCodeClassify 使用） ----
+
+    def load_classification(self) -> dict:
+        """读出分类的双向映射（内存结构与 classification.json 加载后相同）"""
+        with self._lock:
+            self._migrate_classification()
+            rows = self.conn.execute("SELECT category, problem_id FROM problem_category").fetchall()
+        data = {"category_to_problems": {}, "problem_to_categories": {}}
+        for category, problem_id in rows:
+            data["category_to_problems"].setdefault(category, set()).add(problem_id)
+            data["problem_to_categories"].setdefault(str(problem_id), set()).add(category)
+        return data
+
+    def link(self, problem_id: int, category: str) -> None:
+        with self._lock:
+            self.conn.execute("INSERT OR IGNORE INTO problem_category(category, problem_id) VALUES (?, ?)",
+                              (category, problem_id))
+
+    def unlink(self, problem_id: int, category: str) -> None:
+        with self._lock:
+            self.conn.execute("DELETE FROM problem_category WHERE category = ? AND problem_id = ?",
+                              (category, problem_id))
+
+    def commit(self) -> None:
+        with self._lock:
+            self.conn.commit()
+
+    def rollback(self) -> None:
+        with self._lock:
+            self.conn.rollback()
+
+    def _upsert(self, items: list[Item]) -> None:
+        self.conn.executemany(
+            f"INSERT OR REPLACE INTO items({_ITEM_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (_item_row(item) for item in items))
+        self.revision += 1
+
+    def _migrate_items(self) -> None:
+        if not self._migrate or self.json_path is None or not self.json_path.exists():
+            return
+        if self.conn.execute("SELECT 1 FROM items LIMIT 1").fetchone():
+            return
+        with open(self.json_path, "r", encoding="utf-8") as f:
+            items = [Item.from_dict(item) for item in json.load(f)]
+        with self.conn:
+            # 重复题号保留第一条，与 ItemStore.get 一致
+            self.conn.executemany(
+                f"INSERT OR IGNORE INTO items({_ITEM_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (_item_row(item) for item in items))
+
+    def _migrate_classification(self) -> None:
+        if not self._migrate or self.classification_path is None or not self.classification_path.exists():
+            return
+        if self.conn.execute("SELECT 1 FROM problem_category LIMIT 1").fetchone():
+            return
+        with open(self.classification_path, "r", encoding="utf-8") as f:
+            raw = json.load(f)
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO problem_category(category, problem_id) VALUES (?, ?)",
+                ((category, problem_id)
+                 for category, problem_ids in raw.get("category_to_problems", {}).items()
+                 for problem_id in problem_ids))
@@ -0,0 +1,52 @@
+"""
+存储后端的选择
+
+配置来源（后者覆盖前者）:
+    1. 默认值: json 后端
+    2. 数据目录下的 config.json，例如 {"backend": "sqlite"}
+    3. 环境变量 XIAOBAI_BACKEND
+    4. 命令行参数 --backend
+"""
+import json
+import os
+from pathlib import Path
+from objects.journal_store import JournalStore
+from objects.sqlite_store import SqliteStore
+
+BACKENDS = ("json", "sqlite")
+DEFAULT_CONFIG = {
+    "backend": "json",
+    "sqlite_file": "xiaobai.db",
+}
+
+
+def load_config(data_dir: str = "data", backend: str | None = None) -> dict:
+    config = dict(DEFAULT_CONFIG)
+    config_path = Path(data_dir) / "config.json"
+    if config_path.exists():
+        with open(config_path, "r", encoding="utf-8") as f:
+            config.update(json.load(f))
+    if os.environ.get("XIAOBAI_BACKEND"):
+        config["backend"] = os.environ["XIAOBAI_BACKEND"]
+    if backend:
+        config["backend"] = backend
+    if config["backend"] not in BACKENDS:
+        raise ValueError(f"未知的存储后端: {config['backend']}（可选: {', '.join(BACKENDS)}）")
+    return config
+
+
+def open_store(data_dir: str = "data", config: dict | None = None, read_only: bool = False) -> JournalStore | SqliteStore:
+    """
+    按配置打开题目存储，返回的对象都支持 load / append / add_many / close / today_items
+    read_only 时不创建、不修改数据目录里的任何文件（JSON 后端不压缩日志、不写缓存；SQLite 只读打开，不建表不迁移）
+    """
+    config = config or load_config(data_dir)
+    data_dir = Path(data_dir)
+    json_path = data_dir / "leetcode_list.json"
+    if config["backend"] == "sqlite":
+        return SqliteStore(data_dir / config["sqlite_file"], json_path=json_path,
+                           classification_path=data_dir / "classification.json", read_only=read_only)
+    if not json_path.exists() and not read_only:
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump([], f, ensure_ascii=False, indent=4)
+    return JournalStore(json_path, read_only=read_only)
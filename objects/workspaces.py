@@ -0,0 +1,172 @@
+"""
+多用户工作区
+
+每个用户一个数据目录 data/users/<用户名>/，里面的文件和单用户时的 data/ 完全一样
+（leetcode_list.json、classification.json、schedule.json、history.bin，也可以放自己的 config.json 选用 SQLite 后端）。
+不指定用户时仍然使用 data/ 本身，原来的单用户数据不用迁移。
+
+batch 命令用进程池给所有用户并行生成当天的推荐和分类分数表，写到 <输出目录>/<用户名>/ 下:
+    recommendations.json  推荐的tag和题目、今天到期需要复习的题
+    tag_scores.csv        分类分数表
+每个任务只处理一个用户：在工作进程里读数据、计算、写文件，只把一行摘要传回主进程；
+在途任务数有上限，工作进程处理一定数量的用户后重启，内存不随用户数增长。
+批量任务只读用户数据，不压缩日志、不保存复习计划，可以和用户自己正在运行的程序同时进行。
+"""
+import csv
+import datetime
+import io
+import json
+import os
+import random
+import re
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
+from pathlib import Path
+from typing import Iterable, Iterator
+from objects.attempt_history import AttemptHistory
+from objects.fileio import atomic_write_text
+from objects.leetcode_classify import LeetCodeClassify
+from objects.recommender import recommend
+from objects.scheduler import Scheduler
+from objects.sqlite_store import SqliteStore
+from objects.storage import load_config, open_store
+
+USERS_DIR = "users"
+TASKS_PER_CHILD = 200  # 工作进程处理多少个用户后重启，释放内存碎片
+_USER_NAME = re.compile(r"^[\w-][\w.-]*$")
+
+
+class Workspace:
+    """一个数据目录里的全部状态：题目存储、分类、复习计划、刷题历史"""
+
+    def __init__(self, data_dir: str, backend: str | None = None, read_only: bool = False):
+        """
+        参数:
+            data_dir (str): 数据目录，不存在时自动创建（只读时报错）
+            backend (str): 存储后端，默认读数据目录下的 config.json
+            read_only (bool): 只读打开，不创建也不修改数据目录里的任何文件（修改只留在内存里）
+        """
+        self.data_dir = Path(data_dir)
+        if read_only and not self.data_dir.is_dir():
+            raise FileNotFoundError(f"数据目录不存在: {self.data_dir}")
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        self.read_only = read_only
+        self.store = open_store(self.data_dir, load_config(self.data_dir, backend), read_only=read_only)
+        self.items = self.store.load()
+        db = self.store if isinstance(self.store, SqliteStore) else None
+        self.classifier = LeetCodeClassify(self.data_dir / "classification.json", store=self.items, db=db,
+                                           read_only=read_only)
+        self.scheduler = Scheduler(self.data_dir / "schedule.json", self.items)
+        self.history = AttemptHistory(self.data_dir / "history.bin", self.items, read_only=read_only)
+
+    def close(self) -> None:
+        self.store.close()
+        if not self.read_only:
+            self.scheduler.save()
+            self.history.save()
+
+
+def user_data_dir(root: str, user: str | None) -> Path:
+    """用户的数据目录；user 为 None 时就是 root 本身"""
+    if user is None:
+        return Path(root)
+    if not _USER_NAME.match(user):
+        raise ValueError(f"用户名只能包含字母、数字、下划线、横线和点: {user!r}")
+    return Path(root) / USERS_DIR / user
+
+
+def list_users(root: str) -> list[str]:
+    users_dir = Path(root) / USERS_DIR
+    if not users_dir.is_dir():
+        return []
+    return sorted(path.name for path in users_dir.iterdir() if path.is_dir() and _USER_NAME.match(path.name))
+
+
+def build_report(workspace: Workspace, user: str, today: datetime.date, k: int = 3,
+                 due_limit: int = 50) -> tuple[dict, str]:
+    """
+    生成一个用户当天的推荐和分类分数表
+
+    返回: (recommendations.json 的内容, tag_scores.csv 的内容)
+    """
+    # 同一用户同一天的推荐固定下来，重跑结果不变
+    rng = random.Random(f"{user}:{today.isoformat()}")
+    tag, tag_score, ranked = recommend(workspace.items, workspace.classifier, k, rng, workspace.history)
+    recommendation = {
+        "user": user,
+        "date": today.isoformat(),
+        "tag": tag,
+        "tag_score": tag_score,
+        "problems": [{"leetcode_id": item.leetcode_id, "score": score} for score, item in ranked],
+        "due_today": [leetcode_id for _, leetcode_id in workspace.scheduler.due(today, due_limit)],
+    }
+
+    stats = workspace.classifier.tag_stats(history=workspace.history)
+    scores = workspace.classifier.calculate_tag_scores(history=workspace.history)
+    table = io.StringIO()
+    writer = csv.writer(table, lineterminator="\n")
+    writer.writerow(["tag", "count", "avg_time", "oldest_date", "score"])
+    for name, score in sorted(scores.items(), key=lambda pair: pair[1], reverse=True):
+        count, total_seconds, oldest = stats[name]
+        avg_time = total_seconds / count
+        writer.writerow([name, count, f"{int(avg_time // 60)}:{int(avg_time % 60):02d}",
+                         datetime.date.fromordinal(oldest).isoformat(), score])
+    return recommendation, table.getvalue()
+
+
+def run_user(root: str, user: str, output_dir: str, today: datetime.date, k: int = 3) -> tuple[str, float, str | None]:
+    """
+    进程池任务：处理一个用户，结果直接写文件
+
+    返回: (用户名, 耗时秒数, 错误信息或None)
+    """
+    start = time.perf_counter()
+    try:
+        workspace = Workspace(user_data_dir(root, user), read_only=True)
+        try:
+            recommendation, table = build_report(workspace, user, today, k)
+        finally:
+            workspace.close()
+        out = Path(output_dir) / user
+        out.mkdir(parents=True, exist_ok=True)
+        atomic_write_text(out / "recommendations.json", json.dumps(recommendation, ensure_ascii=False, indent=2))
+        atomic_write_text(out / "tag_scores.csv", table)
+    except Exception as e:  # 一个用户的数据坏了不影响其他用户
+        return user, time.perf_counter() - start, f"{type(e).__name__}: {e}"
+    return user, time.perf_counter() - start, None
+
+
+def run_batch(root: str, output_dir: str, users: Iterable[str] | None = None, workers: int | None = None,
+              k: int = 3, today: datetime.date | None = None) -> Iterator[tuple[str, float, str | None]]:
+    """
+    并行处理所有（或指定的）用户，按完成顺序产出每个用户的 (用户名, 耗时, 错误)
+
+    参数:
+        root (str): 数据根目录（其下的 users/ 是各用户的工作区）
+        output_dir (str): 输出目录
+        users (list[str]): 只处理这些用户，默认全部
+        workers (int): 进程数，默认CPU核数，1表示在当前进程里依次处理
+    """
+    today = today or datetime.date.today()
+    users = list(users) if users is not None else list_users(root)
+    if workers == 1 or len(users) <= 1:
+        for user in users:
+            yield run_user(root, user, output_dir, today, k)
+        return
+
+    workers = workers or os.cpu_count() or 1
+    try:
+        executor = ProcessPoolExecutor(max_workers=workers, max_tasks_per_child=TASKS_PER_CHILD)
+    except TypeError:  # Python 3.10 没有 max_tasks_per_child
+        executor = ProcessPoolExecutor(max_workers=workers)
+    with executor:
+        window = 4 * workers
+        pending = set()
+        for user in users:
+            pending.add(executor.submit(run_user, root, user, output_dir, today, k))
+            if len(pending) >= window:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        for future in as_completed(pending):
+            yield future.result()
@@ -0,0 +1,124 @@
+"""刷题历史：残缺记录截断、滚动统计、启动时补记旧数据"""
+import datetime
+import random
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from objects.attempt_history import ALPHA, MAGIC, AttemptHistory, AttemptLog
+from objects.item import Item
+from objects.item_store import ItemStore
+
+START = datetime.date(2025, 1, 1)
+
+
+def make_item(leetcode_id: int, date: datetime.date, seconds: int, times: int = 1) -> Item:
+    return Item(leetcode_id, {"date": date, "difficulty": "2", "time_cost": f"{seconds // 60}:{seconds % 60:02d}",
+                              "times": times, "tag": "贪心"}, f"https://leetcode.cn/problems/p{leetcode_id}/")
+
+
+def reference_stats(seconds: list[int]) -> tuple[float, int, float]:
+    """逐次重新计算 (ewma, best, trend)，耗时未知（0）的不参与"""
+    known = [value for value in seconds if value > 0]
+    if not known:
+        return 0.0, 0, 0.0
+    ewma, trend = float(known[0]), 0.0
+    for value in known[1:]:
+        trend = ALPHA * (value - ewma) + (1 - ALPHA) * trend
+        ewma = ALPHA * value + (1 - ALPHA) * ewma
+    return ewma, min(known), trend
+
+
+class AttemptHistoryTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.dir)
+        self.path = self.dir / "history.bin"
+
+    def test_truncates_torn_tail_at_every_offset(self):
+        history = AttemptHistory(self.path, ItemStore())
+        attempts = [(7, START, 300), (3000, START, 0), (7, START + datetime.timedelta(days=40), 86400),
+                    (7, START - datetime.timedelta(days=3), 65), (3000, START + datetime.timedelta(days=1), 200)]
+        boundaries = [len(MAGIC)]
+        for leetcode_id, date, seconds in attempts:
+            history.record(make_item(leetcode_id, date, seconds))
+            boundaries.append(len(MAGIC) + len(history._pending))
+        history.save()
+        data = self.path.read_bytes()
+        self.assertEqual(len(data), boundaries[-1])
+
+        for cut in range(len(MAGIC), len(data) + 1):
+            complete = max(index for index, boundary in enumerate(boundaries) if boundary <= cut)
+            expected: dict[int, list] = {}
+            for leetcode_id, date, seconds in attempts[:complete]:
+                expected.setdefault(leetcode_id, []).append((date, seconds))
+
+            self.path.write_bytes(data[:cut])
+            read_only = AttemptHistory(self.path, ItemStore(), read_only=True)
+            self.assertEqual(self.path.stat().st_size, cut)  # 只读时不截断
+            loaded = AttemptHistory(self.path, ItemStore())
+            for reopened in (read_only, loaded):
+                self.assertEqual({leetcode_id: list(log.attempts()) for leetcode_id, log in reopened._logs.items()},
+                                 expected, cut)
+            self.assertEqual(self.path.stat().st_size, boundaries[complete], cut)
+
+    def test_rolling_stats_match_reference(self):
+        rng = random.Random(3)
+        for _ in range(200):
+            seconds = [rng.choice([0, rng.randrange(1, 3600)]) for _ in range(rng.randrange(1, 12))]
+            log = AttemptLog(START.toordinal())
+            for value in seconds:
+                log.add(START.toordinal(), value)
+            batch = AttemptLog(START.toordinal())
+            split = rng.randrange(len(seconds) + 1)
+            batch.extend([0] * split, seconds[:split])
+            batch.extend([0] * (len(seconds) - split), seconds[split:])
+
+            ewma, best, trend = reference_stats(seconds)
+            for result in (log, batch):
+                self.assertAlmostEqual(result.ewma, ewma, places=6)
+                self.assertEqual(result.best, best)
+                self.assertAlmostEqual(result.trend, trend, places=6)
+
+    def test_stats_survive_reload(self):
+        items = ItemStore()
+        history = AttemptHistory(self.path, items)
+        item = make_item(1, START, 900)
+        items.add(item)
+        for days, seconds in ((2, 600), (5, 0), (9, 420)):
+            items.update(item, {"date": START + datetime.timedelta(days=days),
+                                "time_cost": f"{seconds // 60}:00", "times": item.times + 1})
+        history.save()
+        log = history.get(1)
+        self.assertEqual([seconds for _, seconds in log.attempts()], [900, 600, 0, 420])
+        self.assertEqual((log.ewma, log.best, log.trend), reference_stats([900, 600, 0, 420]))
+
+        reopened = AttemptHistory(self.path, items)
+        self.assertEqual(list(reopened.get(1).attempts()), list(log.attempts()))
+        self.assertAlmostEqual(reopened.get(1).ewma, log.ewma)
+        self.assertEqual(reopened.effective_seconds(item), round(log.ewma))
+
+    def test_reconciles_legacy_data_at_startup(self):
+        items = ItemStore([make_item(1, START, 600, times=3), make_item(2, START, 0, times=2)])
+        history = AttemptHistory(self.path, items)  # 没有历史文件的旧数据
+        for item in items:
+            log = history.get(item.leetcode_id)
+            self.assertEqual(list(log.attempts()), [(START, item.time_cost_in_seconds())])
+            self.assertEqual(log.times, item.times)
+            self.assertEqual(history.effective_seconds(item), item.time_cost_in_seconds())
+        history.save()
+
+        # 没变化的题重新打开不会重复记
+        self.assertEqual(len(AttemptHistory(self.path, items).get(1)), 1)
+
+        # 退出前没保存的一次刷题，启动时按题目当前的数据补上
+        later = START + datetime.timedelta(days=3)
+        items.update(items.get(1), {"date": later, "time_cost": "5:00", "times": 4})
+        reopened = AttemptHistory(self.path, items)
+        self.assertEqual(list(reopened.get(1).attempts()), [(START, 600), (later, 300)])
+        self.assertEqual(reopened.get(1).times, 4)
+        self.assertEqual(len(reopened.get(2)), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
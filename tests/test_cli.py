@@ -0,0 +1,20 @@
+"""命令行参数解析"""
+import unittest
+import xiaobai
+
+
+class ParseArgsTest(unittest.TestCase):
+    def test_profile_flag_does_not_swallow_subcommand(self):
+        args = xiaobai.parse_args(["--profile", "import", "f.jsonl"])
+        self.assertTrue(args.profile)
+        self.assertIsNone(args.profile_options)
+        self.assertEqual((args.command, args.file), ("import", "f.jsonl"))
+
+    def test_profile_options(self):
+        args = xiaobai.parse_args(["--profile-options", "cprofile,memory", "query", "tag=贪心"])
+        self.assertEqual(args.profile_options, "cprofile,memory")
+        self.assertEqual((args.command, args.filters), ("query", ["tag=贪心"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
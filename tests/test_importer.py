@@ -0,0 +1,58 @@
+"""批量导入：同一题的多条刷题记录按日期合并，已有的题接上新的刷题"""
+import datetime
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from objects.importer import import_file
+from objects.item import Item
+from objects.workspaces import Workspace
+
+HEADER = "leetcode_id,leetcode_url,date,difficulty,time_cost,times,tag\n"
+
+
+class ImportMergeTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.dir)
+        self.workspace = Workspace(self.dir)
+
+    def import_csv(self, rows: str):
+        path = self.dir / "attempts.csv"
+        path.write_text(HEADER + rows, encoding="utf-8")
+        return import_file(str(path), self.workspace.store, self.workspace.classifier, workers=1)
+
+    def test_latest_attempt_wins_for_new_problem(self):
+        report = self.import_csv("100,u,2025-03-02,2,8:00,2,贪心\n"
+                                 "100,u,2025-01-02,2,15:00,1,贪心\n"
+                                 "101,u,2025-01-05,1,3:00,,双指针\n")
+        self.assertEqual((report.imported, report.merged, report.duplicates), (2, 1, 0))
+        item = self.workspace.items.get(100)
+        self.assertEqual((item.date, item.time_cost, item.times), (datetime.date(2025, 3, 2), "8:00", 2))
+        self.assertEqual(self.workspace.items.get(101).times, 1)
+
+    def test_newer_attempts_update_existing_problem(self):
+        existing = Item(100, {"date": datetime.date(2025, 2, 1), "difficulty": "2", "time_cost": "20:00",
+                              "times": 3, "tag": "贪心"}, leetcode_url="u")
+        self.workspace.items.add(existing)
+        self.workspace.store.append(existing)
+        report = self.import_csv("100,u,2025-01-02,2,15:00,1,贪心\n"  # 比题库旧：已经记过
+                                 "100,u,2025-03-02,2,12:00,,贪心\n"
+                                 "100,u,2025-03-09,2,9:00,,动态规划\n")
+        self.assertEqual((report.imported, report.merged, report.duplicates), (0, 2, 1))
+        item = self.workspace.items.get(100)
+        self.assertEqual((item.date, item.time_cost, item.times, item.tag),
+                         (datetime.date(2025, 3, 9), "9:00", 5, "动态规划"))
+        self.assertEqual(len(self.workspace.items), 1)
+        # 监听者看到了每一次刷题
+        self.assertEqual([seconds for _, seconds in self.workspace.history.get(100).attempts()], [1200, 720, 540])
+        self.assertEqual(self.workspace.scheduler.state(100).times, 5)
+        self.assertEqual(self.workspace.classifier.data["problem_to_categories"]["100"], {"动态规划"})
+
+        self.workspace.store._close_journal()  # 不压缩，重新加载看日志里写了什么
+        reopened = Workspace(self.dir, read_only=True)
+        self.assertEqual(reopened.items.get(100).to_dict(), item.to_dict())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+"""旧数据的字段类型：刷题次数是字符串、null、小数时照样能加载"""
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from objects.item import Item
+from objects.item_columns import ItemColumns
+from objects.journal_store import JournalStore
+
+LEGACY_ROWS = [
+    {"leetcode_id": 1, "leetcode_url": "u1", "meta": {"date": "2025-03-01", "difficulty": 2, "time_cost": "5:00",
+                                                      "times": "3", "tag": "贪心"}},
+    {"leetcode_id": 2, "leetcode_url": "u2", "meta": {"date": "2025-3-2", "difficulty": "1", "time_cost": 7,
+                                                      "times": None, "tag": None}},
+    {"leetcode_id": 3, "leetcode_url": "u3", "meta": {"date": "2025-03-03", "difficulty": "Unknown",
+                                                      "time_cost": "1:30", "times": 2.0}},
+    {"leetcode_id": 4, "leetcode_url": "u4", "meta": {"date": "2025-03-04", "difficulty": "3", "time_cost": "0:00",
+                                                      "times": "abc", "tag": "二叉树"}},
+]
+
+
+class LegacyTypesTest(unittest.TestCase):
+    def test_columns_and_items_agree(self):
+        expected = [Item.from_dict(row).to_dict() for row in LEGACY_ROWS]
+        self.assertEqual([row["meta"]["times"] for row in expected], [3, 0, 2, 0])
+        self.assertEqual(ItemColumns.from_dicts(LEGACY_ROWS).to_dicts(), expected)
+
+    def test_store_loads_legacy_file(self):
+        directory = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, directory)
+        path = directory / "leetcode_list.json"
+        path.write_text(json.dumps(LEGACY_ROWS, ensure_ascii=False), encoding="utf-8")
+        for _ in range(2):  # 第一次解析JSON，第二次读缓存
+            items = JournalStore(path).load()
+            self.assertEqual([item.times for item in items], [3, 0, 2, 0])
+            item = items.get(1)
+            items.update(item, {"times": item.times + 1})
+            self.assertEqual(item.times, 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,133 @@
+"""日志存储的崩溃恢复：进程在任意时刻被杀，重新加载后数据都一致"""
+import datetime
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+import xiaobai
+from objects.item import Item
+from objects.journal_store import JournalStore
+
+
+def make_item(leetcode_id: int, time_cost: str = "5:00", times: int = 1) -> Item:
+    return Item(leetcode_id, {"date": datetime.date(2025, 3, 1), "difficulty": "2", "time_cost": time_cost,
+                              "times": times, "tag": "贪心"}, leetcode_url=f"https://leetcode.cn/problems/p{leetcode_id}/")
+
+
+def snapshot(items) -> list[dict]:
+    return [item.to_dict() for item in items]
+
+
+class JournalStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.dir)
+        self.path = self.dir / "leetcode_list.json"
+        self.path.write_text("[]", encoding="utf-8")
+
+    def open_store(self) -> JournalStore:
+        store = JournalStore(self.path)
+        store.load()
+        return store
+
+    def crash(self, store: JournalStore) -> None:
+        """模拟进程被杀：不 close()，只放掉文件句柄"""
+        store._close_journal()
+
+    def test_replay_after_crash(self):
+        store = self.open_store()
+        for leetcode_id in (1, 2, 3):
+            item = make_item(leetcode_id)
+            store.items.add(item)
+            store.append(item)
+        updated = store.items.get(2)
+        store.items.update(updated, {"time_cost": "3:00", "times": 2})
+        store.append(updated)
+        expected = snapshot(store.items)
+        self.crash(store)
+
+        self.assertEqual(snapshot(self.open_store().items), expected)
+
+    def test_torn_tail_is_ignored(self):
+        store = self.open_store()
+        for leetcode_id in (1, 2):
+            item = make_item(leetcode_id)
+            store.items.add(item)
+            store.append(item)
+        expected = snapshot(store.items)
+        self.crash(store)
+        line = json.dumps({"op": "put", "item": make_item(3).to_dict()}, ensure_ascii=False)
+        with open(store.journal_path, "a", encoding="utf-8") as f:
+            f.write(line[:len(line) // 2])  # 写到一半被杀
+
+        reopened = self.open_store()
+        self.assertEqual(snapshot(reopened.items), expected)
+        # 截断的半行之后还能继续追加
+        item = make_item(4)
+        reopened.items.add(item)
+        reopened.append(item)
+        expected = snapshot(reopened.items)
+        self.crash(reopened)
+        self.assertEqual(snapshot(self.open_store().items), expected)
+
+    def test_crash_before_snapshot_written(self):
+        """压缩时日志已改名为旧日志，新快照还没写就被杀"""
+        store = self.open_store()
+        for leetcode_id in (1, 2):
+            item = make_item(leetcode_id)
+            store.items.add(item)
+            store.append(item)
+        expected = snapshot(store.items)
+        self.crash(store)
+        store.journal_path.replace(store.pending_path)
+
+        reopened = self.open_store()
+        self.assertEqual(snapshot(reopened.items), expected)
+        self.assertFalse(reopened.pending_path.exists())  # 遗留的旧日志已合并进快照
+        # 快照和 save_items_to_json 一样是 indent=4 的JSON
+        self.assertEqual(self.path.read_text(encoding="utf-8"), json.dumps(expected, ensure_ascii=False, indent=4))
+
+    def test_crash_after_snapshot_before_pending_removed(self):
+        """新快照已经写好，旧日志还没删掉就被杀：旧日志重放一遍不能产生重复"""
+        store = self.open_store()
+        for leetcode_id in (1, 2):
+            item = make_item(leetcode_id)
+            store.items.add(item)
+            store.append(item)
+        updated = store.items.get(1)
+        store.items.update(updated, {"times": 2})
+        store.append(updated)
+        journal = store.journal_path.read_bytes()
+        store.compact()
+        store.pending_path.write_bytes(journal)
+        # 崩溃前压缩之后又追加了新日志
+        item = make_item(3)
+        store.items.add(item)
+        store.append(item)
+        expected = snapshot(store.items)
+        self.crash(store)
+
+        reopened = self.open_store()
+        self.assertEqual(snapshot(reopened.items), expected)
+        self.assertFalse(reopened.pending_path.exists())
+        reopened.close()
+        self.assertEqual(snapshot(self.open_store().items), expected)
+
+    def test_menu_rejects_duplicate_id(self):
+        """菜单添加已有题号会被拒绝，否则重放时按题号覆盖会丢掉原来那条"""
+        store = self.open_store()
+        item = make_item(1)
+        store.items.add(item)
+        store.append(item)
+        classifier = mock.Mock()
+        answers = iter(["2025-03-02", "1"])
+        with mock.patch("builtins.input", lambda prompt="": next(answers)), mock.patch("builtins.print"):
+            self.assertIsNone(xiaobai.add_new_item(store.items, classifier))
+        self.assertEqual(len(store.items), 1)
+        classifier.add_problem_to_category.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+"""性能剖析：操作耗时扣掉等待输入的时间、写入字节数统计"""
+import builtins
+import shutil
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+from objects import fileio, profiler
+from objects.attempt_history import AttemptHistory
+from objects.item import Item
+from objects.item_store import ItemStore
+
+
+class ProfilerTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.dir)
+
+    def enable(self) -> profiler.Profiler:
+        active = profiler.enable(str(self.dir / "profile"))
+        self.addCleanup(profiler.disable)
+        return active
+
+    def test_input_wait_is_not_part_of_operation(self):
+        def slow_input(prompt=""):
+            time.sleep(0.2)
+            return "1"
+
+        with mock.patch.object(builtins, "input", slow_input):
+            active = self.enable()
+            with profiler.operation("menu.test"):
+                self.assertEqual(input("?"), "1")
+            profiler.disable()
+            self.assertIs(builtins.input, slow_input)
+        self.assertLess(active.stats["menu.test"].seconds, 0.1)
+        self.assertEqual(active.stats["input"].calls, 1)
+        self.assertGreaterEqual(active.stats["input"].seconds, 0.2)
+
+    def test_counts_bytes_from_atomic_open_and_history(self):
+        active = self.enable()
+        with fileio.atomic_open(self.dir / "out.csv") as f:
+            f.write("a,b\n1,2\n")
+        self.assertEqual(active.stats["fileio.atomic_open"].bytes, 8)
+
+        history = AttemptHistory(self.dir / "history.bin", ItemStore())
+        history.record(Item(1, {"time_cost": "10:00", "times": 1}, "https://leetcode.cn/problems/x/"))
+        pending = len(history._pending)
+        history.save()
+        self.assertEqual(active.stats["AttemptHistory.save"].bytes, pending)
+
+
+if __name__ == "__main__":
+    unittest.main()
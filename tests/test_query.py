@@ -0,0 +1,55 @@
+"""题目查询和表格输出"""
+import io
+import unittest
+from objects.item import Item
+from objects.item_store import ItemStore
+from objects.query import TableWriter, parse_query
+
+
+def make_item(leetcode_id: int, date: str, difficulty, time_cost, tag: str = "贪心") -> Item:
+    return Item.from_dict({"leetcode_id": leetcode_id, "leetcode_url": f"https://leetcode.cn/problems/p{leetcode_id}/",
+                           "meta": {"date": date, "difficulty": difficulty, "time_cost": time_cost, "times": 1,
+                                    "tag": tag}})
+
+
+class TableWriterTest(unittest.TestCase):
+    def test_numeric_fields_from_json(self):
+        """JSON 里难易度/耗时存成数字（如 "difficulty": 2）时也能打印"""
+        out = io.StringIO()
+        with TableWriter(out) as table:
+            table.write(make_item(1, "2025-03-01", 2, 7))
+            table.write(make_item(2, "2025-03-02", "3", "12:30", tag=None))
+        lines = out.getvalue().splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertEqual(lines[1].split()[:5], ["1", "2025-03-01", "2", "7", "1"])
+        self.assertEqual(lines[2].split()[:6], ["2", "2025-03-02", "3", "12:30", "1", "None"])
+
+
+class QueryTest(unittest.TestCase):
+    def setUp(self):
+        self.items = ItemStore([
+            make_item(1, "2025-03-03", "1", "5:00"),
+            make_item(2, "2025-03-01", "2", "20:00", tag="二叉树"),
+            make_item(3, "2025-03-02", "2", "10:00"),
+            make_item(4, "2025-03-01", "3", "0:00"),
+        ])
+
+    def ids(self, *tokens) -> list[int]:
+        return [item.leetcode_id for item in parse_query(tokens).run(self.items)]
+
+    def test_filters_sort_and_paging(self):
+        self.assertEqual(self.ids("tag=贪心"), [1, 3, 4])
+        self.assertEqual(self.ids("sort=-date"), [1, 3, 2, 4])  # 同一天按原列表顺序
+        self.assertEqual(self.ids("sort=date", "offset=1", "limit=2"), [4, 3])
+        self.assertEqual(self.ids("difficulty=2,3", "sort=-time"), [2, 3, 4])
+        self.assertEqual(self.ids("min_time=1"), [1, 2, 3])  # 耗时未知的题不算
+        self.assertEqual(self.ids("since=2025-03-02", "until=2025-03-03"), [3, 1])  # 走日期索引，按日期
+
+    def test_bad_conditions(self):
+        for tokens in (["tag"], ["color=red"], ["limit=-1"], ["sort=name"], ["since=yesterday"]):
+            with self.assertRaises(ValueError):
+                parse_query(tokens)
+
+
+if __name__ == "__main__":
+    unittest.main()
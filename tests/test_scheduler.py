@@ -0,0 +1,98 @@
+"""复习计划：堆查询与暴力筛选一致、启动时补记复习"""
+import datetime
+import random
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from objects.item import Item
+from objects.item_store import ItemStore
+from objects.scheduler import ReviewState, Scheduler, review_quality
+
+START = datetime.date(2025, 1, 1)
+
+
+def make_item(leetcode_id: int, rng: random.Random) -> Item:
+    return Item(leetcode_id, {
+        "date": START + datetime.timedelta(days=rng.randrange(60)),
+        "difficulty": str(rng.randint(1, 3)),
+        "time_cost": f"{rng.randrange(40)}:{rng.randrange(60):02d}",
+        "times": rng.randint(1, 3),
+        "tag": "贪心",
+    }, f"https://leetcode.cn/problems/p{leetcode_id}/")
+
+
+def brute_force_due(scheduler: Scheduler, until: datetime.date, limit: int | None) -> list:
+    found = sorted((scheduler.state(item_id).due, item_id) for item_id in scheduler._states
+                   if scheduler.state(item_id).due <= until)
+    return found if limit is None else found[:limit]
+
+
+class SchedulerTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.dir)
+        self.rng = random.Random(7)
+        self.items = ItemStore(make_item(leetcode_id, self.rng) for leetcode_id in range(1, 201))
+        self.scheduler = Scheduler(self.dir / "schedule.json", self.items)
+
+    def rekey(self, count: int, distinct: bool = False) -> None:
+        """随机挑题再刷一次，每次都会往堆里压一个新条目"""
+        if distinct:
+            leetcode_ids = self.rng.sample(range(1, 201), count)
+        else:
+            leetcode_ids = [self.rng.randint(1, 200) for _ in range(count)]
+        for leetcode_id in leetcode_ids:
+            item = self.items.get(leetcode_id)
+            self.items.update(item, {
+                "date": item.date + datetime.timedelta(days=self.rng.randrange(30)),
+                "time_cost": f"{self.rng.randrange(40)}:00",
+                "times": item.times + 1,
+            })
+
+    def assert_due_matches(self) -> None:
+        for _ in range(30):
+            until = START + datetime.timedelta(days=self.rng.randrange(-5, 400))
+            limit = self.rng.choice([None, 0, 1, 5, 50, 500])
+            self.assertEqual(self.scheduler.due(until, limit), brute_force_due(self.scheduler, until, limit),
+                             (until, limit))
+
+    def test_due_matches_brute_force(self):
+        self.assert_due_matches()
+        rebuilt = False
+        for _ in range(10):
+            heap_size = len(self.scheduler._heap)
+            self.rekey(100)
+            rebuilt |= len(self.scheduler._heap) < heap_size + 100
+            self.assert_due_matches()
+        self.assertTrue(rebuilt)  # 过期条目多了会自动重建堆
+        self.scheduler._rebuild_heap()
+        self.assert_due_matches()
+
+    def test_first_record_replays_all_times(self):
+        item = make_item(500, self.rng)
+        item.meta["times"] = 4
+        state = self.scheduler.record(item)
+
+        expected = ReviewState(item.date_ordinal, 0)
+        for _ in range(4):
+            expected.review(review_quality(item.time_cost_in_seconds()), item.date_ordinal)
+        self.assertEqual(state.to_list(), expected.to_list())
+        # 刷题次数没有增加就不算新的复习
+        self.assertIs(self.scheduler.record(item), state)
+        self.assertEqual(state.to_list(), expected.to_list())
+
+    def test_startup_catches_up_unsaved_reviews(self):
+        self.rekey(50)
+        self.scheduler.save()
+        # 退出前没保存（每道题只刷一次：补记只知道最近一次的耗时）
+        self.rekey(50, distinct=True)
+        reopened = Scheduler(self.dir / "schedule.json", self.items)
+        self.assertEqual({item_id: state.to_list() for item_id, state in reopened._states.items()},
+                         {item_id: state.to_list() for item_id, state in self.scheduler._states.items()})
+        until = START + datetime.timedelta(days=400)
+        self.assertEqual(reopened.due(until), self.scheduler.due(until))
+
+
+if __name__ == "__main__":
+    unittest.main()
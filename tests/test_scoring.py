@@ -0,0 +1,86 @@
+"""打分：向量化实现、纯 Python 实现和最初的逐题公式结果完全一致（包括 int/float 类型）"""
+import datetime
+import os
+import random
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+from objects import recommender, scoring
+from objects.item import Item
+from objects.leetcode_classify import LeetCodeClassify
+
+
+def original_problem_score(item: Item):
+    time_score = min(item.time_cost_in_seconds() / 1800 * 5, 5)
+    days_old = (datetime.date.today() - item.date).days
+    date_score = min(days_old / 30 * 5, 5)
+    return round(time_score + date_score, 2)
+
+
+def original_tag_scores(items: list[Item], category_to_problems: dict) -> dict:
+    scores = {}
+    for tag, problem_ids in category_to_problems.items():
+        tag_items = [item for item in items if item.leetcode_id in problem_ids]
+        if not tag_items:
+            continue
+        avg_time = sum(item.time_cost_in_seconds() for item in tag_items) / len(tag_items)
+        days_old = (datetime.date.today() - min(item.date for item in tag_items)).days
+        time_score = min(avg_time / 1800 * 10, 10)
+        date_score = min(days_old / 30 * 10, 10)
+        scores[tag] = round((time_score + date_score) / 2, 2)
+    return scores
+
+
+def typed(values):
+    """连同类型一起比较：10 和 10.0 打印出来不一样"""
+    if isinstance(values, dict):
+        return [(key, type(value), value) for key, value in values.items()]
+    return [(type(value), value) for value in values]
+
+
+class ScoringTest(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(2)
+        today = datetime.date.today()
+        time_costs = [f"{rng.randint(0, 70)}:{rng.randint(0, 59):02d}" for _ in range(20)] + ["30:00", "bad", "7"]
+
+        def make_item(index: int) -> Item:
+            # 日期覆盖刚好30天（得分正好到上限）和更早的情况
+            date = today - datetime.timedelta(days=rng.choice([0, 1, 29, 30, 31, rng.randint(0, 400)]))
+            return Item(index % 900, {"date": date, "difficulty": "2", "time_cost": rng.choice(time_costs),
+                                      "times": 1, "tag": "x"}, "u")
+
+        self.items = [make_item(index) for index in range(1000)]
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir)
+        self.classifier = LeetCodeClassify(os.path.join(self.dir, "classification.json"))
+        categories = self.classifier.data["category_to_problems"]
+        for _ in range(2000):
+            categories.setdefault(f"t{rng.randint(0, 60)}", set()).add(rng.randint(0, 1000))
+        categories["empty"] = {5000}
+
+    def check_against_original(self):
+        expected = [original_problem_score(item) for item in self.items]
+        self.assertEqual(typed(recommender.score_items(self.items)), typed(expected))
+        expected_tags = original_tag_scores(self.items, self.classifier.data["category_to_problems"])
+        tag_scores = self.classifier.calculate_tag_scores(self.items)
+        self.assertEqual(typed(tag_scores), typed(expected_tags))
+
+    def test_python_fallback_matches_original(self):
+        with mock.patch.object(scoring, "HAVE_NUMPY", False):
+            self.check_against_original()
+
+    @unittest.skipUnless(scoring.HAVE_NUMPY, "没有安装 NumPy")
+    def test_numpy_matches_original(self):
+        self.check_against_original()
+
+    @unittest.skipUnless(scoring.HAVE_NUMPY, "没有安装 NumPy")
+    def test_capped_score_is_int(self):
+        today = datetime.date(2025, 6, 1)
+        old = (today - datetime.timedelta(days=400)).toordinal()
+        self.assertEqual(typed(scoring.problem_scores([4000, 1800], [old, old], today)), [(int, 10), (float, 10.0)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+"""服务模式的写接口：参数校验、写日志失败后的重试"""
+import asyncio
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+from objects.journal_store import JournalStore
+from objects.server import XiaobaiService
+from objects.workspaces import Workspace
+
+
+class ServerWriteTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.dir)
+        self.workspace = Workspace(self.dir)
+        self.service = XiaobaiService(self.workspace.items, self.workspace.classifier, self.workspace.store,
+                                      self.workspace.scheduler, self.workspace.history, flush_interval=60)
+
+    def run_requests(self, *requests) -> list:
+        async def run():
+            await self.service.start()
+            try:
+                return [await self.service.dispatch(method, target, json.dumps(body).encode())
+                        for method, target, body in requests]
+            finally:
+                await self.service.stop()
+        return asyncio.run(run())
+
+    def reopen(self) -> dict:
+        self.workspace.store._close_journal()  # 不压缩，只看日志里写了什么
+        store = JournalStore(self.dir / "leetcode_list.json", read_only=True)
+        return {item.leetcode_id: item for item in store.load()}
+
+    def test_update_rejects_bad_fields(self):
+        add = {"leetcode_id": 30, "date": "2025-03-01", "difficulty": "2", "time_cost": "5:00", "tag": "贪心"}
+        results = self.run_requests(
+            ("POST", "/items", add),
+            ("POST", "/items/30", {"time_cost": "abc"}),
+            ("POST", "/items/30", {"difficulty": "9"}),
+            ("POST", "/items", dict(add, leetcode_id=31, time_cost="1:2:3")),
+        )
+        self.assertEqual([status for status, _ in results], [201, 400, 400, 400])
+        item = self.workspace.items.get(30)
+        self.assertEqual((item.time_cost, item.difficulty, item.times), ("5:00", "2", 1))
+        self.assertEqual(self.reopen()[30].time_cost, "5:00")
+
+    def test_failed_append_is_retried(self):
+        add = {"leetcode_id": 30, "date": "2025-03-01", "difficulty": "2", "time_cost": "5:00", "tag": "贪心"}
+        append_many = self.workspace.store.append_many
+        calls = []
+
+        def flaky_append(items):
+            calls.append([item.leetcode_id for item in items])
+            if len(calls) == 1:
+                raise OSError("磁盘已满")
+            append_many(items)
+
+        with mock.patch.object(self.workspace.store, "append_many", flaky_append):
+            results = self.run_requests(
+                ("POST", "/items", add),
+                ("POST", "/items", dict(add, leetcode_id=31)),
+            )
+        self.assertEqual([status for status, _ in results], [500, 201])
+        self.assertEqual(calls, [[30], [30, 31]])
+        self.assertEqual(sorted(self.reopen()), [30, 31])
+
+    def test_failed_flush_is_retried(self):
+        self.service.flush_interval = 0.05
+        add = {"leetcode_id": 30, "date": "2025-03-01", "difficulty": "2", "time_cost": "5:00", "tag": "贪心"}
+        save = self.workspace.scheduler.save
+        calls = []
+
+        def flaky_save():
+            calls.append(len(self.workspace.scheduler))
+            if len(calls) == 1:
+                raise OSError("磁盘已满")
+            save()
+
+        async def run():
+            await self.service.start()
+            try:
+                first = await self.service.dispatch("POST", "/items", json.dumps(add).encode())
+                await asyncio.sleep(0.2)  # 写入任务定时重试
+                second = await asyncio.wait_for(self.service.dispatch(
+                    "POST", "/items", json.dumps(dict(add, leetcode_id=31)).encode()), 5)
+                return [first[0], second[0]]
+            finally:
+                await self.service.stop()
+
+        with mock.patch.object(self.workspace.scheduler, "save", flaky_save), mock.patch("sys.stderr"):
+            self.assertEqual(asyncio.run(run()), [201, 201])
+        self.assertEqual(self.service.flush_errors, 1)
+        self.assertGreaterEqual(len(calls), 3)
+        schedule = json.loads((self.dir / "schedule.json").read_text(encoding="utf-8"))
+        self.assertEqual(sorted(schedule["states"]), ["30", "31"])
+
+
+if __name__ == "__main__":
+    unittest.main()
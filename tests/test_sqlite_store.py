@@ -0,0 +1,72 @@
+"""SQLite 后端：从 JSON 迁移、tag统计下推到SQL、只读打开"""
+import datetime
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from benchmarks.generate import generate
+from objects.journal_store import JournalStore
+from objects.leetcode_classify import LeetCodeClassify
+from objects.sqlite_store import SqliteStore
+from objects.workspaces import Workspace
+
+
+class SqliteStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.root = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.root)
+        self.json_dir = self.root / "json"
+        self.sqlite_dir = self.root / "sqlite"
+        generate(self.json_dir, items=500, tags=20)
+        shutil.copytree(self.json_dir, self.sqlite_dir)
+        (self.sqlite_dir / "config.json").write_text('{"backend": "sqlite"}', encoding="utf-8")
+
+    def open(self, directory: Path, read_only: bool = False) -> Workspace:
+        workspace = Workspace(directory, read_only=read_only)
+        self.addCleanup(workspace.store.close)
+        return workspace
+
+    def test_migrates_json_files(self):
+        store = SqliteStore(self.sqlite_dir / "xiaobai.db", json_path=self.sqlite_dir / "leetcode_list.json",
+                            classification_path=self.sqlite_dir / "classification.json")
+        self.addCleanup(store.close)
+        expected = [item.to_dict() for item in JournalStore(self.json_dir / "leetcode_list.json").load()]
+        self.assertEqual([item.to_dict() for item in store.load()], expected)
+        classification = LeetCodeClassify(self.json_dir / "classification.json").data
+        self.assertEqual(store.load_classification(), classification)
+
+    def test_tag_stats_pushdown_matches_json_backend(self):
+        json_workspace = self.open(self.json_dir)
+        sqlite_workspace = self.open(self.sqlite_dir)
+        self.assertIsInstance(sqlite_workspace.store, SqliteStore)
+        self.assertEqual(sqlite_workspace.classifier.tag_stats(), json_workspace.classifier.tag_stats())
+        self.assertEqual(sqlite_workspace.classifier.calculate_tag_scores(),
+                         json_workspace.classifier.calculate_tag_scores())
+
+        # 同样的修改之后（结果缓存要按数据库版本失效）仍然一致
+        today = datetime.date.today()
+        for workspace in (json_workspace, sqlite_workspace):
+            for leetcode_id in (1, 2, 3):
+                item = workspace.items.get(leetcode_id)
+                workspace.items.update(item, {"date": today, "time_cost": "45:00", "times": item.times + 1})
+                workspace.store.append(item)
+            workspace.classifier.update_problem_categories(1, ["tag0"])
+        self.assertEqual(sqlite_workspace.classifier.tag_stats(), json_workspace.classifier.tag_stats())
+        self.assertEqual(sqlite_workspace.classifier.calculate_tag_scores(),
+                         json_workspace.classifier.calculate_tag_scores())
+
+    def test_read_only_without_database_migrates_in_memory(self):
+        before = sorted(path.name for path in self.sqlite_dir.iterdir())
+        workspace = Workspace(self.sqlite_dir, read_only=True)
+        self.assertIsInstance(workspace.store, SqliteStore)
+        self.assertEqual(len(workspace.items), 500)
+        self.assertEqual(workspace.classifier.calculate_tag_scores(),
+                         self.open(self.json_dir).classifier.calculate_tag_scores())
+        workspace.close()
+        self.assertEqual(sorted(path.name for path in self.sqlite_dir.iterdir()), before)
+        self.assertFalse((self.sqlite_dir / "xiaobai.db").exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,39 @@
+"""tag增量统计：最旧日期始终正确，堆的大小不随修改次数增长"""
+import random
+import unittest
+from objects.leetcode_classify import _TagAggregate
+
+
+class TagAggregateTest(unittest.TestCase):
+    def test_heap_stays_bounded_under_updates(self):
+        rng = random.Random(1)
+        aggregate = _TagAggregate()
+        live = []
+        for step in range(20000):
+            if live and rng.random() < 0.5:
+                date_ord = live.pop(rng.randrange(len(live)))
+                aggregate.remove(60, date_ord)
+            else:
+                date_ord = rng.randrange(1000)
+                live.append(date_ord)
+                aggregate.add(60, date_ord)
+            if live and step % 7 == 0:
+                self.assertEqual(aggregate.oldest_date(), min(live))
+            self.assertLessEqual(len(aggregate._dates), 2 * len(live) + 1)
+        self.assertEqual(aggregate.count, len(live))
+        self.assertEqual(aggregate.total_seconds, 60 * len(live))
+
+    def test_update_same_item_repeatedly(self):
+        """serve 里反复更新同一道题：每次都是 remove 旧日期 + add 新日期"""
+        aggregate = _TagAggregate()
+        aggregate.add(60, 100)
+        aggregate.add(60, 50)
+        for day in range(101, 10000):
+            aggregate.remove(60, day - 1)
+            aggregate.add(60, day)
+        self.assertEqual(aggregate.oldest_date(), 50)
+        self.assertLessEqual(len(aggregate._dates), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
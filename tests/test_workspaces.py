@@ -0,0 +1,59 @@
+"""batch 只读用户数据：处理前后用户目录里的文件完全不变"""
+import datetime
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from objects.item import Item
+from objects.workspaces import Workspace, run_batch
+
+
+def listing(directory: Path) -> dict:
+    """
+    目录里每个文件的 (mtime, 内容)。SQLite 只读连接打开 WAL 数据库时会建 -shm/-wal 共享索引文件
+    （不含数据，和正在写的进程同时读就靠它们协调），不算在内
+    """
+    return {path.relative_to(directory).as_posix(): (path.stat().st_mtime_ns, path.read_bytes())
+            for path in sorted(directory.rglob("*"))
+            if path.is_file() and not path.name.endswith(("-shm", "-wal"))}
+
+
+class ReadOnlyBatchTest(unittest.TestCase):
+    def setUp(self):
+        self.root = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.root)
+        self.users = self.root / "users"
+        today = datetime.date.today()
+        rows = [Item(leetcode_id, {"date": today - datetime.timedelta(days=leetcode_id), "difficulty": "2",
+                                   "time_cost": "10:00", "times": 1, "tag": "贪心"}, leetcode_url="u").to_dict()
+                for leetcode_id in range(1, 6)]
+
+        (self.users / "empty").mkdir(parents=True)
+        # 只有题目列表：没有分类文件、缓存、历史
+        (self.users / "json_only").mkdir()
+        (self.users / "json_only" / "leetcode_list.json").write_text(json.dumps(rows), encoding="utf-8")
+        # SQLite 后端，数据库还没建（数据还在 JSON 里）
+        (self.users / "sqlite_new").mkdir()
+        (self.users / "sqlite_new" / "config.json").write_text('{"backend": "sqlite"}', encoding="utf-8")
+        (self.users / "sqlite_new" / "leetcode_list.json").write_text(json.dumps(rows), encoding="utf-8")
+        # SQLite 后端，数据库已存在
+        (self.users / "sqlite").mkdir()
+        (self.users / "sqlite" / "config.json").write_text('{"backend": "sqlite"}', encoding="utf-8")
+        (self.users / "sqlite" / "leetcode_list.json").write_text(json.dumps(rows), encoding="utf-8")
+        workspace = Workspace(self.users / "sqlite")
+        workspace.close()
+
+    def test_batch_does_not_write_user_data(self):
+        before = listing(self.users)
+        results = list(run_batch(str(self.root), str(self.root / "reports"), workers=1))
+        self.assertEqual(sorted((user, error) for user, _, error in results),
+                         [(user, None) for user in ("empty", "json_only", "sqlite", "sqlite_new")])
+        self.assertEqual(listing(self.users), before)
+        for user in ("json_only", "sqlite", "sqlite_new"):
+            report = json.loads((self.root / "reports" / user / "recommendations.json").read_text(encoding="utf-8"))
+            self.assertEqual(len(report["problems"]), 3, user)
+
+
+if __name__ == "__main__":
+    unittest.main()
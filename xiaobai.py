@@ -1,14 +1,28 @@
+import argparse
+import asyncio
 import json
 import datetime
+import heapq
 import random
 import os
+import time
+from objects import profiler, scoring
+from objects.attempt_history import AttemptHistory
 from objects.item import Item
+from objects.importer import import_file
+from objects.item_store import ItemStore
 from objects.leetcode_classify import LeetCodeClassify
+from objects.query import FORMATS, TableWriter, parse_query, write_items
+from objects.recommender import plan_days, recommend
+from objects.scheduler import Scheduler
+from objects.server import XiaobaiService, serve
+from objects.fileio import atomic_write_json
+from objects.storage import BACKENDS
+from objects.workspaces import Workspace, run_batch, user_data_dir
 
-# 将Item对象列表保存到JSON文件
+# 将Item对象列表保存到JSON文件（原子写入）
 def save_items_to_json(items, filename):
-    with open(filename, 'w', encoding='utf-8') as f:
-        json.dump([item.to_dict() for item in items], f, ensure_ascii=False, indent=4)
+    atomic_write_json(filename, [item.to_dict() for item in items], indent=4)
 
 # 从JSON文件读取数据并转换为Item对象列表
 def load_items_from_json(filename):
@@ -20,6 +34,10 @@ def load_items_from_json(filename):
 def add_new_item(items, leetcode_classifier):
     date_str = input("请输入日期（格式 YYYY-MM-DD):")
     leetcode_id = int(input("请输入leetcode题号:"))
+    # 日志记录按题号覆盖写入，重复题号重放后会丢掉原来那条，所以已有的题只能走"更新"
+    if items.get(leetcode_id) is not None:
+        print(f"题号 {leetcode_id} 已存在，请用 2 更新已刷的题")
+        return None
     leetcode_url = input("请输入leetcode题号对应的url:")
     difficulty = input("请输入难易度(1-easy, 2-medium, 3-hard):")
     time_cost = input("请输入刷题耗时(min:sec):")
@@ -39,16 +57,17 @@ def add_new_item(items, leetcode_classifier):
         "tag": tag
     }
     new_item = Item(leetcode_id, new_meta, leetcode_url =leetcode_url) 
-    items.append(new_item)
+    items.add(new_item)
     leetcode_classifier.add_problem_to_category(leetcode_id, tag)
     print(f"新条目已添加:{new_item}")
+    return new_item
 
 # 根据题号更新Item信息
-def update_item_by_id(items, leetcode_classifier):
+def update_item_by_id(items: ItemStore, leetcode_classifier, history: AttemptHistory | None = None):
     leetcode_id = int(input("请输入要更新的题号："))
     
     # 查找是否存在该题号的Item
-    item_to_update = next((item for item in items if item.leetcode_id == leetcode_id), None)
+    item_to_update = items.get(leetcode_id)
     
     if item_to_update:
         print(f"找到题目: {item_to_update}")
@@ -56,7 +75,7 @@ def update_item_by_id(items, leetcode_classifier):
         difficulty = input(f"请输入新的难易度(1-easy, 2-medium, 3-hard) 当前难易度:{item_to_update.difficulty}):")
         time_cost = input(f"请输入刷题耗时(min:sec) 当前耗时: {item_to_update.time_cost}):")
         tag = input(f"请输入题目tag类型(贪心/双指针/二叉树...) 当前tag类型: {item_to_update.tag}):")
-        new_meta = item_to_update.meta
+        new_meta = {}
         
         # 更新Item信息
         if date_str:
@@ -70,23 +89,27 @@ def update_item_by_id(items, leetcode_classifier):
             new_meta["difficulty"] = difficulty
         if time_cost:
             new_meta["time_cost"] = time_cost
-        new_meta["times"] += 1
+        new_meta["times"] = item_to_update.times + 1
         if tag:
             new_meta["tag"] = tag
             leetcode_classifier.update_problem_categories(leetcode_id, [tag])
-        item_to_update.meta = new_meta
+        items.update(item_to_update, new_meta)
         print(f"对应题号信息已更新: {item_to_update}")
+        log = history.get(leetcode_id) if history is not None else None
+        if log is not None:
+            print(f"刷题历史: {log}")
     else:
         print("未找到对应的题号。")
+    return item_to_update
 
 # 按时间成本和日期排序并返回第一个Item
 def get_item_sorted_by_date_and_time_cost(items, leetcode_classifier):
     # 按日期排序，再按时间成本排序    
     # Select a random number between 1 and 4
     random_number = random.randint(2, 5)
-    sorted_items = sorted(items, key=lambda item: (item.times, item.date, item.time_cost_in_seconds()))
+    sorted_items = heapq.nsmallest(random_number, items, key=lambda item: (item.times, item.date_ordinal, item.time_cost_in_seconds()))
     # print(sorted_items[0].tag, sorted_items[0].leetcode_id)
-    l = leetcode_classifier.get_related_problems(sorted_items[0].leetcode_id, sorted_items[0].tag)
+    l = leetcode_classifier.get_related_problems(sorted_items[0].leetcode_id, sorted_items[0].tag, exclude_self=False)
     print(f"今天要刷的题有:")
 
     if len(l) > 0:
@@ -97,93 +120,247 @@ def get_item_sorted_by_date_and_time_cost(items, leetcode_classifier):
             print(f"{i.leetcode_id}\t")
 
 # 添加题目得分计算函数
-def calculate_problem_score(item: Item) -> float:
-    """计算单个题目的推荐得分（0-10）"""
-    time_score = min(item.time_cost_in_seconds() / 1800 * 5, 5)  # 耗时占5分
-    days_old = (datetime.date.today() - item.date).days
-    date_score = min(days_old / 30 * 5, 5)  # 旧时间占5分
-    return round(time_score + date_score, 2)
+def calculate_problem_score(item: Item, history: AttemptHistory | None = None) -> float:
+    """计算单个题目的推荐得分（0-10），给出刷题历史时耗时用历史的加权平均"""
+    seconds = history.effective_seconds(item) if history is not None else item.time_cost_in_seconds()
+    return scoring.problem_score(seconds, item.date_ordinal, datetime.date.today().toordinal())
 
 # 替换原有的get_item_sorted_by_date_and_time_cost函数
-def get_recommended_problems(items: list[Item], leetcode_classifier: LeetCodeClassify):
-    # 计算所有标签得分
-    tag_scores = leetcode_classifier.calculate_tag_scores(items)
-    
-    if not tag_scores:
+def get_recommended_problems(items: ItemStore, leetcode_classifier: LeetCodeClassify,
+                             history: AttemptHistory | None = None):
+    # 选出得分最高的标签（并列时随机选一个），以及其中得分最高的3题
+    selected_tag, tag_score, ranked = recommend(items, leetcode_classifier, 3, history=history)
+
+    if selected_tag is None:
         print("暂无分类信息，随机推荐:")
-        random_items = random.sample(items, min(3, len(items)))
-        for item in random_items:
+        for _, item in ranked:
             print(f"题目ID：{item.leetcode_id}")
         return
-    
-    # 找到最高分标签
-    max_score = max(tag_scores.values())
-    max_tags = [tag for tag, score in tag_scores.items() if score == max_score]
-    selected_tag = random.choice(max_tags)  # 如果有多个，随机选一个
-    
-    # 获取该标签下所有题目并计算单个题目得分
-    problem_ids = leetcode_classifier.data["category_to_problems"][selected_tag]
-    tag_items = [item for item in items if item.leetcode_id in problem_ids]
-    sorted_items = sorted(tag_items, key=lambda x: calculate_problem_score(x), reverse=True)
-    
+
     # 推荐前3题或全部
-    print(f"推荐类型：{selected_tag}（得分：{tag_scores[selected_tag]}/10）")
-    for item in sorted_items[:3]:
-        print(f"题目ID：{item.leetcode_id}（得分：{calculate_problem_score(item)}）")
+    print(f"推荐类型：{selected_tag}（得分：{tag_score}/10）")
+    for score, item in ranked:
+        print(f"题目ID：{item.leetcode_id}（得分：{score}）")
+
+
+# 生成未来几天的刷题计划
+def print_study_plan(items: ItemStore, leetcode_classifier: LeetCodeClassify, history: AttemptHistory | None = None):
+    days = input("请输入要计划的天数(默认7):")
+    quota = input("请输入每天刷题数量(默认3):")
+    plans = plan_days(items, leetcode_classifier, int(days or 7), int(quota or 3), history=history)
+    if not plans:
+        print("暂无分类信息，无法生成计划")
+        return
+    print(f"未来{len(plans)}天的刷题计划:")
+    for plan in plans:
+        print(plan)
 
+# 查看到期需要复习的题（今天 / 本周）
+def print_due_reviews(scheduler: Scheduler):
+    today = datetime.date.today()
+    due_week = scheduler.due_this_week(today)
+    due_today = [(due, leetcode_id) for due, leetcode_id in due_week if due <= today]
+    print(f"今天需要复习的题有{len(due_today)}道:")
+    for due, leetcode_id in due_today:
+        print(f"{leetcode_id}\t{scheduler.state(leetcode_id)}")
+    print(f"本周之后几天还有{len(due_week) - len(due_today)}道题到期:")
+    for due, leetcode_id in due_week[len(due_today):]:
+        print(f"{leetcode_id}\t{scheduler.state(leetcode_id)}")
 
 # 修改后的当天题目显示函数
-def get_today_questions(items):
-    sorted_items = [x for x in items if x.date == datetime.datetime.now().date()]
+def get_today_questions(items: ItemStore, store=None):
+    today = datetime.datetime.now().date()
+    # 有存储后端时交给后端查询（SQLite 后端直接走 date 索引）
+    sorted_items = store.today_items(today) if store is not None else items.on_date(today)
     print(f"今天已经刷的题有{len(sorted_items)}道:")
-    for i in sorted_items:
-        print(f"|题目|\t |日期|\t\t|难度|\t |耗时|\t |次数|\t |类型|\t |链接|\t \n"
-            f" {i.leetcode_id}\t  {i.meta['date']}\t {i.meta['difficulty']}\t  {i.meta['time_cost']}\t  {i.meta['times']}\t   {i.meta['tag']}\t  {i.leetcode_url}")
+    with TableWriter() as table:
+        table.write_all(sorted_items)
+
+# 分页查看题目（可加筛选/排序条件，写法见 objects/query.py）
+PAGE_SIZE = 20
+
+def browse_items(items: ItemStore):
+    text = input("筛选条件（如 tag=贪心 difficulty=2 since=2025-01-01 sort=-date，直接回车查看全部）:")
+    try:
+        query = parse_query(text.split())
+    except ValueError as e:
+        print(e)
+        return
+    page_size = query.limit or PAGE_SIZE
+    offset = query.offset
+    while True:
+        page = list(query.run(items, offset, page_size + 1))  # 多取一条，判断还有没有下一页
+        with TableWriter() as table:
+            table.write_all(page[:page_size])
+        if not page:
+            print("没有符合条件的题目")
+        if len(page) <= page_size:
+            break
+        if input(f"第{offset // page_size + 1}页，回车看下一页，q 返回:").strip().lower() == "q":
+            break
+        offset += page_size
+
+# 按条件查询并输出表格 / CSV / JSONL
+def run_query_command(items: ItemStore, args):
+    try:
+        query = parse_query(args.filters)
+    except ValueError as e:
+        print(e)
+        return
+    count = write_items(query.run(items), args.format, args.output)
+    if args.output is not None:
+        print(f"已导出 {count} 条到 {args.output}")
+    elif args.format == "table":
+        print(f"共 {count} 条")
+
+# 命令行参数
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="leetcode helper")
+    parser.add_argument("--backend", choices=BACKENDS, default=None, help="存储后端（默认读 data/config.json）")
+    parser.add_argument("--profile", action="store_true", help="打开性能统计（也可用环境变量 XIAOBAI_PROFILE）")
+    parser.add_argument("--profile-options", default=None, metavar="cprofile,memory",
+                        help="带选项打开性能统计: cprofile 采样、memory 记录内存")
+    parser.add_argument("--user", default=None, help="用户名，使用 data/users/<用户名>/ 工作区（默认直接用 data/）")
+    subparsers = parser.add_subparsers(dest="command")
+    import_parser = subparsers.add_parser("import", help="批量导入刷题记录(.jsonl/.csv)")
+    import_parser.add_argument("file", help="要导入的文件")
+    import_parser.add_argument("--workers", type=int, default=None, help="并行进程数，1表示不用进程池")
+    serve_parser = subparsers.add_parser("serve", help="启动本地HTTP/JSON服务")
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=8765)
+    batch_parser = subparsers.add_parser("batch", help="并行为所有用户生成当天的推荐和分类分数表")
+    batch_parser.add_argument("--users", nargs="*", default=None, help="只处理这些用户（默认 data/users/ 下的全部）")
+    batch_parser.add_argument("--workers", type=int, default=None, help="并行进程数，1表示不用进程池")
+    batch_parser.add_argument("--output", default="./data/reports", help="输出目录")
+    batch_parser.add_argument("-k", type=int, default=3, help="每个用户推荐的题数")
+    query_parser = subparsers.add_parser("query", help="按条件查询题目，输出表格或导出 CSV/JSONL")
+    query_parser.add_argument("filters", nargs="*",
+                              help="条件 key=value，如 tag=贪心 difficulty=2,3 since=2025-01-01 min_time=10:00 "
+                                   "sort=-date,time limit=50 offset=0")
+    query_parser.add_argument("--format", choices=FORMATS, default="table", help="输出格式")
+    query_parser.add_argument("--output", default=None, help="导出到文件（默认输出到终端）")
+    return parser.parse_args(argv)
 
 # 主程序入口
-def main():
-    filename = './data/leetcode_list.json'
-    if not os.path.exists(filename):
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump([], f, ensure_ascii=False, indent=4)
-
-    items = load_items_from_json(filename)
-    leetcode_classifier = LeetCodeClassify()
-    
+def main(argv=None):
+    args = parse_args(argv)
+    root_dir = './data'
+    if args.command == "batch":
+        run_batch_command(root_dir, args)
+        return
+    data_dir = user_data_dir(root_dir, args.user)
+    if args.profile or args.profile_options:
+        profile_options = profiler.parse_options(args.profile_options or "1")
+    else:
+        profile_options = profiler.options_from_env()
+    if profile_options is not None:
+        profiler.enable(os.path.join(data_dir, "profile"), profile_options)
+    with profiler.operation("startup"):
+        workspace = Workspace(data_dir, args.backend)
+        store, items = workspace.store, workspace.items
+        leetcode_classifier, scheduler, history = workspace.classifier, workspace.scheduler, workspace.history
+    try:
+        if args.command == "import":
+            with profiler.operation("import"):
+                print(import_file(args.file, store, leetcode_classifier, args.workers))
+        elif args.command == "query":
+            with profiler.operation("query"):
+                run_query_command(items, args)
+        elif args.command == "serve":
+            service = XiaobaiService(items, leetcode_classifier, store, scheduler, history)
+            try:
+                asyncio.run(serve(service, args.host, args.port))
+            except (KeyboardInterrupt, asyncio.CancelledError):
+                print("服务已停止")
+        else:
+            run_menu(items, leetcode_classifier, store, scheduler, history)
+    finally:
+        with profiler.operation("shutdown"):
+            workspace.close()
+        report_profile(leetcode_classifier)
+
+# 批量为所有用户生成推荐（不加载 data/ 本身的数据）
+def run_batch_command(root_dir, args):
+    start = time.perf_counter()
+    done, failed = 0, []
+    for user, seconds, error in run_batch(root_dir, args.output, args.users, args.workers, args.k):
+        if error is None:
+            done += 1
+        else:
+            failed.append((user, error))
+    print(f"完成 {done} 个用户，失败 {len(failed)} 个，耗时 {time.perf_counter() - start:.2f}s，结果在 {args.output}")
+    for user, error in failed:
+        print(f"  {user}: {error}")
+
+# 退出时输出性能统计（未开启时什么都不做）
+def report_profile(leetcode_classifier=None):
+    active = profiler.active()
+    if active is None:
+        return
+    if leetcode_classifier is not None:
+        active.counters["result_cache"] = leetcode_classifier.cache.stats()
+        active.counters["relation_graph"] = {"hits": leetcode_classifier.relations.hits,
+                                             "misses": leetcode_classifier.relations.misses}
+    print(active.summary())
+    print(f"性能指标已写入 {active.write_metrics()}")
+    profiler.disable()
+
+# 菜单选项对应的性能统计名称
+MENU_OPERATIONS = {
+    '1': "menu.add_new_item",
+    '2': "menu.update_item_by_id",
+    '3': "menu.list_items",
+    '4': "menu.get_recommended_problems",
+    '5': "menu.print_tag_scores_table",
+    '6': "menu.get_today_questions",
+    '8': "menu.print_study_plan",
+    '9': "menu.print_due_reviews",
+}
+
+def run_menu(items, leetcode_classifier, store, scheduler, history=None):
     while True:
         print("\n1. 添加新题")
         print("2. 更新已刷的题")
-        print("3. 查看所有题信息")
+        print("3. 查看题目（可筛选、分页）")
         print("4. 今天刷哪些题呀？")
         print("5. 显示分类分数表")
         print("6. 查看今日刷题记录")
         print("7. 结束")
+        print("8. 规划未来几天的刷题")
+        print("9. 查看待复习的题（今天/本周）")
 
         
         choice = input("请选择操作：")
-        
-        if choice == '1':
-            add_new_item(items, leetcode_classifier)
-            save_items_to_json(items, filename)
-        elif choice == '2':
-            update_item_by_id(items, leetcode_classifier)
-            save_items_to_json(items, filename)
-        elif choice == '3':
-            for item in items:
-                print(item)
-        elif choice == '4':
-            get_recommended_problems(items, leetcode_classifier)
-        elif choice == '5':
-            leetcode_classifier.print_tag_scores_table(items)
-        elif choice == '6':
-            get_today_questions(items)
-        elif choice == '7':
+        if choice == '7':
             print("byebye...")
             break
+        with profiler.operation(MENU_OPERATIONS.get(choice, "menu.invalid")):
+            run_menu_choice(choice, items, leetcode_classifier, store, scheduler, history)
 
-
-        else:
-            print("无效的选择，请重新输入。")
+# 执行一个菜单项（开启剖析时，等待交互输入的时间不计入该菜单项的耗时）
+def run_menu_choice(choice, items, leetcode_classifier, store, scheduler, history=None):
+    if choice == '1':
+        new_item = add_new_item(items, leetcode_classifier)
+        if new_item:
+            store.append(new_item)
+    elif choice == '2':
+        updated_item = update_item_by_id(items, leetcode_classifier, history)
+        if updated_item:
+            store.append(updated_item)
+    elif choice == '3':
+        browse_items(items)
+    elif choice == '4':
+        get_recommended_problems(items, leetcode_classifier, history)
+    elif choice == '5':
+        leetcode_classifier.print_tag_scores_table(items, history)
+    elif choice == '6':
+        get_today_questions(items, store)
+    elif choice == '8':
+        print_study_plan(items, leetcode_classifier, history)
+    elif choice == '9':
+        print_due_reviews(scheduler)
+    else:
+        print("无效的选择，请重新输入。")
 
 # 执行主程序
 if __name__ == "__main__":